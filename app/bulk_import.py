@@ -0,0 +1,219 @@
+# app/bulk_import.py
+
+# Bu dosya, admin toplu içe aktarma uç noktaları (NDJSON/CSV) için ortak
+# yardımcıları içerir:
+# - İstek gövdesi boyut sınırıyla okunur ve satırlar tembel (lazy) olarak çözülür.
+# - Satırlar IMPORT_CHUNK_SIZE'lık parçalar halinde doğrulanır. Her parça için
+#   yabancı anahtarlar (müşteri, hizmet, ilçe) tek bir küme sorgusuyla çözülür ve
+#   geçerli satırlar tek bir executemany / çok satırlı INSERT ile eklenir.
+# - Hatalı satırlar işlemi durdurmaz; satır numarasıyla birlikte rapora yazılır.
+
+import csv
+import io
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+import orjson
+from fastapi import HTTPException, Request, status
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .exports import DataFormat
+from .schemas.import_schemas import ImportReport, ImportRowError
+
+# Tek seferde doğrulanıp eklenen satır sayısı.
+IMPORT_CHUNK_SIZE = 500
+# İstek gövdesinin en büyük boyutu (bayt). Daha büyük dosyalar parçalara bölünerek gönderilmelidir.
+IMPORT_MAX_BYTES = 32 * 1024 * 1024
+# Raporda ayrıntısı verilen en fazla hatalı satır sayısı (toplam 'failed' sayısı her zaman doğrudur).
+IMPORT_MAX_REPORTED_ERRORS = 1000
+
+_CONTENT_TYPES = {
+    "application/x-ndjson": DataFormat.ndjson,
+    "application/ndjson": DataFormat.ndjson,
+    "application/jsonl": DataFormat.ndjson,
+    "application/json-lines": DataFormat.ndjson,
+    "text/csv": DataFormat.csv,
+}
+
+# Bir kaydın ayrıştırma sonucu: (satır numarası, alanlar) veya (satır numarası, hata mesajı)
+Record = Tuple[int, Any]
+
+
+def detect_format(request: Request, explicit: Optional[DataFormat]) -> DataFormat:
+    """Biçimi 'format' parametresinden, yoksa Content-Type başlığından belirler."""
+    if explicit is not None:
+        return explicit
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in _CONTENT_TYPES:
+        return _CONTENT_TYPES[content_type]
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail="Gövde NDJSON (application/x-ndjson) veya CSV (text/csv) olmalıdır; ya da 'format' parametresi verilmelidir.",
+    )
+
+
+async def read_body(request: Request, max_bytes: int = IMPORT_MAX_BYTES) -> bytes:
+    """İstek gövdesini akış halinde okur; sınır aşılırsa okumayı bırakıp 413 döndürür."""
+    chunks: List[bytes] = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > max_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"İçe aktarma dosyası en fazla {max_bytes // (1024 * 1024)} MB olabilir.",
+            )
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _iter_ndjson(text: str) -> Iterator[Record]:
+    row = 0
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            value = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            yield row, "Geçersiz JSON satırı."
+            continue
+        if not isinstance(value, dict):
+            yield row, "Her satır bir JSON nesnesi olmalıdır."
+            continue
+        # Boş/null değerler CSV ile aynı şekilde 'gönderilmemiş' sayılır.
+        yield row, {key: item for key, item in value.items() if item is not None and item != ""}
+
+
+def _iter_csv(text: str) -> Iterator[Record]:
+    reader = csv.DictReader(io.StringIO(text))
+    for row, values in enumerate(reader, start=1):
+        if None in values:
+            yield row, "Satırda başlıktan fazla sütun var."
+            continue
+        yield row, {key.strip(): item for key, item in values.items() if item not in (None, "")}
+
+
+def iter_records(body: bytes, data_format: DataFormat) -> Iterator[Record]:
+    """Gövdeyi satır satır ayrıştırır. Her kayıt (satır no, alanlar veya hata mesajı) olarak döner."""
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Dosya UTF-8 kodlamalı olmalıdır.")
+    return _iter_ndjson(text) if data_format == DataFormat.ndjson else _iter_csv(text)
+
+
+def iter_chunks(records: Iterable[Record], size: int = IMPORT_CHUNK_SIZE) -> Iterator[List[Record]]:
+    chunk: List[Record] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _validation_messages(exc: ValidationError) -> List[str]:
+    messages = []
+    for error in exc.errors(include_url=False):
+        location = ".".join(str(part) for part in error["loc"])
+        messages.append(f"{location}: {error['msg']}" if location else error["msg"])
+    return messages
+
+
+class ImportReportBuilder:
+    """Toplu içe aktarma sonucunu (eklenen/hatalı satır sayıları ve hatalar) biriktirir."""
+
+    def __init__(self, dry_run: bool = False):
+        self.report = ImportReport(dry_run=dry_run)
+
+    def fail(self, row: int, *errors: str) -> None:
+        self.report.failed += 1
+        if len(self.report.errors) < IMPORT_MAX_REPORTED_ERRORS:
+            self.report.errors.append(ImportRowError(row=row, errors=list(errors)))
+        else:
+            self.report.errors_truncated = True
+
+    def validate(self, schema: Type[BaseModel], chunk: List[Record]) -> List[Tuple[int, Any]]:
+        """Parçadaki satırları şemaya göre doğrular; geçerli (satır no, model) çiftlerini döndürür."""
+        self.report.total_rows += len(chunk)
+        valid = []
+        for row, values in chunk:
+            if isinstance(values, str):
+                self.fail(row, values)
+                continue
+            try:
+                valid.append((row, schema.model_validate(values)))
+            except ValidationError as exc:
+                self.fail(row, *_validation_messages(exc))
+        return valid
+
+    def inserted(self, count: int) -> None:
+        self.report.inserted += count
+
+    def finish(self) -> ImportReport:
+        # Hatalar farklı aşamalarda (doğrulama, tekrar, veritabanı) eklenir; satır sırasına dizilir.
+        self.report.errors.sort(key=lambda error: error.row)
+        return self.report
+
+
+def unique_by(
+    rows: List[Tuple[int, Any]],
+    key: Callable[[Any], Any],
+    seen: Dict[Any, int],
+    builder: ImportReportBuilder,
+    label: str,
+) -> List[Tuple[int, Any]]:
+    """
+    Aynı dosyada tekrar eden değerleri (örn. e-posta) ayıklar. 'seen' tüm parçalar
+    boyunca paylaşılır; ilk görülen satır kalır, sonrakiler hata olarak raporlanır.
+    key None döndürürse satır kontrol edilmez.
+    """
+    unique = []
+    for row, item in rows:
+        value = key(item)
+        if value is not None and value in seen:
+            builder.fail(row, f"{label} dosyada tekrar ediyor (ilk görüldüğü satır: {seen[value]}).")
+            continue
+        if value is not None:
+            seen[value] = row
+        unique.append((row, item))
+    return unique
+
+
+async def insert_rows(
+    db: AsyncSession,
+    builder: ImportReportBuilder,
+    rows: List[Tuple[int, Any]],
+    insert_many: Callable[[List[Any]], Awaitable[None]],
+) -> None:
+    """
+    Parçayı tek bir toplu INSERT ile ekler ve işlemi onaylar (commit).
+    Doğrulamadan kaçan bir bütünlük hatası (örn. eşzamanlı eklenmiş aynı e-posta)
+    olursa parça geri alınır ve satırlar tek tek (SAVEPOINT ile) eklenir; yalnızca
+    hatalı satırlar rapora yazılır.
+    """
+    if not rows:
+        return
+    if builder.report.dry_run:
+        builder.inserted(len(rows))
+        return
+    try:
+        await insert_many([item for _, item in rows])
+        await db.commit()
+        builder.inserted(len(rows))
+        return
+    except IntegrityError:
+        await db.rollback()
+
+    for row, item in rows:
+        try:
+            async with db.begin_nested():
+                await insert_many([item])
+        except IntegrityError as exc:
+            builder.fail(row, f"Veritabanı bütünlük hatası: {exc.orig}")
+        else:
+            builder.inserted(1)
+    await db.commit()
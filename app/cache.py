@@ -0,0 +1,95 @@
+# app/cache.py
+
+# Bu dosya, uygulama içinde (in-process) kullanılan basit önbellek (cache)
+# yapılarını içerir. TTL (yaşam süresi) ve LRU (en az kullanılan çıkarılır)
+# sınırlarını birlikte uygular ve isabet/ıskalama sayaçlarını tutar.
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """Boyutu sınırlı, girdileri belirli bir süre sonra geçersiz olan LRU önbellek."""
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: float = 60.0,
+        on_evict: Optional[Callable[[Hashable], None]] = None,
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # LRU'dan çıkarılan veya süresi dolan anahtarlar için çağrılır (invalidate için çağrılmaz).
+        self.on_evict = on_evict
+        # Anahtar -> (son geçerlilik zamanı, değer). Sıralama LRU düzenini tutar.
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Anahtar geçerliyse değeri döndürür, yoksa veya süresi dolmuşsa None döner."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            # Süresi dolmuş girdiyi temizle ve ıskalama olarak say.
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            if self.on_evict is not None:
+                self.on_evict(key)
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Değeri önbelleğe yazar; kapasite aşılırsa en eski girdiyi çıkarır."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            evicted, _ = self._data.popitem(last=False)
+            self.evictions += 1
+            if self.on_evict is not None:
+                self.on_evict(evicted)
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Belirtilen anahtarı önbellekten siler. Silindiyse True döner."""
+        if self._data.pop(key, None) is None:
+            return False
+        self.invalidations += 1
+        return True
+
+    def clear(self) -> None:
+        """Tüm girdileri siler (sayaçlar korunur)."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def stats(self) -> Dict[str, Any]:
+        """İzleme için önbellek sayaçlarını döndürür."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
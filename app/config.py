@@ -0,0 +1,95 @@
+# app/config.py
+
+# Bu dosya, uygulama ayarlarını tek bir yerde toplar.
+# Değerler ortam değişkenlerinden (ve .env dosyasından) okunur (pydantic-settings).
+# Örn: DB_POOL_SIZE=20 ortam değişkeni, settings.db_pool_size alanını doldurur.
+
+from functools import lru_cache
+from typing import Optional
+
+from dotenv import load_dotenv
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+# Ortam değişkenlerini .env dosyasından yükle (gerçek ortam değişkenleri önceliklidir).
+load_dotenv()
+
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(extra="ignore")
+
+    # Veritabanı bağlantısı
+    database_url: str
+    # Salt okunur replika (isteğe bağlı). Boşsa tüm okumalar birincil veritabanına gider.
+    database_read_url: Optional[str] = None
+    db_replica_max_lag_seconds: float = 5.0        # Bu gecikmenin üzerinde okumalar birincile döner.
+    db_replica_lag_check_interval: float = 5.0     # Replika gecikmesi en fazla bu sıklıkta (saniye) ölçülür.
+    db_read_your_writes_seconds: float = 5.0       # Yazma sonrası istemcinin okumaları bu süre birincilde kalır.
+
+    # Bağlantı havuzu (connection pool) ayarları
+    db_echo: bool = False                 # True ise her SQL ifadesi loglanır (yalnızca hata ayıklama için).
+    db_pool_size: int = 10                # Havuzda sürekli açık tutulan bağlantı sayısı.
+    db_max_overflow: int = 20             # Yoğunlukta pool_size üzerine açılabilecek ek bağlantı sayısı.
+    db_pool_timeout: float = 30.0         # Boş bağlantı beklenirken vazgeçilecek süre (saniye).
+    db_pool_recycle: int = 1800           # Bağlantılar bu süreden (saniye) eski ise yenilenir (MySQL wait_timeout'a karşı).
+    db_pool_pre_ping: bool = True         # Havuzdan alınan bağlantı kullanılmadan önce canlılık kontrolü.
+    db_slow_acquire_ms: float = 100.0     # Bağlantı almak bu süreyi (ms) aşarsa uyarı loglanır.
+
+    # Kimlik (principal) önbelleği
+    principal_cache_ttl_seconds: float = 60.0
+    principal_cache_max_size: int = 10000
+
+    # Yalnızca talepler (claims) ile kimlik doğrulama. True ise kimlik ve rol yeterli olan
+    # rotalar token'daki uid/role/ver taleplerinden, veritabanına gitmeden doğrulanır;
+    # iptal edilen token'lar bellekteki iptal listesiyle reddedilir (bkz. app/revocation.py).
+    auth_stateless: bool = False
+    auth_revocation_refresh_seconds: float = 5.0   # İptal listesi bu sıklıkta (saniye) yenilenir.
+
+    # Parola işçi havuzu
+    password_pool_kind: str = "thread"    # "thread" veya "process"
+    password_pool_workers: Optional[int] = None  # Boşsa min(4, CPU sayısı)
+    password_pool_max_queue: int = 64
+
+    # Argon2 maliyet parametreleri. Boşsa passlib varsayılanları (m=65536 KiB, t=3, p=4) kullanılır.
+    # Sunucuya uygun değerler: python -m app.password_calibration --target-ms 250
+    password_argon2_memory_cost: Optional[int] = None   # KiB
+    password_argon2_time_cost: Optional[int] = None     # Geçiş (iterasyon) sayısı
+    password_argon2_parallelism: Optional[int] = None   # Hash başına şerit (lane) sayısı
+    # Başarılı girişte, parametreleri güncel olmayan hash'ler arka planda yeniden hesaplanır.
+    password_rehash_on_login: bool = True
+
+    # Arama arka ucu: "auto", "fulltext" veya "memory"
+    search_backend: str = "auto"
+
+    # Sağlayıcı-ilan eşleştirme indeksi: diğer worker'ların ve toplu içe aktarmanın
+    # ilan değişiklikleri bu sıklıkta (saniye) okunur.
+    job_index_refresh_seconds: float = 5.0
+
+    # Yanıt önbelleği: "memory" (süreç içi LRU), "redis" (RESP sunucusu) veya "none"
+    response_cache_backend: str = "memory"
+    response_cache_url: Optional[str] = None       # Örn: redis://localhost:6379/0
+    response_cache_max_entries: int = 2048         # Yalnızca memory arka ucu için
+    response_cache_ttl_seconds: float = 30.0       # Girdinin taze kabul edildiği süre
+    response_cache_stale_seconds: float = 30.0     # Taze süre sonrası eski girdinin sunulup arka planda yenilendiği süre
+
+    # İstek başına sorgu istatistikleri (Server-Timing başlığı ve loglar)
+    query_stats_enabled: bool = True
+    query_repeat_threshold: int = 5       # Aynı parmak izi bu kadar tekrar ederse olası N+1 olarak loglanır.
+    query_budget_strict: bool = False     # True ise sorgu bütçesini aşan istekler 500 döner (testler için).
+
+    # Yavaş sorgu günlüğü (parmak izi başına özetler; eşiği aşan ifadeler loglanır)
+    slow_query_log_enabled: bool = True
+    slow_query_ms: float = 200.0                   # Bu süreyi (ms) aşan ifadeler yavaş sayılır.
+    slow_query_explain_sample_rate: float = 0.1    # Yavaş SELECT'lerin bu oranı için EXPLAIN çalıştırılır.
+    slow_query_max_fingerprints: int = 1000        # Bellekte tutulan en fazla parmak izi sayısı.
+
+    # Prometheus metrikleri (/metrics). Uç nokta kimlik doğrulaması istemez; dışarıya ağ katmanında kapatılmalıdır.
+    metrics_enabled: bool = True
+
+
+@lru_cache
+def get_settings() -> Settings:
+    """Ayarları bir kez okuyup önbellekte tutar."""
+    return Settings()
+
+
+settings = get_settings()
@@ -1,17 +1,121 @@
-import os
-from dotenv import load_dotenv
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker, declarative_base
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
 
-# Ortam değişkenlerini .env dosyasından yükle
-load_dotenv()
+from fastapi import Request, Response
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
 
 # Ortam değişkenlerinden veritabanı URL'sini alıyoruz.
-DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_URL = settings.database_url
+
+
+# ==============================================================================
+# Bağlantı Havuzu İzleme
+# ==============================================================================
+class PoolMetrics:
+    """Havuzdan bağlantı alma (checkout) sürelerini toplar."""
+
+    def __init__(self):
+        self.acquisitions = 0
+        self.slow_acquisitions = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def record(self, elapsed: float) -> None:
+        self.acquisitions += 1
+        self.wait_time_total += elapsed
+        if elapsed > self.wait_time_max:
+            self.wait_time_max = elapsed
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Bağlantı alma süresini ölçen havuz. Süre, ayarlanan eşiği aşarsa uyarı loglanır;
+    bu genellikle havuzun küçük kaldığını ya da bağlantıların uzun tutulduğunu gösterir.
+    """
+
+    slow_acquire_seconds: float = settings.db_slow_acquire_ms / 1000
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        connection = super().connect()
+        elapsed = time.perf_counter() - started
+        self.metrics.record(elapsed)
+        if elapsed > self.slow_acquire_seconds:
+            self.metrics.slow_acquisitions += 1
+            logger.warning(
+                "Veritabanı bağlantısı %.1f ms'de alınabildi (eşik %.0f ms). Havuz: %s",
+                elapsed * 1000, self.slow_acquire_seconds * 1000, self.status(),
+            )
+        return connection
+
+    def metrics_dict(self) -> Dict[str, Any]:
+        m = self.metrics
+        return {
+            "acquisitions": m.acquisitions,
+            "slow_acquisitions": m.slow_acquisitions,
+            "wait_time_avg_ms": (m.wait_time_total / m.acquisitions * 1000) if m.acquisitions else 0.0,
+            "wait_time_max_ms": m.wait_time_max * 1000,
+        }
+
+
+# ==============================================================================
+# Motor (Engine) Fabrikası
+# ==============================================================================
+def create_engine_from_settings(url: str = DATABASE_URL, **overrides: Any) -> AsyncEngine:
+    """
+    Ayarlara göre asenkron veritabanı motoru oluşturur.
+    SQLite bellek içi veritabanlarında havuz ayarları uygulanmaz.
+    """
+    options: Dict[str, Any] = {"echo": settings.db_echo}
+    parsed = make_url(url)
+    in_memory_sqlite = parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+    if not in_memory_sqlite:
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+            pool_pre_ping=settings.db_pool_pre_ping,
+        )
+    options.update(overrides)
+    return create_async_engine(url, **options)
+
+
+def pool_stats(async_engine: AsyncEngine) -> Dict[str, Any]:
+    """Motorun havuzu için anlık istatistikleri döndürür."""
+    pool = async_engine.sync_engine.pool
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, InstrumentedQueuePool):
+        stats.update(pool.metrics_dict())
+    return stats
+
 
 # Asenkron veritabanı motorunu oluşturuyoruz.
-# Echo=True, veritabanı işlemlerini konsola yazdırır, bu hata ayıklama için yararlıdır.
-engine = create_async_engine(DATABASE_URL, echo=True)
+# SQL loglama (echo) artık varsayılan olarak kapalıdır; hata ayıklarken DB_ECHO=true verilebilir.
+engine = create_engine_from_settings()
 
 # Oturum (session) için bir fabrika oluşturuyoruz.
 # AsyncSession, SQLAlchemy'nin asenkron işlemler için sunduğu bir özelliktir.
@@ -22,11 +126,166 @@ AsyncSessionLocal = sessionmaker(
 )
 
 # SQLAlchemy ORM için temel sınıf. Modellerimiz bu sınıftan türetilecek.
-Base = declarative_base()
+# Tek bir metadata olması için models/base.py'deki Base yeniden kullanılır.
+from .models.base import Base
 
 # Bağımlılık enjeksiyonu için bir fonksiyon.
 # Her istek için bir veritabanı oturumu sağlar.
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
-# Oturumu kapatır ve kaynakları serbest bırakır.    
\ No newline at end of file
+# Oturumu kapatır ve kaynakları serbest bırakır.    
+
+
+# ==============================================================================
+# Okuma/Yazma Ayrımı (Read Replica)
+# ==============================================================================
+# DATABASE_READ_URL verilmişse salt okunur istekler replikaya yönlendirilir.
+# Verilmemişse okuma motoru birincil motorun kendisidir.
+read_engine = create_engine_from_settings(settings.database_read_url) if settings.database_read_url else engine
+
+ReadSessionLocal = sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
+# Yazma yapan istemcinin sonraki okumalarını kısa bir süre birincilde tutmak için
+# kullanılan çerez ve istemcinin açıkça birincil isteyebileceği başlık.
+PRIMARY_STICKY_COOKIE = "db_primary_until"
+CONSISTENCY_HEADER = "x-consistency"
+
+
+class ReplicaLagMonitor:
+    """
+    Replika gecikmesini belirli aralıklarla ölçer. Gecikme eşiği aşarsa veya
+    ölçüm başarısız olursa okumalar birincil veritabanına geri yönlendirilir.
+    """
+
+    def __init__(self, replica_engine: AsyncEngine, max_lag: float, check_interval: float):
+        self.engine = replica_engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag_seconds: Optional[float] = None
+        self.healthy = True
+        self.checked_at = 0.0
+        self.replica_reads = 0
+        self.primary_fallbacks = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.engine is not engine
+
+    async def _probe(self) -> Optional[float]:
+        # MySQL replikasında Seconds_Behind_Source okunur. Replika olarak
+        # yapılandırılmamış sunucularda (ve SQLite'ta) gecikme 0 kabul edilir.
+        async with self.engine.connect() as conn:
+            if self.engine.dialect.name != "mysql":
+                await conn.execute(text("SELECT 1"))
+                return 0.0
+            try:
+                row = (await conn.execute(text("SHOW REPLICA STATUS"))).mappings().first()
+            except Exception:
+                row = (await conn.execute(text("SHOW SLAVE STATUS"))).mappings().first()
+            if row is None:
+                return 0.0
+            lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+            # NULL gecikme, replikasyonun durduğu anlamına gelir.
+            return float(lag) if lag is not None else None
+
+    async def replica_usable(self) -> bool:
+        """Replika kullanılabilir mi? Gerekirse gecikmeyi yeniden ölçer."""
+        if not self.enabled:
+            return False
+        if time.monotonic() - self.checked_at >= self.check_interval and not self._lock.locked():
+            async with self._lock:
+                try:
+                    self.lag_seconds = await self._probe()
+                    self.healthy = self.lag_seconds is not None and self.lag_seconds <= self.max_lag
+                except Exception:
+                    logger.exception("Replika gecikmesi ölçülemedi; okumalar birincile yönlendiriliyor.")
+                    self.lag_seconds = None
+                    self.healthy = False
+                self.checked_at = time.monotonic()
+        return self.healthy
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag,
+            "replica_reads": self.replica_reads,
+            "primary_fallbacks": self.primary_fallbacks,
+        }
+
+
+replica_monitor = ReplicaLagMonitor(
+    read_engine,
+    max_lag=settings.db_replica_max_lag_seconds,
+    check_interval=settings.db_replica_lag_check_interval,
+)
+
+
+# Yalnızca okuma yapan HTTP yöntemleri; diğerleri yazma isteği sayılır.
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def prefers_primary(request: Request) -> bool:
+    # Yazma isteklerinde (kimlik doğrulama dahil) tüm okumalar birincilden yapılır;
+    # aksi halde az önce askıya alınmış veya yetkisi düşürülmüş bir kullanıcı gecikmeli
+    # replikadan okunarak yazma yapabilir.
+    if request.method not in READ_ONLY_METHODS:
+        return True
+    # İstemci yakın zamanda yazma yaptıysa (read-your-writes) veya açıkça
+    # güçlü tutarlılık istediyse okuma birincilden yapılır.
+    if request.headers.get(CONSISTENCY_HEADER, "").lower() == "strong":
+        return True
+    sticky_until = request.cookies.get(PRIMARY_STICKY_COOKIE)
+    if sticky_until:
+        try:
+            return float(sticky_until) > time.time()
+        except ValueError:
+            return False
+    return False
+
+
+# Okuma için kullanılacak oturum fabrikasını seçer.
+# Replika yoksa, gecikmesi yüksekse veya istemci yeni yazma yaptıysa birincil kullanılır.
+async def read_session_factory(request: Request) -> sessionmaker:
+    if replica_monitor.enabled and not prefers_primary(request) and await replica_monitor.replica_usable():
+        replica_monitor.replica_reads += 1
+        return ReadSessionLocal
+    if replica_monitor.enabled:
+        replica_monitor.primary_fallbacks += 1
+    return AsyncSessionLocal
+
+
+# Salt okunur GET uç noktaları için bağımlılık.
+async def get_read_db(request: Request):
+    session_factory = await read_session_factory(request)
+    async with session_factory() as session:
+        yield session
+
+
+async def read_your_writes_middleware(request: Request, call_next) -> Response:
+    """
+    Başarılı yazma isteklerinden (POST/PUT/PATCH/DELETE) sonra istemciye kısa ömürlü
+    bir çerez bırakır; bu süre boyunca get_read_db okumaları birincile yönlendirir.
+    """
+    response = await call_next(request)
+    if (
+        replica_monitor.enabled
+        and request.method not in READ_ONLY_METHODS
+        and response.status_code < 400
+    ):
+        ttl = settings.db_read_your_writes_seconds
+        response.set_cookie(
+            PRIMARY_STICKY_COOKIE,
+            str(time.time() + ttl),
+            max_age=int(ttl) or 1,
+            httponly=True,
+            samesite="lax",
+        )
+    return response
@@ -0,0 +1,147 @@
+# app/exports.py
+
+# Bu dosya, büyük tabloların (kullanıcılar, ilanlar, teklifler, değerlendirmeler)
+# NDJSON veya CSV olarak akış halinde dışa aktarılması için yardımcıları içerir.
+# - Satırlar sunucu tarafı imleçle (AsyncSession.stream + yield_per) parça parça
+#   okunur; sonuç kümesi hiçbir zaman bütünüyle belleğe alınmaz.
+# - Her parça kodlanıp hemen istemciye gönderilir (StreamingResponse). Bellek
+#   kullanımı dışa aktarılan satır sayısından bağımsız olarak sabit kalır.
+# - İstemci 'Accept-Encoding: gzip' gönderirse çıktı akış sırasında sıkıştırılır.
+#
+# Not: Dependency ile verilen oturum, akış başlamadan kapanır. Bu yüzden akış
+# kendi oturumunu açar (bkz. database.read_session_factory).
+
+import csv
+import enum
+import io
+import logging
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterator, Iterable, List, Sequence
+
+import orjson
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import sessionmaker
+
+from .serialization import ORJSON_OPTIONS
+
+logger = logging.getLogger(__name__)
+
+# Sunucu tarafı imleçten tek seferde okunan satır sayısı (bir parça).
+EXPORT_BATCH_SIZE = 1000
+
+
+class DataFormat(str, enum.Enum):
+    """Dışa (ve içe) aktarma dosya biçimi."""
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+_MEDIA_TYPES = {
+    DataFormat.ndjson: "application/x-ndjson",
+    DataFormat.csv: "text/csv; charset=utf-8",
+}
+
+
+def _orjson_default(value: Any) -> Any:
+    # orjson Decimal serileştiremez; fiyatlar metin olarak yazılır (kayıpsız).
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError
+
+
+def encode_ndjson(rows: Iterable[Any]) -> bytes:
+    """Satır parçasını NDJSON (satır başına bir JSON nesnesi) baytlarına çevirir."""
+    return b"".join(
+        orjson.dumps(dict(row), option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE, default=_orjson_default)
+        for row in rows
+    )
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def encode_csv(rows: Iterable[Any], columns: Sequence[str] = ()) -> bytes:
+    """Satır parçasını CSV baytlarına çevirir. columns verilirse önce başlık satırı yazılır."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if columns:
+        writer.writerow(columns)
+    for row in rows:
+        writer.writerow([_csv_value(value) for value in row])
+    return buffer.getvalue().encode("utf-8")
+
+
+async def stream_partitions(session_factory: sessionmaker, query, batch_size: int = EXPORT_BATCH_SIZE) -> AsyncIterator[List[Any]]:
+    """Sorgu sonucunu sunucu tarafı imleçle en fazla batch_size satırlık parçalar halinde üretir."""
+    async with session_factory() as session:
+        result = await session.stream(query.execution_options(yield_per=batch_size))
+        async for partition in result.mappings().partitions(batch_size):
+            yield partition
+
+
+async def _encode_stream(session_factory: sessionmaker, query, export_format: DataFormat) -> AsyncIterator[bytes]:
+    columns = [column.key for column in query.selected_columns]
+    if export_format == DataFormat.csv:
+        # Başlık satırı, sonuç boş olsa bile yazılır.
+        yield encode_csv((), columns)
+    try:
+        async for partition in stream_partitions(session_factory, query):
+            if export_format == DataFormat.csv:
+                yield encode_csv(row.values() for row in partition)
+            else:
+                yield encode_ndjson(partition)
+    except Exception:
+        # Yanıt başlıkları gönderildi; durum kodu değiştirilemez. Akış yarıda kesilir.
+        logger.exception("Dışa aktarma akışı yarıda kesildi.")
+        raise
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """Bayt akışını gzip ile sıkıştırarak aktarır (parça parça, sabit bellekle)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def accepts_gzip(request: Request) -> bool:
+    for coding in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if name.strip().lower() == "gzip" and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            return True
+    return False
+
+
+def export_response(
+    request: Request,
+    session_factory: sessionmaker,
+    query,
+    export_format: DataFormat,
+    filename: str,
+) -> StreamingResponse:
+    """Sorgunun sonucunu NDJSON veya CSV olarak (gerekirse gzip ile) akıtan yanıtı oluşturur."""
+    body = _encode_stream(session_factory, query, export_format)
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"',
+        "Vary": "Accept-Encoding",
+        # Ara sunucuların (örn. nginx) yanıtı tamponlamadan iletmesi için.
+        "X-Accel-Buffering": "no",
+    }
+    if accepts_gzip(request):
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=_MEDIA_TYPES[export_format], headers=headers)
@@ -0,0 +1,112 @@
+# app/http_cache.py
+
+# Bu dosya, HTTP koşullu istekleri (ETag / If-None-Match, Last-Modified /
+# If-Modified-Since) için yardımcı fonksiyonları içerir. İstemci elindeki
+# sürümün güncel olduğunu bildirirse gövde yeniden gönderilmez, 304 Not
+# Modified döndürülür.
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(payload: bytes) -> str:
+    """İçerikten güçlü (strong) bir ETag üretir."""
+    return '"' + hashlib.sha1(payload).hexdigest() + '"'
+
+
+def make_version_etag(*parts: Any) -> str:
+    """
+    Gövdeyi üretmeden, kaydın sürümünü belirleyen değerlerden (ID, updated_at,
+    durum vb.) güçlü bir ETag üretir.
+    """
+    return make_etag(repr(parts).encode())
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match başlığındaki değerlerden biri ETag ile eşleşiyor mu?"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Zayıf karşılaştırma: W/ öneki yok sayılır (RFC 9110, If-None-Match).
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def http_date(value: datetime) -> str:
+    """Zaman damgasını HTTP tarih biçimine (RFC 9110, IMF-fixdate) çevirir."""
+    if value.tzinfo is None:
+        # Veritabanından gelen saat dilimsiz değerler UTC kabul edilir.
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def modified_since(if_modified_since: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """Kayıt, If-Modified-Since tarihinden sonra değişmiş mi? (Başlık yoksa/geçersizse True.)"""
+    if not if_modified_since or last_modified is None:
+        return True
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return True
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # HTTP tarihleri saniye hassasiyetindedir.
+    return last_modified.replace(microsecond=0) > since
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    İstemcinin kopyası güncel mi? If-None-Match varsa yalnızca o değerlendirilir;
+    yoksa If-Modified-Since kullanılır (RFC 9110, 13.2.2).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None:
+        return False
+    return not modified_since(if_modified_since, last_modified)
+
+
+def validator_headers(
+    etag: str,
+    cache_control: Optional[str] = None,
+    last_modified: Optional[datetime] = None,
+) -> Dict[str, str]:
+    """ETag, Cache-Control ve Last-Modified yanıt başlıklarını üretir."""
+    headers = {"ETag": etag}
+    if cache_control:
+        headers["Cache-Control"] = cache_control
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def not_modified(etag: str, cache_control: Optional[str] = None, last_modified: Optional[datetime] = None) -> Response:
+    """Gövdesiz 304 yanıtı üretir."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers=validator_headers(etag, cache_control, last_modified),
+    )
+
+
+def cached_json_response(
+    request: Request,
+    payload: bytes,
+    etag: str,
+    cache_control: str,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Önceden serileştirilmiş JSON gövdesini ETag ve Cache-Control başlıklarıyla döndürür."""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, cache_control)
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={**(headers or {}), "ETag": etag, "Cache-Control": cache_control},
+    )
@@ -0,0 +1,222 @@
+# app/job_matching.py
+
+# Bu dosya, sağlayıcılara uygun açık ilanları bulmak için bellek içi indeksi içerir.
+#
+# İndeks, (service_id, district_id) çiftinden o çiftteki aktif ve açık ilanlara giden
+# bir eşlemedir. Her çiftin ilanları (created_at, id) sırasıyla artan bir listede tutulur;
+# yeni ilanlar çoğunlukla listenin sonuna eklenir. "Bana uygun ilanlar" akışı,
+# sağlayıcının abone olduğu çiftlerin listelerini sondan başa doğru birleştirir
+# (k-yollu birleştirme). Maliyet, abone olunan çift sayısı ve döndürülen ilan sayısıyla
+# orantılıdır; tablodaki toplam ilan sayısından bağımsızdır.
+#
+# İndeks başlangıçta veritabanından kurulur ve ilan oluşturma, atama, tamamlama, iptal
+# ve yeniden açma işlemlerinde aynı süreçte hemen güncellenir. Diğer süreçlerde
+# (birden çok worker) veya toplu içe aktarmayla yapılan değişiklikler, arka planda
+# artımlı olarak (id > son görülen id ve updated_at >= son görülen updated_at) okunur.
+# İşlemler id / updated_at sırasıyla commit edilmediğinden (küçük id'li bir ilan, büyük
+# id'li bir ilan okunduktan sonra commit edilebilir) her eşitlemede iki filigranın da
+# gerisinde bir pencere (lookback_ids, lookback_seconds) yeniden okunur. Satırlar güncel
+# durumlarıyla uygulandığından (apply) aynı satırın tekrar okunması sonucu değiştirmez.
+
+import asyncio
+import heapq
+import logging
+import time
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .config import settings
+from .models.job_models import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+# (created_at, job_id): bir çiftteki ilanların sıralama anahtarı.
+JobKey = Tuple[datetime, int]
+Pair = Tuple[int, int]
+
+_INDEX_COLUMNS = (Job.id, Job.service_id, Job.district_id, Job.created_at, Job.status, Job.is_active)
+
+
+def _is_open(job_status, is_active) -> bool:
+    return bool(is_active) and job_status == JobStatus.open
+
+
+def _descending(bucket: List[JobKey], end: int):
+    # Listeyi kopyalamadan bucket[end-1], bucket[end-2], ... sırasıyla dolaşır.
+    for i in range(end - 1, -1, -1):
+        yield bucket[i]
+
+
+class OpenJobIndex:
+    """(service_id, district_id) -> (created_at, id) sıralı açık ilan listesi."""
+
+    def __init__(self, refresh_seconds: float = 5.0, lookback_ids: int = 1000, lookback_seconds: float = 60.0):
+        self.refresh_seconds = refresh_seconds
+        self.lookback_ids = lookback_ids
+        self.lookback_seconds = lookback_seconds
+        self._buckets: Dict[Pair, List[JobKey]] = {}
+        # job_id -> (çift, anahtar); silme ve yer değiştirme için.
+        self._jobs: Dict[int, Tuple[Pair, JobKey]] = {}
+        self._last_id = 0
+        self._last_updated: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        self.ready = False
+        self.last_sync: Optional[float] = None
+        self.syncs = 0
+        self.sync_failures = 0
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    # ------------------------------------------------------------------
+    # Güncelleme
+    # ------------------------------------------------------------------
+    def add(self, job_id: int, service_id: int, district_id: int, created_at: datetime) -> None:
+        """Açık bir ilanı indekse ekler (zaten varsa yerini günceller)."""
+        pair, key = (service_id, district_id), (created_at, job_id)
+        if self._jobs.get(job_id) == (pair, key):
+            return
+        self.remove(job_id)
+        bucket = self._buckets.setdefault(pair, [])
+        # Yeni ilanlar en yeni olduğundan çoğunlukla doğrudan sona eklenir.
+        if not bucket or bucket[-1] < key:
+            bucket.append(key)
+        else:
+            insort(bucket, key)
+        self._jobs[job_id] = (pair, key)
+
+    def remove(self, job_id: int) -> None:
+        """İlanı indeksten çıkarır (atandı, tamamlandı, iptal edildi veya pasifleşti)."""
+        entry = self._jobs.pop(job_id, None)
+        if entry is None:
+            return
+        pair, key = entry
+        bucket = self._buckets[pair]
+        position = bisect_left(bucket, key)
+        if position < len(bucket) and bucket[position] == key:
+            del bucket[position]
+        if not bucket:
+            del self._buckets[pair]
+
+    def apply(self, job_id: int, service_id: int, district_id: int, created_at, job_status, is_active) -> None:
+        """İlanın güncel durumuna göre ekler veya çıkarır."""
+        if _is_open(job_status, is_active):
+            self.add(job_id, service_id, district_id, created_at)
+        else:
+            self.remove(job_id)
+
+    # ------------------------------------------------------------------
+    # Sorgulama
+    # ------------------------------------------------------------------
+    def feed(self, pairs: Iterable[Pair], limit: int, after: Optional[JobKey] = None) -> List[JobKey]:
+        """
+        Verilen çiftlerdeki açık ilanları en yeniden eskiye döndürür. 'after' verilirse
+        yalnızca bu anahtardan sonra (daha eski) gelen ilanlar döner (keyset sayfalama).
+        """
+        iterators = []
+        for pair in pairs:
+            bucket = self._buckets.get(pair)
+            if not bucket:
+                continue
+            end = bisect_left(bucket, after) if after is not None else len(bucket)
+            if end:
+                iterators.append(_descending(bucket, end))
+        if len(iterators) == 1:
+            return list(islice(iterators[0], limit))
+        return list(islice(heapq.merge(*iterators, reverse=True), limit))
+
+    # ------------------------------------------------------------------
+    # Veritabanından yükleme
+    # ------------------------------------------------------------------
+    async def _watermarks(self, session: AsyncSession) -> Tuple[int, Optional[datetime]]:
+        last_id, last_updated = (await session.execute(
+            select(func.max(Job.id), func.max(Job.updated_at))
+        )).one()
+        return last_id or 0, last_updated
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        """İndeksi aktif ve açık ilanlardan yeniden kurar (uygulama başlangıcında)."""
+        # Filigranlar ilanlardan önce okunur; aradaki değişiklikler ilk eşitlemede tekrar uygulanır.
+        last_id, last_updated = await self._watermarks(session)
+        result = await session.execute(
+            select(Job.id, Job.service_id, Job.district_id, Job.created_at)
+            .where(Job.is_active == True, Job.status == JobStatus.open)
+            .order_by(Job.created_at, Job.id)
+        )
+        self._buckets.clear()
+        self._jobs.clear()
+        for job_id, service_id, district_id, created_at in result.all():
+            self.add(job_id, service_id, district_id, created_at)
+        self._last_id, self._last_updated = last_id, last_updated
+        self.ready = True
+        self.last_sync = time.monotonic()
+
+    async def sync(self, session: AsyncSession) -> int:
+        """Son eşitlemeden (ve geri bakma penceresinden) sonra eklenen veya güncellenen ilanları uygular; okunan satır sayısını döndürür."""
+        rows = (await session.execute(
+            select(*_INDEX_COLUMNS).where(Job.id > max(0, self._last_id - self.lookback_ids))
+        )).all()
+        # Henüz hiç güncellenmiş ilan görülmediyse güncellenmiş ilanların tamamı okunur.
+        changed = (
+            Job.updated_at >= self._last_updated - timedelta(seconds=self.lookback_seconds)
+            if self._last_updated is not None else Job.updated_at.isnot(None)
+        )
+        rows += (await session.execute(select(*_INDEX_COLUMNS, Job.updated_at).where(changed))).all()
+        for row in rows:
+            self.apply(row.id, row.service_id, row.district_id, row.created_at, row.status, row.is_active)
+            self._last_id = max(self._last_id, row.id)
+            updated_at = getattr(row, "updated_at", None)
+            if updated_at is not None and (self._last_updated is None or updated_at > self._last_updated):
+                self._last_updated = updated_at
+        self.last_sync = time.monotonic()
+        self.syncs += 1
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Arka plan eşitleme
+    # ------------------------------------------------------------------
+    def start(self, session_factory) -> None:
+        """Diğer süreçlerdeki değişiklikleri refresh_seconds aralıklarla okuyan görevi başlatır."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(session_factory))
+
+    async def _run(self, session_factory) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                async with session_factory() as session:
+                    await self.sync(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.sync_failures += 1
+                logger.exception("Açık ilan indeksi eşitlenemedi.")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "jobs": len(self._jobs),
+            "pairs": len(self._buckets),
+            "largest_pair": max(map(len, self._buckets.values()), default=0),
+            "last_id": self._last_id,
+            "lookback_ids": self.lookback_ids,
+            "lookback_seconds": self.lookback_seconds,
+            "seconds_since_sync": (time.monotonic() - self.last_sync) if self.last_sync is not None else None,
+            "syncs": self.syncs,
+            "sync_failures": self.sync_failures,
+        }
+
+
+# Uygulama genelinde kullanılan açık ilan indeksi.
+open_job_index = OpenJobIndex(refresh_seconds=settings.job_index_refresh_seconds)
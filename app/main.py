@@ -1,22 +1,65 @@
 # ==============================================================================
 # Gerekli Kütüphanelerin ve Modüllerin İçe Aktarılması (Imports)
 # ==============================================================================
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import logging 
 
 # Proje içindeki yönlendiricileri (routers) import ediyoruz.
 # Bu router'ların kendi içinde tam öneklerini (/api/v1/...) taşıdığını varsayıyoruz.
-from .routers.auth import auth_router 
+from .routers.auth import auth_router, drain_password_rehashes, revocation_list
 from .routers.jobs_router import router as jobs_router 
 from .routers.admin_router import admin_router
 from .routers.offers_router import router as offers_router
 # from .routers.offers_router import router as offers_router # Bu satır güncellenecek
 from .routers.reviews_router import router as reviews_router
+from .routers.providers_router import router as providers_router
+from .passwords import password_pool
+from .database import AsyncSessionLocal, engine, read_engine, read_your_writes_middleware
+from .query_stats import install_query_hooks, query_stats_middleware
+from .slow_queries import slow_query_log
+from .search import search_backend
+from .job_matching import open_job_index
+from .reference_data import reference_data
+from .response_cache import response_cache
+from .routers.reference_router import router as reference_router
+from .routers.export_router import router as export_router
+from .routers.import_router import router as import_router
+from .routers.metrics_router import router as metrics_router
+from .config import settings
+from .metrics import MetricsMiddleware
 
 # Logging ayarını ekleyelim.
 logging.basicConfig(level=logging.INFO)
 
+# ==============================================================================
+# Uygulama Yaşam Döngüsü (Başlangıç / Kapanış)
+# ==============================================================================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+  async with AsyncSessionLocal() as session:
+    # Referans verileri (roller, kategoriler, hizmetler, ilçeler) belleğe yükle.
+    await reference_data.load(session)
+    # Bellek içi arama indeksini veritabanından oluştur (MySQL FULLTEXT'te işlem yapmaz).
+    await search_backend.rebuild(session)
+    # Sağlayıcı-ilan eşleştirme indeksini açık ilanlardan kur.
+    await open_job_index.rebuild(session)
+    # Token iptal listesini yükle; sonrasında arka planda artımlı olarak yenilenir.
+    await revocation_list.refresh(session)
+  revocation_list.start(AsyncSessionLocal)
+  open_job_index.start(AsyncSessionLocal)
+  yield
+  # Süren parola yeniden hashlemelerini bekle; ardından parola işçi havuzunu ve
+  # yanıt önbelleği bağlantısını kapat.
+  await drain_password_rehashes()
+  password_pool.shutdown()
+  await response_cache.close()
+  await slow_query_log.close()
+  await revocation_list.close()
+  await open_job_index.close()
+
 # ==============================================================================
 # FastAPI Uygulamasının Oluşturulması ve Yapılandırılması
 # ==============================================================================
@@ -26,7 +69,10 @@ app = FastAPI(
   description="Hizmet sağlayan ve arayan kullanıcılar için geliştirilmiş bir platform.",
   version="1.0.0",
   docs_url="/docs",
-  redoc_url="/redoc"
+  redoc_url="/redoc",
+  lifespan=lifespan,
+  # Varsayılan yanıt sınıfı: orjson, standart json modülünden belirgin şekilde hızlıdır.
+  default_response_class=ORJSONResponse
 )
 
 # ==============================================================================
@@ -44,8 +90,22 @@ app.add_middleware(
   allow_credentials=True,     
   allow_methods=["*"],      
   allow_headers=["*"],      
+  expose_headers=["X-Next-Cursor", "X-Total-Count", "X-Total-Count-Capped", "X-Cache"],
 )
 
+# Yazma sonrası okumaların (read-your-writes) kısa süre birincil veritabanına gitmesini sağlar.
+app.middleware("http")(read_your_writes_middleware)
+
+# İstek başına sorgu sayısı ve veritabanı süresi (Server-Timing başlığı, N+1 ve bütçe uyarıları).
+install_query_hooks(engine, read_engine)
+# Parmak izi başına sorgu özetleri ve yavaş sorgu günlüğü (istek dışındaki sorgular dahil).
+slow_query_log.install(engine, read_engine)
+app.middleware("http")(query_stats_middleware)
+
+# Prometheus metrikleri (/metrics). En dışta çalışır; diğer ara katmanların süresi de ölçüme dahildir.
+if settings.metrics_enabled:
+  app.add_middleware(MetricsMiddleware)
+
 # ==============================================================================
 # API Yönlendiricilerinin (Routers) Uygulamaya Dahil Edilmesi
 # ==============================================================================
@@ -58,6 +118,12 @@ app.include_router(admin_router, tags=["User Management (Admin)"])
 app.include_router(offers_router, tags=["Offers (Teklifler)"]) 
 app.include_router(offers_router, tags=["Offers (Teklifler)"])
 app.include_router(reviews_router, tags=["Reviews (Değerlendirmeler)"])
+app.include_router(providers_router, tags=["Providers (Sağlayıcılar)"])
+app.include_router(reference_router, tags=["Reference Data (Referans Veriler)"])
+app.include_router(export_router, tags=["Data Export (Admin)"])
+app.include_router(import_router, tags=["Data Import (Admin)"])
+if settings.metrics_enabled:
+  app.include_router(metrics_router)
 
 
 # ==============================================================================
@@ -0,0 +1,197 @@
+# app/metrics.py
+
+# Bu dosya, uygulamanın Prometheus metin biçimindeki metriklerini üretir (harici servis gerekmez):
+# - http_request_duration_seconds: rota şablonu, metot ve durum koduna göre gecikme histogramı
+# - http_requests_in_flight: o anda işlenmekte olan istekler (metoda göre)
+# - db_pool_*: SQLAlchemy bağlantı havuzu göstergeleri (birincil ve varsa replika)
+# - password_pool_*: parola hash havuzunun kuyruk derinliği ve sayaçları
+#
+# Kayıt, olay döngüsünün tek iş parçacığında yapılır; bu yüzden kilit gerekmez.
+# Histogram kovaları önceden ayrılmış bir listede tutulur; bir gözlem yalnızca bir
+# ikili arama (bisect) ve iki tam sayı/ondalık artırmasıdır. Göstergeler (gauge)
+# istek anında değil, /metrics okunurken hesaplanır.
+
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from .database import engine, read_engine, replica_monitor
+from .passwords import password_pool
+
+# Saniye cinsinden gecikme kovaları (+Inf ayrıca eklenir).
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Herhangi bir rotayla eşleşmeyen istekler (404) tek bir etikette toplanır;
+# aksi halde rastgele URL'ler sınırsız sayıda zaman serisi üretirdi.
+UNMATCHED_ROUTE = "<unmatched>"
+
+# Metot istemciden denetlenmeden gelir; standart dışı metotlar tek bir etikette toplanır.
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "CONNECT", "TRACE"})
+OTHER_METHOD = "OTHER"
+
+
+class Histogram:
+    """Sabit kovalı histogram. counts[i], bounds[i-1] < değer <= bounds[i] aralığındaki gözlem sayısıdır."""
+
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def cumulative(self) -> List[int]:
+        total, result = 0, []
+        for count in self.counts:
+            total += count
+            result.append(total)
+        return result
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: object) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class MetricsRegistry:
+    """İstek metriklerini tutar ve tüm metrikleri Prometheus metin biçiminde üretir."""
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        # (method, route, status) -> Histogram
+        self.request_latency: Dict[Tuple[str, str, str], Histogram] = {}
+        self.in_flight: Dict[str, int] = defaultdict(int)
+        self.started_at = time.time()
+
+    def observe_request(self, method: str, route: str, status: int, elapsed: float) -> None:
+        key = (method, route, str(status))
+        histogram = self.request_latency.get(key)
+        if histogram is None:
+            histogram = self.request_latency[key] = Histogram(self.buckets)
+        histogram.observe(elapsed)
+
+    # ------------------------------------------------------------------
+    # Metin biçimi
+    # ------------------------------------------------------------------
+    def _request_lines(self) -> Iterable[str]:
+        yield "# HELP http_request_duration_seconds HTTP istek süresi (yanıt gövdesinin tamamı gönderilene kadar)."
+        yield "# TYPE http_request_duration_seconds histogram"
+        for (method, route, status), histogram in sorted(self.request_latency.items()):
+            cumulative = histogram.cumulative()
+            for bound, count in zip(self.buckets, cumulative):
+                labels = _labels(method=method, route=route, status=status, le=repr(bound))
+                yield f"http_request_duration_seconds_bucket{labels} {count}"
+            labels = _labels(method=method, route=route, status=status, le="+Inf")
+            yield f"http_request_duration_seconds_bucket{labels} {cumulative[-1]}"
+            labels = _labels(method=method, route=route, status=status)
+            yield f"http_request_duration_seconds_sum{labels} {histogram.sum!r}"
+            yield f"http_request_duration_seconds_count{labels} {cumulative[-1]}"
+
+        yield "# HELP http_requests_in_flight İşlenmekte olan HTTP istekleri."
+        yield "# TYPE http_requests_in_flight gauge"
+        for method, count in sorted(self.in_flight.items()):
+            yield f"http_requests_in_flight{_labels(method=method)} {count}"
+
+    def _gauge(self, name: str, help_text: str, samples: Iterable[Tuple[dict, float]], kind: str = "gauge") -> Iterable[str]:
+        yield f"# HELP {name} {help_text}"
+        yield f"# TYPE {name} {kind}"
+        for labels, value in samples:
+            yield f"{name}{_labels(**labels)} {_format_value(value)}"
+
+    def _pool_lines(self) -> Iterable[str]:
+        pools = [("primary", engine.sync_engine.pool)]
+        if replica_monitor.enabled:
+            pools.append(("replica", read_engine.sync_engine.pool))
+        # Havuz sınıfı bu metotları sağlamıyorsa (örn. bellek içi SQLite) gösterge yazılmaz.
+        pools = [(name, pool) for name, pool in pools if hasattr(pool, "checkedout")]
+        yield from self._gauge("db_pool_size", "Havuzun sürekli açık tuttuğu bağlantı sayısı.",
+                               [({"pool": name}, pool.size()) for name, pool in pools])
+        yield from self._gauge("db_pool_checked_out", "Kullanımda olan (havuzdan alınmış) bağlantılar.",
+                               [({"pool": name}, pool.checkedout()) for name, pool in pools])
+        yield from self._gauge("db_pool_checked_in", "Havuzda boşta bekleyen bağlantılar.",
+                               [({"pool": name}, pool.checkedin()) for name, pool in pools])
+        yield from self._gauge("db_pool_overflow", "pool_size üzerine açılmış ek bağlantılar (negatifse açılabilecek boş yer).",
+                               [({"pool": name}, pool.overflow()) for name, pool in pools])
+        instrumented = [(name, pool.metrics) for name, pool in pools if hasattr(pool, "metrics")]
+        yield from self._gauge("db_pool_acquisitions_total", "Havuzdan alınan bağlantı sayısı.",
+                               [({"pool": name}, m.acquisitions) for name, m in instrumented], kind="counter")
+        yield from self._gauge("db_pool_slow_acquisitions_total", "Eşikten (DB_SLOW_ACQUIRE_MS) uzun süren bağlantı almaları.",
+                               [({"pool": name}, m.slow_acquisitions) for name, m in instrumented], kind="counter")
+        yield from self._gauge("db_pool_acquire_wait_seconds_total", "Bağlantı almak için beklenen toplam süre.",
+                               [({"pool": name}, m.wait_time_total) for name, m in instrumented], kind="counter")
+
+    def _password_pool_lines(self) -> Iterable[str]:
+        pool = password_pool
+        yield from self._gauge("password_pool_queue_depth", "Boş işçi bekleyen parola işleri.", [({}, pool.queued)])
+        yield from self._gauge("password_pool_in_flight", "Çalışmakta olan parola işleri.", [({}, pool.in_flight)])
+        yield from self._gauge("password_pool_workers", "Parola havuzundaki işçi sayısı.", [({}, pool.max_workers)])
+        yield from self._gauge("password_pool_completed_total", "Tamamlanan parola işleri.", [({}, pool.completed)], kind="counter")
+        yield from self._gauge("password_pool_rejected_total", "Kuyruk dolu olduğu için reddedilen parola işleri.", [({}, pool.rejected)], kind="counter")
+        yield from self._gauge("password_pool_queue_seconds_total", "Parola işlerinin kuyrukta beklediği toplam süre.",
+                               [({}, pool.queue_time_total)], kind="counter")
+
+    def render(self) -> str:
+        lines: List[str] = []
+        lines.extend(self._request_lines())
+        lines.extend(self._pool_lines())
+        lines.extend(self._password_pool_lines())
+        lines.extend(self._gauge("process_start_time_seconds", "Sürecin başlangıç zamanı (Unix).",
+                                 [({}, self.started_at)]))
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """
+    İstek sürelerini ve eşzamanlı istek sayısını kaydeden saf ASGI ara katmanı.
+    Rota şablonu (örn. /api/v1/jobs/{job_id}) yönlendirme sonrası scope['route']'tan okunur.
+    """
+
+    def __init__(self, app, registry: MetricsRegistry = metrics):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        registry = self.registry
+        method = scope["method"] if scope["method"] in KNOWN_METHODS else OTHER_METHOD
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        registry.in_flight[method] += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            registry.in_flight[method] -= 1
+            route = scope.get("route")
+            registry.observe_request(
+                method, getattr(route, "path", UNMATCHED_ROUTE), status_code, time.perf_counter() - started
+            )
@@ -0,0 +1,133 @@
+# app/migrations/__init__.py
+
+# Sürümlü şema migration'ları.
+#
+# hizmetypinari_db.sql yeni kurulumlar için şemanın güncel halidir; bu paket ise
+# mevcut veritabanlarını o hale getirir. Her migration, bu paketteki
+# mNNNN_<açıklama>.py adlı bir modüldür ve şunları tanımlar:
+#
+#     description = "..."
+#     def upgrade(conn): ...      # senkron sqlalchemy Connection
+#     def downgrade(conn): ...
+#
+# Uygulanan sürümler 'schema_migrations' tablosunda tutulur. Her migration kendi
+# işleminde (transaction) çalışır ve sürüm kaydı aynı işlemde yazılır.
+#
+# Kullanım:
+#     python -m app.migrations status
+#     python -m app.migrations upgrade [--to N]
+#     python -m app.migrations downgrade --to N
+#     python -m app.migrations stamp [--to N]    # şema dökümden kurulduysa: çalıştırmadan işaretle
+
+import importlib
+import logging
+import pkgutil
+import re
+from dataclasses import dataclass
+from types import ModuleType
+from typing import List, Optional, Set
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, delete, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql import func
+
+logger = logging.getLogger(__name__)
+
+_MODULE_RE = re.compile(r"^m(\d{4})_\w+$")
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True, autoincrement=False),
+    Column("name", String(255), nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    module: ModuleType
+
+    @property
+    def description(self) -> str:
+        return getattr(self.module, "description", self.name)
+
+
+def discover() -> List[Migration]:
+    """Paketteki migration modüllerini sürüm sırasıyla döndürür."""
+    migrations = []
+    for info in pkgutil.iter_modules(__path__):
+        match = _MODULE_RE.match(info.name)
+        if match:
+            module = importlib.import_module(f"{__name__}.{info.name}")
+            migrations.append(Migration(int(match.group(1)), info.name, module))
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Aynı sürüm numarasına sahip birden fazla migration var: {versions}")
+    return migrations
+
+
+def applied_versions(conn: Connection) -> Set[int]:
+    schema_migrations.create(conn, checkfirst=True)
+    return set(conn.execute(select(schema_migrations.c.version)).scalars())
+
+
+def _pending(conn: Connection, target: Optional[int]) -> List[Migration]:
+    applied = applied_versions(conn)
+    return [
+        migration for migration in discover()
+        if migration.version not in applied and (target is None or migration.version <= target)
+    ]
+
+
+def _mark(conn: Connection, migration: Migration) -> None:
+    conn.execute(insert(schema_migrations).values(version=migration.version, name=migration.name))
+
+
+# ----------------------------------------------------------------------
+# Uygulama (async motor üzerinden)
+# ----------------------------------------------------------------------
+async def upgrade(engine: AsyncEngine, target: Optional[int] = None) -> List[Migration]:
+    """Bekleyen migration'ları (target dahil) sırayla uygular; uygulananları döndürür."""
+    async with engine.begin() as conn:
+        pending = await conn.run_sync(_pending, target)
+    for migration in pending:
+        logger.info("Migration uygulanıyor: %s (%s)", migration.name, migration.description)
+        async with engine.begin() as conn:
+            await conn.run_sync(migration.module.upgrade)
+            await conn.run_sync(_mark, migration)
+    return pending
+
+
+async def downgrade(engine: AsyncEngine, target: int) -> List[Migration]:
+    """Sürümü target'tan büyük uygulanmış migration'ları tersten geri alır."""
+    async with engine.begin() as conn:
+        applied = await conn.run_sync(applied_versions)
+    reverted = [m for m in reversed(discover()) if m.version in applied and m.version > target]
+    for migration in reverted:
+        logger.info("Migration geri alınıyor: %s", migration.name)
+        async with engine.begin() as conn:
+            await conn.run_sync(migration.module.downgrade)
+            await conn.execute(delete(schema_migrations).where(schema_migrations.c.version == migration.version))
+    return reverted
+
+
+async def stamp(engine: AsyncEngine, target: Optional[int] = None) -> List[Migration]:
+    """Bekleyen migration'ları çalıştırmadan uygulanmış olarak işaretler."""
+    async with engine.begin() as conn:
+        pending = await conn.run_sync(_pending, target)
+        for migration in pending:
+            await conn.run_sync(_mark, migration)
+    return pending
+
+
+async def status(engine: AsyncEngine) -> List[tuple]:
+    """(migration, uygulandı mı) çiftlerini döndürür."""
+    async with engine.begin() as conn:
+        applied = await conn.run_sync(applied_versions)
+    return [(migration, migration.version in applied) for migration in discover()]
@@ -0,0 +1,48 @@
+# app/migrations/__main__.py
+
+# Migration komut satırı arayüzü. Bağlantı DATABASE_URL ayarından alınır.
+#
+#     python -m app.migrations status
+#     python -m app.migrations upgrade [--to N]
+#     python -m app.migrations downgrade --to N
+#     python -m app.migrations stamp [--to N]
+
+import argparse
+import asyncio
+import logging
+
+from ..database import engine
+from . import downgrade, stamp, status, upgrade
+
+
+async def _run(args) -> None:
+    try:
+        if args.command == "status":
+            for migration, applied in await status(engine):
+                print(f"{'[x]' if applied else '[ ]'} {migration.version:04d} {migration.name}: {migration.description}")
+        elif args.command == "upgrade":
+            done = await upgrade(engine, args.to)
+            print(f"{len(done)} migration uygulandı." if done else "Şema güncel.")
+        elif args.command == "downgrade":
+            done = await downgrade(engine, args.to)
+            print(f"{len(done)} migration geri alındı.")
+        elif args.command == "stamp":
+            done = await stamp(engine, args.to)
+            print(f"{len(done)} migration uygulanmış olarak işaretlendi.")
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.migrations", description="Şema migration'ları")
+    parser.add_argument("command", choices=["status", "upgrade", "downgrade", "stamp"])
+    parser.add_argument("--to", type=int, default=None, help="Hedef sürüm (downgrade için zorunlu)")
+    args = parser.parse_args()
+    if args.command == "downgrade" and args.to is None:
+        parser.error("downgrade için --to verilmelidir (tümünü geri almak için --to 0).")
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# app/migrations/m0001_indexes_and_provider_stats.py
+
+# Başlangıç dökümünden (hizmetypinari_db.sql'in ilk hali) sonra modellere eklenen
+# şema değişiklikleri: provider_stats tablosu ve liste/arama/sıralama indeksleri.
+# Güncel dökümden kurulan veritabanlarında bu değişikliklerin hepsi zaten vardır;
+# işlemler idempotent olduğu için migration orada bir şey yapmadan işaretlenir.
+
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, Table, text
+
+from .ops import create_index, dialect, drop_index, has_index, has_table
+
+description = "provider_stats tablosu; ilan, teklif, değerlendirme ve kullanıcı indeksleri"
+
+
+def _provider_stats_table() -> Table:
+    metadata = MetaData()
+    # Yabancı anahtarın hedefi, create sırasında çözülebilsin diye aynı metadata'da tanımlanır.
+    Table("providers", metadata, Column("id", Integer, primary_key=True))
+    return Table(
+        "provider_stats",
+        metadata,
+        Column("provider_id", Integer, ForeignKey("providers.id"), primary_key=True, autoincrement=False),
+        Column("review_count", Integer, nullable=False, server_default=text("0")),
+        Column("rating_sum", Integer, nullable=False, server_default=text("0")),
+        *(Column(f"rating_{i}", Integer, nullable=False, server_default=text("0")) for i in range(1, 6)),
+    )
+
+
+def upgrade(conn):
+    if not has_table(conn, "provider_stats"):
+        _provider_stats_table().create(conn)
+        # Mevcut değerlendirmelerden puan özetlerini oluştur.
+        conn.execute(text(
+            "INSERT INTO provider_stats (provider_id, review_count, rating_sum, rating_1, rating_2, rating_3, rating_4, rating_5) "
+            "SELECT provider_id, COUNT(*), SUM(rating), "
+            + ", ".join(f"SUM(CASE WHEN rating = {i} THEN 1 ELSE 0 END)" for i in range(1, 6))
+            + " FROM reviews GROUP BY provider_id"
+        ))
+
+    # Bir sağlayıcı bir ilana tek teklif verebilir. Benzersiz indeks job_id ile
+    # başladığı için MySQL'in yabancı anahtar için açtığı tek sütunlu 'job_id'
+    # indeksinin yerini alır. Mükerrer teklifler varsa bu adım başarısız olur;
+    # önce bunların temizlenmesi gerekir.
+    create_index(conn, "uq_offers_job_provider", "offers", ["job_id", "provider_id"], unique=True)
+    if dialect(conn) == "mysql":
+        drop_index(conn, "job_id", "offers")
+
+    create_index(conn, "idx_jobs_active_status_created", "jobs", ["is_active", "status", "created_at", "id"])
+    create_index(conn, "idx_jobs_updated_at", "jobs", ["updated_at"])
+    create_index(conn, "ft_jobs_title_description", "jobs", ["title", "description"], fulltext=True)
+    create_index(conn, "idx_reviews_provider_created", "reviews", ["provider_id", "created_at", "id"])
+    create_index(conn, "idx_users_first_name", "users", ["first_name"], mysql_length={"first_name": 32})
+    create_index(conn, "idx_users_last_name", "users", ["last_name"], mysql_length={"last_name": 32})
+
+
+def downgrade(conn):
+    drop_index(conn, "idx_users_last_name", "users")
+    drop_index(conn, "idx_users_first_name", "users")
+    drop_index(conn, "idx_reviews_provider_created", "reviews")
+    drop_index(conn, "ft_jobs_title_description", "jobs")
+    drop_index(conn, "idx_jobs_updated_at", "jobs")
+    drop_index(conn, "idx_jobs_active_status_created", "jobs")
+    if dialect(conn) == "mysql" and not has_index(conn, "offers", "job_id"):
+        # Yabancı anahtar, benzersiz indeks kaldırılmadan önce kendi indeksine kavuşmalı.
+        create_index(conn, "job_id", "offers", ["job_id"])
+    drop_index(conn, "uq_offers_job_provider", "offers")
+    if has_table(conn, "provider_stats"):
+        _provider_stats_table().drop(conn)
@@ -0,0 +1,29 @@
+# app/migrations/m0002_hot_path_indexes.py
+
+# Sık çalışan sorgular için bileşik indeksler. Her indeks, tam tablo taraması
+# yapmaması gereken bir sorguya karşılık gelir (bkz. benchmarks/check_query_plans.py):
+#
+# - idx_offers_job_status: teklif kabulünde ilanın diğer bekleyen tekliflerini
+#   reddeden UPDATE (WHERE job_id = ? AND status = 'pending').
+# - idx_jobs_service_open / idx_jobs_district_open: hizmet veya ilçe filtreli
+#   ilan araması (aktif/açık ilanlar, created_at DESC, id DESC). Filtre sütunu
+#   başta olduğu için sıralama indeksten okunur, dosya sıralaması (filesort) gerekmez.
+#
+# Mükerrer teklif kontrolü (job_id, provider_id) m0001'deki uq_offers_job_provider
+# benzersiz indeksiyle yapılır; ayrıca bir indeks gerekmez.
+
+from .ops import create_index, drop_index
+
+description = "Teklif kabulü ve filtreli ilan araması için bileşik indeksler"
+
+
+def upgrade(conn):
+    create_index(conn, "idx_offers_job_status", "offers", ["job_id", "status"])
+    create_index(conn, "idx_jobs_service_open", "jobs", ["service_id", "is_active", "status", "created_at", "id"])
+    create_index(conn, "idx_jobs_district_open", "jobs", ["district_id", "is_active", "status", "created_at", "id"])
+
+
+def downgrade(conn):
+    drop_index(conn, "idx_jobs_district_open", "jobs")
+    drop_index(conn, "idx_jobs_service_open", "jobs")
+    drop_index(conn, "idx_offers_job_status", "offers")
@@ -0,0 +1,36 @@
+# app/migrations/m0003_token_revocation.py
+
+# Yalnızca talepler (claims) ile kimlik doğrulama için token sürümü ve iptal kaydı:
+# - users.token_version: token'lardaki 'ver' talebi bununla karşılaştırılır.
+# - token_revocations: süreçlerin artımlı okuduğu, yalnızca eklenen iptal kayıtları.
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, MetaData, Table, text
+from sqlalchemy.sql import func
+
+from .ops import add_column, drop_column, has_table
+
+description = "users.token_version ve token_revocations tablosu"
+
+
+def _token_revocations_table() -> Table:
+    return Table(
+        "token_revocations",
+        MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("user_id", Integer, nullable=False),
+        Column("min_token_version", Integer, nullable=False),
+        Column("suspended", Boolean, nullable=False, server_default=text("0")),
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+    )
+
+
+def upgrade(conn):
+    add_column(conn, "users", Column("token_version", Integer, nullable=False, server_default=text("0")))
+    if not has_table(conn, "token_revocations"):
+        _token_revocations_table().create(conn)
+
+
+def downgrade(conn):
+    if has_table(conn, "token_revocations"):
+        _token_revocations_table().drop(conn)
+    drop_column(conn, "users", "token_version")
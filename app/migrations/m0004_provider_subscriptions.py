@@ -0,0 +1,34 @@
+# app/migrations/m0004_provider_subscriptions.py
+
+# Sağlayıcı ilan abonelikleri (hizmet x ilçe çiftleri). "Bana uygun ilanlar" akışı
+# (GET /api/v1/jobs/for-me) sağlayıcının çiftlerini birincil anahtarın önekiyle okur.
+
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, Table
+
+from .ops import has_table
+
+description = "provider_subscriptions tablosu (hizmet x ilçe abonelikleri)"
+
+
+def _provider_subscriptions_table() -> Table:
+    metadata = MetaData()
+    # Yabancı anahtarların hedefleri, create sırasında çözülebilsin diye aynı metadata'da tanımlanır.
+    for name in ("providers", "services", "districts"):
+        Table(name, metadata, Column("id", Integer, primary_key=True))
+    return Table(
+        "provider_subscriptions",
+        metadata,
+        Column("provider_id", Integer, ForeignKey("providers.id"), primary_key=True, autoincrement=False),
+        Column("service_id", Integer, ForeignKey("services.id"), primary_key=True, autoincrement=False),
+        Column("district_id", Integer, ForeignKey("districts.id"), primary_key=True, autoincrement=False),
+    )
+
+
+def upgrade(conn):
+    if not has_table(conn, "provider_subscriptions"):
+        _provider_subscriptions_table().create(conn)
+
+
+def downgrade(conn):
+    if has_table(conn, "provider_subscriptions"):
+        _provider_subscriptions_table().drop(conn)
@@ -0,0 +1,110 @@
+# app/migrations/ops.py
+
+# Migration'larda kullanılan şema işlemleri. Hepsi senkron bir Connection alır
+# (runner bunları run_sync ile çağırır) ve idempotenttir: nesne zaten varsa (ya da
+# yoksa) sessizce atlanır. MySQL'de DDL ifadeleri işlemi örtük olarak onaylar; yarıda
+# kalmış bir migration bu sayede güvenle yeniden çalıştırılabilir.
+#
+# Migration'lar uygulama modellerini (app.models) içe aktarmaz. Modeller zamanla
+# değişir; bir migration ise yazıldığı andaki şemayı tarif etmelidir. Tablolar bu
+# yüzden veritabanından yansıtılır (reflection).
+
+from typing import List, Optional, Sequence
+
+from sqlalchemy import Column, Index, MetaData, Table, inspect
+from sqlalchemy.engine import Connection
+
+
+def dialect(conn: Connection) -> str:
+    return conn.dialect.name
+
+
+def has_table(conn: Connection, table: str) -> bool:
+    return inspect(conn).has_table(table)
+
+
+def index_names(conn: Connection, table: str) -> List[str]:
+    """Tablodaki indeks ve benzersiz kısıt adları (SQLite'ta UNIQUE kısıtlar ayrı raporlanır)."""
+    inspector = inspect(conn)
+    names = [index["name"] for index in inspector.get_indexes(table)]
+    names += [constraint["name"] for constraint in inspector.get_unique_constraints(table) if constraint["name"]]
+    return names
+
+
+def has_column(conn: Connection, table: str, column: str) -> bool:
+    return any(info["name"] == column for info in inspect(conn).get_columns(table))
+
+
+def add_column(conn: Connection, table: str, column: Column) -> bool:
+    """
+    Sütunu yoksa ekler; eklediyse True döner. NOT NULL sütunlarda mevcut satırlar
+    için server_default verilmelidir.
+    """
+    if has_column(conn, table, column.name):
+        return False
+    preparer = conn.dialect.identifier_preparer
+    ddl = f"ALTER TABLE {preparer.quote(table)} ADD COLUMN {preparer.quote(column.name)} {column.type.compile(dialect=conn.dialect)}"
+    if column.server_default is not None:
+        ddl += f" DEFAULT {column.server_default.arg.text}"
+    if not column.nullable:
+        ddl += " NOT NULL"
+    conn.exec_driver_sql(ddl)
+    return True
+
+
+def drop_column(conn: Connection, table: str, column: str) -> bool:
+    """Sütunu varsa kaldırır (SQLite 3.35+ gerekir); kaldırdıysa True döner."""
+    if not has_column(conn, table, column):
+        return False
+    preparer = conn.dialect.identifier_preparer
+    conn.exec_driver_sql(f"ALTER TABLE {preparer.quote(table)} DROP COLUMN {preparer.quote(column)}")
+    return True
+
+
+def has_index(conn: Connection, table: str, name: str) -> bool:
+    return name in index_names(conn, table)
+
+
+def _reflect(conn: Connection, table: str) -> Table:
+    return Table(table, MetaData(), autoload_with=conn)
+
+
+def create_index(
+    conn: Connection,
+    name: str,
+    table: str,
+    columns: Sequence[str],
+    unique: bool = False,
+    fulltext: bool = False,
+    mysql_length: Optional[dict] = None,
+) -> bool:
+    """
+    İndeksi yoksa oluşturur; oluşturduysa True döner. FULLTEXT indeksler yalnızca
+    MySQL'de oluşturulur (diğer veritabanlarında arama bellek içi indeksle yapılır).
+    mysql_length, MySQL'de önek indeksi için sütun -> karakter sayısıdır.
+    """
+    if fulltext and dialect(conn) != "mysql":
+        return False
+    if has_index(conn, table, name):
+        return False
+    reflected = _reflect(conn, table)
+    kwargs = {}
+    if fulltext:
+        kwargs["mysql_prefix"] = "FULLTEXT"
+    if mysql_length:
+        kwargs["mysql_length"] = mysql_length
+    Index(name, *(reflected.c[column] for column in columns), unique=unique, **kwargs).create(conn)
+    return True
+
+
+def drop_index(conn: Connection, name: str, table: str) -> bool:
+    """
+    İndeksi varsa kaldırır; kaldırdıysa True döner. SQLite'ta tablo tanımındaki
+    UNIQUE kısıtlar (sqlite_autoindex_*) ayrı olarak kaldırılamaz; bunlar atlanır.
+    """
+    existing = next((index for index in inspect(conn).get_indexes(table) if index["name"] == name), None)
+    if existing is None:
+        return False
+    reflected = _reflect(conn, table)
+    Index(name, *(reflected.c[column] for column in existing["column_names"])).drop(conn)
+    return True
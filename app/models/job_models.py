@@ -1,5 +1,5 @@
 import enum
-from sqlalchemy import (Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Enum, DECIMAL)
+from sqlalchemy import (Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Enum, DECIMAL, Index, UniqueConstraint)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -41,6 +41,18 @@ class Job(Base):
     review = relationship("Review", back_populates="job", uselist=False, cascade="all, delete-orphan")
     district = relationship("District", back_populates="jobs")
 
+    __table_args__ = (
+        # GET /api/v1/jobs listelemesinin filtre + sıralama (keyset) indeksi.
+        Index('idx_jobs_active_status_created', 'is_active', 'status', 'created_at', 'id'),
+        # İlan araması (MATCH ... AGAINST) için MySQL FULLTEXT indeksi.
+        Index('ft_jobs_title_description', 'title', 'description', mysql_prefix='FULLTEXT'),
+        # İlan listelerinin ETag'i için MAX(updated_at) sorgusunu tek indeks okumasına indirir.
+        Index('idx_jobs_updated_at', 'updated_at'),
+        # Hizmet / ilçe filtreli ilan araması: filtre + aktif/açık + (created_at, id) sıralaması.
+        Index('idx_jobs_service_open', 'service_id', 'is_active', 'status', 'created_at', 'id'),
+        Index('idx_jobs_district_open', 'district_id', 'is_active', 'status', 'created_at', 'id'),
+    )
+
 class Offer(Base):
     __tablename__ = 'offers'
     id = Column(Integer, primary_key=True)
@@ -53,3 +65,11 @@ class Offer(Base):
     job = relationship("Job", back_populates="offers")
     provider = relationship("Provider", back_populates="offers")
 
+    __table_args__ = (
+        # Bir sağlayıcı aynı ilana yalnızca bir teklif verebilir. Mükerrer teklif
+        # kontrolü ayrı bir SELECT yerine bu benzersiz indeksle yapılır.
+        UniqueConstraint('job_id', 'provider_id', name='uq_offers_job_provider'),
+        # Teklif kabulünde ilanın diğer bekleyen tekliflerini reddeden UPDATE için.
+        Index('idx_offers_job_status', 'job_id', 'status'),
+    )
+
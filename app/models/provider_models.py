@@ -13,3 +13,40 @@ class Provider(Base):
     user = relationship("User", back_populates="provider_profile")
     offers = relationship("Offer", back_populates="provider")
     reviews = relationship("Review", back_populates="provider")
+    stats = relationship("ProviderStats", back_populates="provider", uselist=False)
+    subscriptions = relationship("ProviderSubscription", cascade="all, delete-orphan")
+
+
+# Sağlayıcı puan özetleri. Her yeni değerlendirmede, değerlendirmeyle aynı
+# işlem (transaction) içinde artımlı olarak güncellenir. Böylece ortalama puan
+# için sağlayıcının tüm yorumlarını taramak gerekmez.
+class ProviderStats(Base):
+    __tablename__ = 'provider_stats'
+    provider_id = Column(Integer, ForeignKey('providers.id'), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    # 1-5 arası puanların dağılımı (histogram)
+    rating_1 = Column(Integer, nullable=False, default=0)
+    rating_2 = Column(Integer, nullable=False, default=0)
+    rating_3 = Column(Integer, nullable=False, default=0)
+    rating_4 = Column(Integer, nullable=False, default=0)
+    rating_5 = Column(Integer, nullable=False, default=0)
+
+    provider = relationship("Provider", back_populates="stats")
+
+    @property
+    def average_rating(self):
+        return (self.rating_sum / self.review_count) if self.review_count else None
+
+    @property
+    def histogram(self):
+        return {i: getattr(self, f"rating_{i}") for i in range(1, 6)}
+
+
+# Sağlayıcının ilan aboneliği: hizmetler x ilçeler. Her (hizmet, ilçe) çifti bir satırdır;
+# "bana uygun ilanlar" akışı bu çiftlerin açık ilanlarından oluşur (bkz. app/job_matching.py).
+class ProviderSubscription(Base):
+    __tablename__ = 'provider_subscriptions'
+    provider_id = Column(Integer, ForeignKey('providers.id'), primary_key=True)
+    service_id = Column(Integer, ForeignKey('services.id'), primary_key=True)
+    district_id = Column(Integer, ForeignKey('districts.id'), primary_key=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, CheckConstraint
+from sqlalchemy import Column, Integer, Text, ForeignKey, DateTime, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import Base
@@ -16,3 +16,8 @@ class Review(Base):
     job = relationship("Job", back_populates="review")
     customer = relationship("User", back_populates="reviews_given")
     provider = relationship("Provider", back_populates="reviews")
+
+    __table_args__ = (
+        # Sağlayıcının yorumlarını en yeniden eskiye keyset ile listelemek için.
+        Index('idx_reviews_provider_created', 'provider_id', 'created_at', 'id'),
+    )
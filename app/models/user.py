@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Boolean, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
-from ..database import Base # .. ile bir üst dizindeki 'database' dosyasını içe aktarıyoruz.
+from sqlalchemy.sql import func
+from .base import Base # Tüm modeller aynı Base (ve aynı metadata) üzerinden tanımlanır.
 import enum
 
 # SQL şemasındaki 'roles' tablosunun Enum tipini tanımlıyoruz.
@@ -31,6 +32,9 @@ class User(Base):
     last_name = Column(String(100), nullable=False)
     phone_number = Column(String(20), unique=True, nullable=True)
     is_active = Column(Boolean, default=True)
+    # Token'lardaki 'ver' talebiyle karşılaştırılır. Artırıldığında kullanıcının
+    # o ana kadar aldığı tüm token'lar geçersiz olur (bkz. routers/auth.py).
+    token_version = Column(Integer, nullable=False, default=0, server_default=text("0"))
     
     # 'roles' tablosuyla ilişki kuruyoruz.
     role_id = Column(Integer, ForeignKey("roles.id"), nullable=False)
@@ -44,3 +48,26 @@ class User(Base):
 
     # Müşteri (customer) rolündeki kullanıcının verdiği değerlendirmeler
     reviews_given = relationship("Review", back_populates="customer")
+
+    __table_args__ = (
+        # Admin kullanıcı aramasında ad/soyad önek eşleşmesi (LIKE 'metin%') için.
+        # E-posta için mevcut UNIQUE indeks kullanılır. Önek araması için adların
+        # ilk 32 karakteri yeterlidir; indeks daha küçük kalır.
+        Index('idx_users_first_name', 'first_name', mysql_length=32),
+        Index('idx_users_last_name', 'last_name', mysql_length=32),
+    )
+
+
+# Token iptal kayıtları (yalnızca eklenir). Her süreç bu tabloyu id sırasıyla artımlı
+# okuyarak bellekteki iptal listesini günceller (bkz. app/revocation.py). Kullanıcı
+# silindiğinde de kayıt kalmalıdır; bu yüzden users tablosuna yabancı anahtar yoktur.
+class TokenRevocation(Base):
+    __tablename__ = "token_revocations"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    # Bu sürümden küçük 'ver' taşıyan token'lar reddedilir.
+    min_token_version = Column(Integer, nullable=False)
+    # Hesap askıya alındı veya silindi: kullanıcının hiçbir token'ı kabul edilmez.
+    suspended = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
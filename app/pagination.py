@@ -0,0 +1,120 @@
+# app/pagination.py
+
+# Bu dosya, keyset (cursor) sayfalama için yardımcı fonksiyonları içerir.
+# OFFSET tabanlı sayfalamada veritabanı atlanan satırları da taramak zorundadır;
+# derin sayfalar doğrusal olarak yavaşlar ve yeni kayıt geldiğinde sayfalar kayar.
+# Keyset sayfalamada ise son görülen (sıralama anahtarı, id) çiftinden devam edilir.
+
+import base64
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, func, literal_column, or_, select
+
+# İstemciye bir sonraki sayfanın imlecini (cursor) bildirmek için kullanılan başlık.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            parsed = datetime.fromisoformat(value["dt"])
+            # Saklanan zamanlar (ve eşleştirme indeksi) saat dilimsiz UTC'dir; saat dilimli
+            # bir imleç karşılaştırmada TypeError'a yol açmasın diye aynı biçime çevrilir.
+            if parsed.tzinfo is not None:
+                parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+            return parsed
+        if "dec" in value:
+            return Decimal(value["dec"])
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """Sıralama anahtarı değerlerini opak (base64url) bir imlece dönüştürür."""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int, types: Optional[Sequence[Any]] = None) -> List[Any]:
+    """
+    Opak imleci çözer. Geçersizse 400 hatası fırlatır. 'types' verilirse her değerin
+    türü (isinstance ile; örn. (datetime, int) veya ((int, float), int)) de denetlenir;
+    böylece başka bir sıralamanın imleci sorguya ulaşmadan reddedilir.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("cursor size")
+        # Geçersiz ondalık metni (örn. {"dec": "abc"}) decimal.InvalidOperation (ArithmeticError) fırlatır.
+        values = [_decode_value(v) for v in values]
+        if types is not None:
+            for value, expected in zip(values, types):
+                # bool, int'in alt sınıfıdır; imleçte sayı yerine kabul edilmez.
+                if isinstance(value, bool) or not isinstance(value, expected):
+                    raise TypeError("cursor type")
+        return values
+    except (ValueError, TypeError, KeyError, ArithmeticError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Geçersiz sayfalama imleci (cursor)."
+        )
+
+
+def keyset_after(columns: Sequence[Any], values: Sequence[Any], descending: Sequence[bool]):
+    """
+    (c1, c2, ...) sıralamasında verilen değerlerden SONRA gelen satırlar için
+    WHERE koşulunu üretir. Satır karşılaştırması (row constructor) yerine açık
+    OR/AND biçimi kullanılır; MySQL bu biçimde bileşik indeksi daha iyi kullanır.
+    İlk sütun için ayrıca kapsayıcı bir sınır (c1 <= v1) eklenir; aksi halde
+    planlayıcı OR koşulundan aralık taraması çıkaramaz ve derin sayfalar yavaşlar.
+    """
+    clauses = []
+    for i, (column, value, desc) in enumerate(zip(columns, values, descending)):
+        equal_prefix = [columns[j] == values[j] for j in range(i)]
+        step = column < value if desc else column > value
+        clauses.append(and_(*equal_prefix, step) if equal_prefix else step)
+    leading_bound = columns[0] <= values[0] if descending[0] else columns[0] >= values[0]
+    return and_(leading_bound, or_(*clauses))
+
+
+def next_cursor(rows: Sequence[Any], limit: int, *attributes: str) -> Optional[str]:
+    """Sayfa doluysa son satırın anahtarlarından bir sonraki imleci üretir."""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(*(getattr(last, attr) for attr in attributes))
+
+
+# Filtreli listelerde toplam kayıt sayısı bu başlıkta döndürülür.
+TOTAL_COUNT_HEADER = "X-Total-Count"
+# Sayım üst sınıra ulaştıysa (toplam en az bu kadar) "true" değerini alır.
+TOTAL_COUNT_CAPPED_HEADER = "X-Total-Count-Capped"
+
+
+def capped_count_query(query, cap: int):
+    """
+    Filtreli sorgunun satır sayısını en fazla cap + 1 satır okuyarak sayar.
+    Kısa arama önekleri yüz binlerce satırla eşleşebilir; tam COUNT(*) yerine
+    sınırlı sayım, sayfa sorgusu ile aynı sürede kalır.
+    """
+    limited = query.with_only_columns(literal_column("1"), maintain_column_froms=True).order_by(None).limit(cap + 1).subquery()
+    return select(func.count()).select_from(limited)
+
+
+def total_count_headers(total: int, cap: int) -> dict:
+    """Sınırlı sayımın sonucunu yanıt başlıklarına çevirir."""
+    if total > cap:
+        return {TOTAL_COUNT_HEADER: str(cap), TOTAL_COUNT_CAPPED_HEADER: "true"}
+    return {TOTAL_COUNT_HEADER: str(total)}
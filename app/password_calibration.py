@@ -0,0 +1,147 @@
+# app/password_calibration.py
+
+# Argon2 maliyet parametrelerini sunucuya göre ayarlayan komut.
+#
+#     python -m app.password_calibration --target-ms 250 --concurrency 4
+#
+# Hash süresi kabaca bellek (memory_cost) x geçiş sayısı (time_cost) ile orantılıdır.
+# Bellek maliyeti saldırılara karşı daha etkili olduğundan önce bellek seçilir:
+# --max-memory-mib ile başlanır ve hedef süreyi aşıyorsa orantılı olarak küçültülür.
+# Bellek üst sınırdayken süre hâlâ hedefin altındaysa geçiş sayısı artırılır.
+# Ölçüm, parola havuzundaki işçi sayısı kadar eşzamanlı hash ile yapılır; yoğunlukta
+# bellek bant genişliği paylaşıldığı için tek başına ölçülen süre iyimser kalır.
+#
+# Sonuç, .env dosyasına eklenecek PASSWORD_ARGON2_* satırları olarak yazdırılır.
+# Değerler değiştirildiğinde mevcut hash'ler kullanıcıların bir sonraki başarılı
+# girişinde arka planda güncellenir (bkz. routers/auth.py).
+
+import argparse
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+from passlib.hash import argon2
+
+from .passwords import PASSWORD_POOL_WORKERS, pwd_context
+
+_SAMPLE_PASSWORD = "Kalibrasyon-Parolasi-123!"
+
+
+def measure(memory_cost: int, time_cost: int, parallelism: int, samples: int = 5, concurrency: int = 1) -> float:
+    """Verilen parametrelerle bir hash'in medyan süresini (saniye) ölçer."""
+    handler = argon2.using(memory_cost=memory_cost, rounds=time_cost, parallelism=parallelism)
+
+    def timed_hash(_) -> float:
+        started = time.perf_counter()
+        handler.hash(_SAMPLE_PASSWORD)
+        return time.perf_counter() - started
+
+    timings = []
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # İlk tur ısınma içindir (bellek ayırma, önbellekler); ölçüme katılmaz.
+        list(executor.map(timed_hash, range(concurrency)))
+        for _ in range(samples):
+            timings.extend(executor.map(timed_hash, range(concurrency)))
+    return statistics.median(timings)
+
+
+def _round_memory(memory_cost: int) -> int:
+    # Bellek 1 MiB katlarına yuvarlanır (Argon2 en az 8 * parallelism KiB ister).
+    return max(1024, memory_cost // 1024 * 1024)
+
+
+def calibrate(
+    target_ms: float,
+    max_memory_mib: int = 64,
+    min_memory_mib: int = 19,
+    min_time_cost: int = 2,
+    max_time_cost: int = 10,
+    parallelism: Optional[int] = None,
+    samples: int = 5,
+    concurrency: int = 1,
+) -> Dict[str, float]:
+    """Hedef süreyi aşmayan en yüksek maliyetli parametreleri seçer."""
+    parallelism = parallelism or pwd_context.handler("argon2").parallelism
+    target = target_ms / 1000.0
+    floor = _round_memory(min_memory_mib * 1024)
+    memory_cost = _round_memory(max_memory_mib * 1024)
+    time_cost = min_time_cost
+
+    elapsed = measure(memory_cost, time_cost, parallelism, samples, concurrency)
+    # Hedefi aşıyorsa belleği orantılı olarak küçült (alt sınıra kadar).
+    while elapsed > target and memory_cost > floor:
+        memory_cost = max(floor, _round_memory(int(memory_cost * target / elapsed * 0.95)))
+        elapsed = measure(memory_cost, time_cost, parallelism, samples, concurrency)
+
+    # Bellek üst sınırdayken süre artıyorsa geçiş sayısını artır.
+    while time_cost < max_time_cost:
+        estimated = elapsed * (time_cost + 1) / time_cost
+        if estimated > target:
+            break
+        candidate = measure(memory_cost, time_cost + 1, parallelism, samples, concurrency)
+        if candidate > target:
+            break
+        time_cost, elapsed = time_cost + 1, candidate
+
+    return {
+        "memory_cost": memory_cost,
+        "time_cost": time_cost,
+        "parallelism": parallelism,
+        "elapsed_ms": elapsed * 1000.0,
+        "within_target": elapsed <= target,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.password_calibration",
+        description="Argon2 maliyet parametrelerini hedef hash süresine göre seçer.",
+    )
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Giriş başına hedef hash süresi (ms)")
+    parser.add_argument("--max-memory-mib", type=int, default=64)
+    parser.add_argument("--min-memory-mib", type=int, default=19, help="Bu değerin altına inilmez (OWASP: 19 MiB)")
+    parser.add_argument("--min-time-cost", type=int, default=2)
+    parser.add_argument("--max-time-cost", type=int, default=10)
+    parser.add_argument("--parallelism", type=int, default=None, help="Boşsa mevcut ayar kullanılır")
+    parser.add_argument("--samples", type=int, default=5)
+    parser.add_argument(
+        "--concurrency", type=int, default=PASSWORD_POOL_WORKERS,
+        help="Aynı anda çalışan hash sayısı (varsayılan: parola havuzu işçi sayısı)",
+    )
+    args = parser.parse_args()
+
+    current = pwd_context.handler("argon2")
+    current_ms = measure(current.memory_cost, current.default_rounds, current.parallelism, args.samples, args.concurrency) * 1000
+    print(
+        f"Mevcut: m={current.memory_cost} KiB, t={current.default_rounds}, p={current.parallelism} "
+        f"-> {current_ms:.1f} ms (eşzamanlılık {args.concurrency})"
+    )
+
+    result = calibrate(
+        args.target_ms,
+        max_memory_mib=args.max_memory_mib,
+        min_memory_mib=args.min_memory_mib,
+        min_time_cost=args.min_time_cost,
+        max_time_cost=args.max_time_cost,
+        parallelism=args.parallelism,
+        samples=args.samples,
+        concurrency=args.concurrency,
+    )
+    print(
+        f"Seçilen: m={result['memory_cost']} KiB, t={result['time_cost']}, p={result['parallelism']} "
+        f"-> {result['elapsed_ms']:.1f} ms"
+    )
+    if not result["within_target"]:
+        print(
+            f"Uyarı: en düşük maliyetle bile hedef ({args.target_ms:.0f} ms) aşılıyor; "
+            "hedefi veya işçi sayısını gözden geçirin."
+        )
+    print("\n.env için:")
+    print(f"PASSWORD_ARGON2_MEMORY_COST={result['memory_cost']}")
+    print(f"PASSWORD_ARGON2_TIME_COST={result['time_cost']}")
+    print(f"PASSWORD_ARGON2_PARALLELISM={result['parallelism']}")
+
+
+if __name__ == "__main__":
+    main()
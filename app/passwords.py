@@ -0,0 +1,211 @@
+# app/passwords.py
+
+# Bu dosya, parola hashleme ve doğrulama işlemlerini içerir.
+# Argon2 bilerek yavaş bir algoritmadır (istek başına onlarca milisaniye).
+# Bu işlemleri doğrudan async handler içinde çalıştırmak tüm uvicorn olay
+# döngüsünü (event loop) bloklar. Bu yüzden işler sınırlı bir işçi havuzunda
+# (thread veya process) çalıştırılır ve kuyruk dolduğunda hızlıca reddedilir.
+
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from passlib.context import CryptContext
+
+from .config import settings
+
+
+def argon2_options() -> Dict[str, int]:
+    """Ayarlarda verilen Argon2 maliyet parametrelerini CryptContext seçeneklerine çevirir."""
+    options = {}
+    if settings.password_argon2_memory_cost:
+        options["argon2__memory_cost"] = settings.password_argon2_memory_cost
+    if settings.password_argon2_time_cost:
+        # passlib, Argon2'nin time_cost parametresine 'rounds' der.
+        options["argon2__rounds"] = settings.password_argon2_time_cost
+    if settings.password_argon2_parallelism:
+        options["argon2__parallelism"] = settings.password_argon2_parallelism
+    return options
+
+
+# Şifre hashleme için CryptContext objesi oluşturulur. Artık Argon2 kullanılıyor.
+# Parametreleri bu ayarlardan farklı olan hash'ler needs_rehash ile tespit edilir.
+pwd_context = CryptContext(schemes=["argon2"], deprecated="auto", **argon2_options())
+
+# Havuz ayarları (bkz. app/config.py).
+PASSWORD_POOL_KIND = settings.password_pool_kind
+PASSWORD_POOL_WORKERS = settings.password_pool_workers or min(4, os.cpu_count() or 1)
+PASSWORD_POOL_MAX_QUEUE = settings.password_pool_max_queue
+
+
+def hash_password(password: str) -> str:
+    """Hashes a password using the configured scheme (Argon2)."""
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verifies a plain password against a hashed one."""
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with other parameters than the current ones (cheap, no hashing)."""
+    return pwd_context.needs_update(hashed_password)
+
+
+def _timed_call(func: Callable[..., Any], *args: Any) -> tuple:
+    # İşçi tarafında çalışır. Başlangıç zamanı duvar saatiyle (time.time) ölçülür,
+    # çünkü process havuzunda monotonic saat süreçler arasında karşılaştırılamaz.
+    started_at = time.time()
+    result = func(*args)
+    return result, started_at, time.time() - started_at
+
+
+class PasswordPoolOverloaded(Exception):
+    """Bekleyen parola işi sayısı kuyruk sınırını aştığında fırlatılır."""
+
+
+class PasswordHasherPool:
+    """Parola işlerini sınırlı eşzamanlılıkla bir executor üzerinde çalıştırır."""
+
+    def __init__(self, kind: str = "thread", max_workers: int = 4, max_queue: int = 64):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Geçersiz havuz türü: '{kind}'. 'thread' veya 'process' olmalı.")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        # Metrikler
+        self.in_flight = 0
+        self.queued = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self.hash_time_total = 0.0
+        self.hash_time_max = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-worker"
+                )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._semaphore
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Fonksiyonu havuzda çalıştırır. Kuyruk doluysa PasswordPoolOverloaded fırlatır."""
+        # Kuyrukta bekleyenler + çalışanlar sınırı aşıyorsa beklemeden reddet.
+        if self.queued + self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise PasswordPoolOverloaded()
+
+        self.submitted += 1
+        self.queued += 1
+        enqueued_at = time.time()
+        semaphore = self._get_semaphore()
+        try:
+            await semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, started_at, elapsed = await loop.run_in_executor(
+                self._get_executor(), _timed_call, func, *args
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+
+        queue_time = max(0.0, started_at - enqueued_at)
+        self.completed += 1
+        self.queue_time_total += queue_time
+        self.queue_time_max = max(self.queue_time_max, queue_time)
+        self.hash_time_total += elapsed
+        self.hash_time_max = max(self.hash_time_max, elapsed)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """İzleme için havuz metriklerini döndürür."""
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "queue_time_avg": (self.queue_time_total / self.completed) if self.completed else 0.0,
+            "queue_time_max": self.queue_time_max,
+            "hash_time_avg": (self.hash_time_total / self.completed) if self.completed else 0.0,
+            "hash_time_max": self.hash_time_max,
+        }
+
+    def shutdown(self) -> None:
+        """Executor'ı kapatır. Uygulama kapanırken çağrılır."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._semaphore = None
+
+
+# Uygulama genelinde kullanılan tek havuz örneği.
+password_pool = PasswordHasherPool(
+    kind=PASSWORD_POOL_KIND,
+    max_workers=PASSWORD_POOL_WORKERS,
+    max_queue=PASSWORD_POOL_MAX_QUEUE,
+)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hashes a password in the worker pool without blocking the event loop."""
+    return await password_pool.run(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verifies a password in the worker pool without blocking the event loop."""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+
+async def hash_passwords_async(passwords: List[str], retry_delay: float = 0.05) -> List[str]:
+    """
+    Hashes many passwords in parallel (e.g. bulk user import).
+    At most max_workers - 1 jobs are submitted at once, so at least one worker stays
+    free for interactive logins, and no new job is submitted while other (interactive)
+    work is waiting in the pool queue. If the pool is momentarily full the job is retried.
+    """
+    limit = asyncio.Semaphore(max(1, password_pool.max_workers - 1))
+
+    async def hash_one(password: str) -> str:
+        async with limit:
+            while True:
+                # Kuyrukta bekleyen iş varsa önce o çalışsın (girişler önceliklidir).
+                if password_pool.queued:
+                    await asyncio.sleep(retry_delay)
+                    continue
+                try:
+                    return await password_pool.run(hash_password, password)
+                except PasswordPoolOverloaded:
+                    await asyncio.sleep(retry_delay)
+
+    return list(await asyncio.gather(*(hash_one(password) for password in passwords)))
@@ -0,0 +1,235 @@
+# app/query_stats.py
+
+# Bu dosya, istek başına veritabanı sorgu istatistiklerini toplar:
+# - SQLAlchemy before/after_cursor_execute olaylarıyla her ifadenin süresi ölçülür.
+# - İfadeler parmak izine (fingerprint) indirgenir: sabitler ve IN listeleri atılır,
+#   böylece aynı sorgunun farklı parametrelerle tekrarı (N+1) yakalanır.
+# - Ara katman (middleware) sonucu 'Server-Timing' başlığına yazar ve yapılandırılmış
+#   (JSON) bir log satırı üretir.
+# - Rotalar query_budget(n) bağımlılığıyla sorgu bütçesi tanımlayabilir. Bütçe aşılırsa
+#   uyarı loglanır; katı modda (QUERY_BUDGET_STRICT=true, testler için) istek 500 ile reddedilir.
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, List, Optional
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+# ----------------------------------------------------------------------
+# Parmak izi (fingerprint)
+# ----------------------------------------------------------------------
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])")
+_PLACEHOLDER_LIST_RE = re.compile(r"\(\s*(?:\?|%s|:\w+)(?:\s*,\s*(?:\?|%s|:\w+))*\s*\)")
+_VALUES_LIST_RE = re.compile(r"(VALUES\s*\(\?\))(?:\s*,\s*\(\?\))+", re.IGNORECASE)
+_PLACEHOLDER_RE = re.compile(r"%s|:\w+|\?")
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    İfadeyi parametrelerinden bağımsız bir biçime indirger. Örn:
+    "SELECT * FROM jobs WHERE id IN (?, ?, ?) AND status = 'open'" ->
+    "SELECT * FROM jobs WHERE id IN (?) AND status = ?"
+    Derlenmiş ifade metinleri sınırlı sayıda olduğu için sonuç önbelleğe alınır.
+    """
+    text = _SPACE_RE.sub(" ", statement).strip()
+    text = _STRING_RE.sub("?", text)
+    text = _NUMBER_RE.sub("?", text)
+    text = _PLACEHOLDER_RE.sub("?", text)
+    text = _PLACEHOLDER_LIST_RE.sub("(?)", text)
+    text = _VALUES_LIST_RE.sub(r"\1", text)
+    return text
+
+
+# ----------------------------------------------------------------------
+# İstek başına istatistikler
+# ----------------------------------------------------------------------
+class QueryStats:
+    """Tek bir istekte (veya capture_queries bloğunda) çalışan ifadelerin özeti."""
+
+    __slots__ = ("count", "db_time", "fingerprints", "budget", "started")
+
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.fingerprints: Counter = Counter()
+        self.budget: Optional[int] = None
+        self.started = time.perf_counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.db_time += elapsed
+        self.fingerprints[fingerprint(statement)] += 1
+
+    def repeated(self, threshold: Optional[int] = None) -> Dict[str, int]:
+        """En az 'threshold' kez çalışmış parmak izleri (olası N+1)."""
+        threshold = threshold or settings.query_repeat_threshold
+        return {fp: count for fp, count in self.fingerprints.most_common() if count >= threshold}
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    def server_timing(self) -> str:
+        total_ms = (time.perf_counter() - self.started) * 1000
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.count} queries", '
+            f"app;dur={max(total_ms - self.db_time * 1000, 0.0):.2f}"
+        )
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+@contextmanager
+def capture_queries() -> Iterator[QueryStats]:
+    """
+    Blok içinde çalışan sorguları sayar (testler ve benchmark'lar için).
+
+        with capture_queries() as stats:
+            await client.get("/api/v1/jobs/1")
+        assert stats.count <= 3
+    """
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+# ----------------------------------------------------------------------
+# SQLAlchemy olayları
+# ----------------------------------------------------------------------
+# Her ifadeden sonra (istek dışında çalışanlar dahil) çağrılan gözlemciler.
+# İmza: observer(conn, cursor, statement, parameters, executemany, elapsed)
+_statement_observers: List[Callable[..., None]] = []
+
+
+def add_statement_observer(observer: Callable[..., None]) -> None:
+    """Tüm ifadelerin süresini alacak bir gözlemci ekler (örn. yavaş sorgu günlüğü)."""
+    if observer not in _statement_observers:
+        _statement_observers.append(observer)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _statement_observers or _current_stats.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = conn.info.get("query_started_at")
+    if not started_at:
+        return
+    elapsed = time.perf_counter() - started_at.pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for observer in _statement_observers:
+        observer(conn, cursor, statement, parameters, executemany, elapsed)
+
+
+def _handle_error(exception_context):
+    # Hata alan ifadenin başlangıç zamanı yığından atılır; sonraki ölçümler kaymaz.
+    connection = exception_context.connection
+    started_at = connection.info.get("query_started_at") if connection is not None else None
+    # ExceptionContext.cursor her sürümde atanmaz; ifade yürütme bağlamı varsa
+    # before_cursor_execute çalışmış ve zaman yığına eklenmiştir.
+    if started_at and exception_context.execution_context is not None:
+        started_at.pop()
+
+
+def install_query_hooks(*engines: AsyncEngine) -> None:
+    """Sorgu ölçüm olaylarını motorlara bağlar (aynı motor birden fazla verilebilir)."""
+    for async_engine in dict.fromkeys(engines):
+        sync_engine = async_engine.sync_engine
+        if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+            event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+            event.listen(sync_engine, "handle_error", _handle_error)
+
+
+# ----------------------------------------------------------------------
+# Sorgu bütçesi
+# ----------------------------------------------------------------------
+def query_budget(max_queries: int):
+    """
+    Rota için sorgu bütçesi tanımlayan bağımlılık. Bütçe, kimlik doğrulama gibi
+    diğer bağımlılıkların sorguları dahil tüm isteğe uygulanır:
+
+        @router.get("/{job_id}", dependencies=[Depends(query_budget(2))])
+    """
+    async def _set_budget() -> None:
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.budget = max_queries
+    return _set_budget
+
+
+# ----------------------------------------------------------------------
+# Ara katman
+# ----------------------------------------------------------------------
+def _log_payload(request: Request, response: Response, stats: QueryStats, repeated: Dict[str, int]) -> dict:
+    route = request.scope.get("route")
+    return {
+        "method": request.method,
+        "route": getattr(route, "path", request.url.path),
+        "status": response.status_code,
+        "queries": stats.count,
+        "db_ms": round(stats.db_time * 1000, 2),
+        "budget": stats.budget,
+        "repeated": [{"fingerprint": fp, "count": count} for fp, count in repeated.items()],
+    }
+
+
+async def query_stats_middleware(request: Request, call_next) -> Response:
+    """İsteğin sorgu sayısını ve veritabanı süresini ölçer, başlığa ve loglara yazar."""
+    if not settings.query_stats_enabled:
+        return await call_next(request)
+
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_stats.reset(token)
+
+    repeated = stats.repeated()
+    if stats.over_budget or repeated:
+        payload = _log_payload(request, response, stats, repeated)
+        event_name = "query_budget_exceeded" if stats.over_budget else "repeated_queries"
+        logger.warning("%s %s", event_name, orjson.dumps(payload).decode())
+        if stats.over_budget and settings.query_budget_strict:
+            response = ORJSONResponse(
+                status_code=500,
+                content={
+                    "detail": f"Sorgu bütçesi aşıldı: {stats.count} sorgu (bütçe {stats.budget}).",
+                    "queries": payload["repeated"] or list(stats.fingerprints),
+                },
+            )
+    elif logger.isEnabledFor(logging.DEBUG):
+        logger.debug("request_queries %s", orjson.dumps(_log_payload(request, response, stats, repeated)).decode())
+
+    response.headers.append(SERVER_TIMING_HEADER, stats.server_timing())
+    return response
@@ -0,0 +1,214 @@
+# app/reference_data.py
+
+# Bu dosya, nadiren değişen referans verileri (roller, kategoriler, hizmetler,
+# ilçeler) için bellek içi, sürümlü bir depo içerir. Veriler uygulama
+# başlarken bir kez yüklenir ve admin yazma işlemlerinden sonra yenilenir.
+# Böylece kayıt, ilan listeleme ve arama gibi sık kullanılan rotalar bu
+# tablolara sorgu ya da JOIN göndermeden ID/isim çözümleyebilir.
+
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from .http_cache import make_etag
+from .models.category_models import Category, Service
+from .models.district_models import District
+from .models.user import Role, RoleName
+from .schemas import category_schema, district_schema
+from .schemas.user_schema import RoleResponse
+from .text_utils import turkish_fold
+
+_roles_adapter = TypeAdapter(List[RoleResponse])
+_categories_adapter = TypeAdapter(List[category_schema.Category])
+_services_adapter = TypeAdapter(List[category_schema.Service])
+_districts_adapter = TypeAdapter(List[district_schema.District])
+
+
+@dataclass(frozen=True)
+class ReferenceSnapshot:
+    """Referans verilerinin değişmez (immutable) bir sürümü."""
+    version: int = 0
+    loaded_at: Optional[datetime] = None
+    roles: Dict[int, RoleResponse] = field(default_factory=dict)
+    roles_by_name: Dict[RoleName, RoleResponse] = field(default_factory=dict)
+    categories: Dict[int, category_schema.Category] = field(default_factory=dict)
+    services: Dict[int, category_schema.Service] = field(default_factory=dict)
+    districts: Dict[int, district_schema.District] = field(default_factory=dict)
+    # JSON uyumlu sözlükler (liste yanıtlarına doğrulamasız gömülmek için)
+    services_json: Dict[int, dict] = field(default_factory=dict)
+    districts_json: Dict[int, dict] = field(default_factory=dict)
+    # Uç nokta adı -> (önceden serileştirilmiş JSON gövdesi, ETag)
+    payloads: Dict[str, tuple] = field(default_factory=dict)
+
+
+class ReferenceDataStore:
+    """
+    Referans verilerini tutar. Okumalar kilitsizdir: her yüklemede yeni bir
+    anlık görüntü (snapshot) oluşturulur ve tek bir atama ile yerine konur.
+
+    ensure() bilinmeyen bir ID gördüğünde (başka bir süreçte eklenmiş olabilir) depoyu
+    yeniden yükler. Yeniden yüklemeden sonra da bulunamayan ID'ler miss_ttl_seconds
+    boyunca "yok" olarak hatırlanır ve eksik ID kaynaklı yüklemeler en fazla
+    min_reload_seconds aralıkla (süreç başına) yapılır; böylece geçersiz ID içeren istekler her
+    seferinde dört tablonun tamamını yeniden okutmaz.
+    """
+
+    # Hatırlanan eksik ID sayısı bu sınırı aşarsa liste temizlenir.
+    MAX_MISSING = 10000
+
+    def __init__(self, miss_ttl_seconds: float = 10.0, min_reload_seconds: float = 1.0):
+        self._snapshot = ReferenceSnapshot()
+        self.miss_ttl_seconds = miss_ttl_seconds
+        self.min_reload_seconds = min_reload_seconds
+        # ("service" | "district", id) -> bu ana kadar yok kabul edilir (monotonic).
+        self._missing: Dict[Tuple[str, int], float] = {}
+        self._last_miss_reload = float("-inf")
+        self.miss_reloads = 0
+
+    @property
+    def snapshot(self) -> ReferenceSnapshot:
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._snapshot.loaded_at is not None
+
+    async def load(self, db: AsyncSession) -> ReferenceSnapshot:
+        """Tüm referans tablolarını veritabanından okuyup yeni bir sürüm oluşturur."""
+        roles = [RoleResponse.model_validate(r) for r in (await db.execute(select(Role).order_by(Role.id))).scalars()]
+        services = [
+            category_schema.Service.model_validate(s)
+            for s in (await db.execute(select(Service).order_by(Service.id))).scalars()
+        ]
+        districts = [
+            district_schema.District.model_validate(d)
+            for d in (await db.execute(select(District).order_by(District.id))).scalars()
+        ]
+
+        # Kategoriler, hizmetleriyle birlikte bellekte birleştirilir (ek sorgu yok).
+        services_by_category: Dict[int, List[category_schema.Service]] = {}
+        for service in services:
+            services_by_category.setdefault(service.category_id, []).append(service)
+        categories = []
+        for row in (await db.execute(select(Category).order_by(Category.id))).scalars():
+            categories.append(category_schema.Category(
+                id=row.id,
+                name=row.name,
+                slug=row.slug,
+                description=row.description,
+                is_active=row.is_active if row.is_active is not None else True,
+                services=services_by_category.get(row.id, []),
+            ))
+
+        payloads = {}
+        for name, adapter, items in (
+            ("roles", _roles_adapter, roles),
+            ("categories", _categories_adapter, categories),
+            ("services", _services_adapter, services),
+            ("districts", _districts_adapter, districts),
+        ):
+            body = adapter.dump_json(items)
+            payloads[name] = (body, make_etag(body))
+
+        self._snapshot = ReferenceSnapshot(
+            version=self._snapshot.version + 1,
+            loaded_at=datetime.now(timezone.utc),
+            roles={r.id: r for r in roles},
+            roles_by_name={r.role_name: r for r in roles},
+            categories={c.id: c for c in categories},
+            services={s.id: s for s in services},
+            districts={d.id: d for d in districts},
+            services_json={s.id: s.model_dump(mode="json") for s in services},
+            districts_json={d.id: d.model_dump(mode="json") for d in districts},
+            payloads=payloads,
+        )
+        self._missing.clear()
+        return self._snapshot
+
+    # ------------------------------------------------------------------
+    # Çözümleme yardımcıları
+    # ------------------------------------------------------------------
+    def role_by_name(self, role_name: RoleName) -> Optional[RoleResponse]:
+        return self._snapshot.roles_by_name.get(role_name)
+
+    def role(self, role_id: int) -> Optional[RoleResponse]:
+        return self._snapshot.roles.get(role_id)
+
+    def service(self, service_id: int) -> Optional[category_schema.Service]:
+        return self._snapshot.services.get(service_id)
+
+    def district(self, district_id: int) -> Optional[district_schema.District]:
+        return self._snapshot.districts.get(district_id)
+
+    def service_json(self, service_id: int) -> Optional[dict]:
+        return self._snapshot.services_json.get(service_id)
+
+    def district_json(self, district_id: int) -> Optional[dict]:
+        return self._snapshot.districts_json.get(district_id)
+
+    def service_ids_for_category(self, category_id: int) -> List[int]:
+        category = self._snapshot.categories.get(category_id)
+        return [s.id for s in category.services] if category else []
+
+    def district_ids_for_city(self, city_name: str) -> List[int]:
+        city = turkish_fold(city_name)
+        return [d.id for d in self._snapshot.districts.values() if turkish_fold(d.city_name) == city]
+
+    def has_all(self, service_ids: Iterable[int] = (), district_ids: Iterable[int] = ()) -> bool:
+        """Verilen tüm ID'ler depoda var mı? (Başka bir süreçte eklenmiş kayıtları yakalamak için.)"""
+        snapshot = self._snapshot
+        return all(i in snapshot.services for i in service_ids) and all(
+            i in snapshot.districts for i in district_ids
+        )
+
+    def _unknown(self, service_ids: Iterable[int], district_ids: Iterable[int], now: float) -> List[Tuple[str, int]]:
+        """Depoda olmayan ve yakın zamanda yok olarak hatırlanmayan ID'leri döndürür."""
+        snapshot = self._snapshot
+        candidates = [("service", i) for i in service_ids if i not in snapshot.services]
+        candidates += [("district", i) for i in district_ids if i not in snapshot.districts]
+        return [key for key in candidates if self._missing.get(key, now) <= now]
+
+    async def ensure(self, db: AsyncSession, service_ids: Iterable[int] = (), district_ids: Iterable[int] = ()) -> None:
+        """Eksik ID varsa (eksik ID'ler için sınırlı sıklıkla) depoyu yeniden yükler."""
+        if not self.is_loaded:
+            await self.load(db)
+            return
+        now = time.monotonic()
+        unknown = self._unknown(service_ids, district_ids, now)
+        if not unknown:
+            return
+        # Eksik ID kaynaklı yüklemeler sınırlıdır; sınıra takılan ID'ler doğrulanmadığı için hatırlanmaz.
+        if now - self._last_miss_reload < self.min_reload_seconds:
+            return
+        self._last_miss_reload = now
+        self.miss_reloads += 1
+        await self.load(db)
+        now = time.monotonic()
+        unknown = self._unknown(
+            (i for kind, i in unknown if kind == "service"), (i for kind, i in unknown if kind == "district"), now
+        )
+        # Yüklemeden sonra da bulunamayan ID'ler bir süre yok olarak hatırlanır.
+        if len(self._missing) + len(unknown) > self.MAX_MISSING:
+            self._missing = {key: until for key, until in self._missing.items() if until > now}
+            if len(self._missing) + len(unknown) > self.MAX_MISSING:
+                self._missing.clear()
+        expires = now + self.miss_ttl_seconds
+        for key in unknown:
+            self._missing[key] = expires
+
+    def payload(self, name: str) -> tuple:
+        """Uç nokta için (JSON gövdesi, ETag) çiftini döndürür."""
+        return self._snapshot.payloads[name]
+
+
+# Uygulama genelinde kullanılan referans veri deposu.
+reference_data = ReferenceDataStore()
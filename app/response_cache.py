@@ -0,0 +1,623 @@
+# app/response_cache.py
+
+# Bu dosya, en sık okunan GET yanıtları (ilan detayı, ilan listeleri, teklif ve
+# değerlendirme listeleri) için değiştirilebilir arka uçlu bir yanıt önbelleği içerir.
+#
+# - Girdiler rota yolu + sıralanmış sorgu parametreleriyle anahtarlanır.
+# - Her girdi etiketlerle (tag) işaretlenir (örn. "job:5", "jobs", "provider:3", "user:7").
+#   Yazma rotaları commit sonrası yalnızca etkiledikleri etiketleri geçersiz kılar.
+# - Her geçersiz kılma genel bir nesil (generation) sayacını artırır ve etikete o
+#   nesli yazar. Dolum başlamadan nesil okunur; yazma, rota etiketlerinden veya
+#   hesaplanan yanıtın kendi etiketlerinden (entry.tags) biri o nesilden sonra
+#   geçersiz kılındıysa yapılmaz (koşullu yazma; redis'te tek bir Lua betiğiyle).
+# - Süresi yeni dolmuş girdiler "stale-while-revalidate" penceresinde hemen
+#   döndürülür ve arka planda (anahtar başına tek sefer) yenilenir.
+# - Önbellek dolumları isteğin okuma oturumuyla (replika yönlendirmesi, bkz. database.py)
+#   yapılır. Etiketlerinden biri bu süreçte replika gecikme penceresi içinde geçersiz
+#   kılındıysa dolum birincilden okunur; böylece yazma sonrası geçersiz kılınan girdi,
+#   gecikmeli replikadaki eski veriyle yeniden doldurulamaz.
+#
+# Arka uçlar:
+# - memory: Süreç içi LRU (app.cache.TTLCache). Tek worker için uygundur;
+#   birden çok worker'da geçersiz kılma yalnızca kendi sürecini etkiler.
+# - redis:  Redis protokolü (RESP) konuşan herhangi bir sunucu. Tüm worker'lar
+#   aynı önbelleği ve geçersiz kılmaları paylaşır.
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import unquote, urlencode, urlparse
+
+import orjson
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .cache import TTLCache
+from .config import settings
+from .database import AsyncSessionLocal, prefers_primary, read_session_factory, replica_monitor
+from .http_cache import is_not_modified, not_modified
+
+logger = logging.getLogger(__name__)
+
+# Önbellek durumunu istemciye bildiren başlık: HIT, STALE veya MISS.
+CACHE_STATUS_HEADER = "X-Cache"
+
+# Etiketler
+JOBS_LIST_TAG = "jobs"
+
+
+def job_tag(job_id: int) -> str:
+    return f"job:{job_id}"
+
+
+def job_offers_tag(job_id: int) -> str:
+    return f"job:{job_id}:offers"
+
+
+def provider_tag(provider_id: int) -> str:
+    return f"provider:{provider_id}"
+
+
+def user_tag(user_id: int) -> str:
+    # Kullanıcının adının gömülü olduğu yanıtlar (ilan detayı, değerlendirmeler).
+    return f"user:{user_id}"
+
+
+def cache_key(request: Request) -> str:
+    """Rota yolu ve sıralanmış sorgu parametrelerinden önbellek anahtarı üretir."""
+    params = sorted(request.query_params.multi_items())
+    return f"{request.url.path}?{urlencode(params)}" if params else request.url.path
+
+
+@dataclass
+class CachedResponse:
+    """Önbellekte tutulan, serileştirilmiş bir JSON yanıtı."""
+    body: bytes
+    headers: Dict[str, str] = field(default_factory=dict)
+    # Yanıt sunulmadan önce rotanın kontrol etmesi gereken ek bilgiler (örn. ilan sahibi).
+    meta: Dict[str, Any] = field(default_factory=dict)
+    # Hesaplama sırasında ortaya çıkan ek etiketler (örn. listedeki sağlayıcılar).
+    tags: List[str] = field(default_factory=list)
+    stored_at: float = 0.0
+
+    def to_bytes(self) -> bytes:
+        return orjson.dumps({
+            "b": self.body.decode("utf-8"),
+            "h": self.headers,
+            "m": self.meta,
+            "t": self.stored_at,
+        })
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "CachedResponse":
+        data = orjson.loads(raw)
+        return cls(body=data["b"].encode("utf-8"), headers=data["h"], meta=data["m"], stored_at=data["t"])
+
+    def respond(self, request: Request, cache_status: Optional[str] = None) -> Response:
+        """Yanıtı üretir; istemcinin kopyası güncelse (ETag / Last-Modified) 304 döndürür."""
+        etag = self.headers.get("ETag")
+        if etag:
+            last_modified = self.headers.get("Last-Modified")
+            last_modified = parsedate_to_datetime(last_modified) if last_modified else None
+            if is_not_modified(request, etag, last_modified):
+                response = not_modified(etag, self.headers.get("Cache-Control"), last_modified)
+                if cache_status:
+                    response.headers[CACHE_STATUS_HEADER] = cache_status
+                return response
+        headers = dict(self.headers)
+        if cache_status:
+            headers[CACHE_STATUS_HEADER] = cache_status
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+# ----------------------------------------------------------------------
+# Arka uçlar
+# ----------------------------------------------------------------------
+class MemoryCacheBackend:
+    """
+    Süreç içi LRU arka ucu (TTLCache üzerine etiket ve sürüm desteği ekler).
+
+    Etiket kümeleri yalnızca önbellekte bulunan anahtarları tutar: LRU'dan çıkarılan
+    veya süresi dolan anahtar etiketlerinden silinir, boşalan etiket kaldırılır.
+    Böylece bellek kullanımı görülen varlık (ilan, sağlayıcı, kullanıcı) sayısıyla
+    değil, max_entries ile sınırlı kalır. Anahtarı kalmamış etiketlerin nesil
+    kayıtları toplu olarak silinir; silme anındaki nesilden önce başlamış dolumlar
+    yazılmaz (silinen kayıtlar artık karşılaştırılamaz).
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 2048, ttl_seconds: float = 60.0):
+        self._cache = TTLCache(max_size=max_entries, ttl_seconds=ttl_seconds, on_evict=self._forget)
+        self._tag_keys: Dict[str, Set[str]] = {}
+        self._key_tags: Dict[str, Tuple[str, ...]] = {}
+        # Etiket -> son geçersiz kılındığı nesil.
+        self._tag_versions: Dict[str, int] = {}
+        self._generation = 0
+        self._pruned_at = 0
+
+    def _forget(self, key: str) -> None:
+        """Anahtarı etiket kümelerinden çıkarır; boşalan etiketleri siler."""
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+
+    def _prune_versions(self) -> None:
+        # Nesil kayıtları, anahtarı olmayan etiketler için de geçersiz kılmada oluşur.
+        # Sayı önbellek boyutunu aşınca bu kayıtlar silinir.
+        if len(self._tag_versions) <= len(self._tag_keys) + self._cache.max_size:
+            return
+        self._tag_versions = {tag: v for tag, v in self._tag_versions.items() if tag in self._tag_keys}
+        self._pruned_at = self._generation
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        return self._cache.get(key)
+
+    async def generation(self) -> Optional[int]:
+        return self._generation
+
+    async def set(
+        self, key: str, entry: CachedResponse, ttl_seconds: float, tags: Iterable[str], since: int
+    ) -> bool:
+        tags = tuple(dict.fromkeys(tags))
+        # Kontrol ve yazma arasında await yoktur; olay döngüsünde atomiktir.
+        if since < self._pruned_at or any(self._tag_versions.get(tag, 0) > since for tag in tags):
+            return False
+        self._forget(key)
+        self._cache.set(key, entry, ttl_seconds)
+        if key not in self._cache:
+            return False
+        self._key_tags[key] = tags
+        for tag in tags:
+            self._tag_keys.setdefault(tag, set()).add(key)
+        return True
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        removed = 0
+        self._generation += 1
+        for tag in tags:
+            self._tag_versions[tag] = self._generation
+            for key in list(self._tag_keys.get(tag, ())):
+                self._forget(key)
+                removed += int(self._cache.invalidate(key))
+        self._prune_versions()
+        return removed
+
+    async def close(self) -> None:
+        pass
+
+    async def clear(self) -> None:
+        self._cache.clear()
+        self._tag_keys.clear()
+        self._key_tags.clear()
+
+    async def stats(self) -> Dict[str, Any]:
+        cache_stats = self._cache.stats()
+        return {
+            "size": cache_stats["size"],
+            "max_size": cache_stats["max_size"],
+            "tags": len(self._tag_keys),
+            "tag_versions": len(self._tag_versions),
+            "evictions": cache_stats["evictions"],
+            "expirations": cache_stats["expirations"],
+        }
+
+
+class RespError(Exception):
+    """Sunucunun döndürdüğü RESP hata yanıtı."""
+
+
+class RespConnection:
+    """
+    Redis protokolü (RESP2) için en küçük asenkron istemci. Tek bağlantı kullanır;
+    komutlar bir kilit altında sırayla (gerekirse pipeline olarak) gönderilir.
+    """
+
+    def __init__(self, url: str, timeout: float = 0.5):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _encode(args: Tuple[Any, ...]) -> bytes:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    async def _read_reply(self) -> Any:
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("RESP bağlantısı kapandı.")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            return RespError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(rest)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise RespError(f"Beklenmeyen RESP yanıtı: {line!r}")
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port), self.timeout
+        )
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            await self._send(setup)
+
+    async def _send(self, commands: List[Tuple[Any, ...]]) -> List[Any]:
+        self._writer.write(b"".join(self._encode(command) for command in commands))
+        await self._writer.drain()
+        replies = [await self._read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    async def pipeline(self, commands: List[Tuple[Any, ...]]) -> List[Any]:
+        """Komutları tek seferde gönderir ve yanıtlarını sırayla döndürür."""
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    await self._connect()
+                return await asyncio.wait_for(self._send(commands), self.timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                # Bağlantı bozuldu; bir sonraki çağrıda yeniden bağlanılır.
+                await self.close()
+                raise
+
+    async def execute(self, *args: Any) -> Any:
+        return (await self.pipeline([args]))[0]
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+        self._reader = self._writer = None
+
+
+# Koşullu yazma: etiketlerden biri dolum başladıktan (ARGV[3] nesli) sonra geçersiz
+# kılındıysa yazmaz. KEYS = [girdi, etiket kümesi 1, etiket nesli 1, ...],
+# ARGV = [gövde, ttl_ms, başlangıç nesli, önbellek anahtarı].
+_SET_IF_CURRENT = """
+local since = tonumber(ARGV[3])
+for i = 2, #KEYS, 2 do
+  if tonumber(redis.call('GET', KEYS[i + 1]) or '0') > since then return 0 end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[2])
+for i = 2, #KEYS, 2 do
+  redis.call('SADD', KEYS[i], ARGV[4])
+  redis.call('PEXPIRE', KEYS[i], ARGV[2])
+end
+return 1
+"""
+
+# Geçersiz kılma: nesli artırır, etiketlere yazar ve etiketli girdileri siler.
+# KEYS = [nesil sayacı, etiket kümesi 1, etiket nesli 1, ...], ARGV = [girdi anahtarı öneki, nesil ttl_ms].
+_INVALIDATE = """
+local generation = redis.call('INCR', KEYS[1])
+local removed = 0
+for i = 2, #KEYS, 2 do
+  redis.call('SET', KEYS[i + 1], generation, 'PX', ARGV[2])
+  for _, member in ipairs(redis.call('SMEMBERS', KEYS[i])) do
+    removed = removed + redis.call('DEL', ARGV[1] .. member)
+  end
+  redis.call('DEL', KEYS[i])
+end
+return removed
+"""
+
+
+class RedisCacheBackend:
+    """
+    Redis protokolü konuşan bir sunucu üzerinde çalışan arka uç.
+    Sunucuya ulaşılamazsa istekler başarısız olmaz; önbellek ıskalanmış sayılır.
+    Yazma ve geçersiz kılma Lua betikleriyle (EVAL) atomik çalışır; böylece bir
+    geçersiz kılma, dolumun nesil kontrolü ile SET arasına giremez.
+    """
+
+    name = "redis"
+    # Etiket nesil kayıtlarının ömrü; herhangi bir dolumun süresinden çok uzundur.
+    version_ttl_seconds = 3600
+
+    def __init__(self, url: str, prefix: str = "hizmetypinari:rc:", timeout: float = 0.5):
+        self._conn = RespConnection(url, timeout=timeout)
+        self.prefix = prefix
+        self.errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}k:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}t:{tag}"
+
+    def _version_key(self, tag: str) -> str:
+        return f"{self.prefix}v:{tag}"
+
+    def _generation_key(self) -> str:
+        return f"{self.prefix}gen"
+
+    def _tag_keys(self, tags: Iterable[str]) -> List[str]:
+        keys: List[str] = []
+        for tag in dict.fromkeys(tags):
+            keys += [self._tag_key(tag), self._version_key(tag)]
+        return keys
+
+    def _failed(self, operation: str, exc: Exception) -> None:
+        self.errors += 1
+        logger.warning("Yanıt önbelleği (redis) %s başarısız: %s", operation, exc)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        try:
+            raw = await self._conn.execute("GET", self._key(key))
+        except Exception as exc:
+            self._failed("GET", exc)
+            return None
+        return CachedResponse.from_bytes(raw) if raw is not None else None
+
+    async def generation(self) -> Optional[int]:
+        try:
+            return int(await self._conn.execute("GET", self._generation_key()) or 0)
+        except Exception as exc:
+            self._failed("GET", exc)
+            # Nesil okunamazsa bu dolum önbelleğe yazılmaz.
+            return None
+
+    async def set(
+        self, key: str, entry: CachedResponse, ttl_seconds: float, tags: Iterable[str], since: int
+    ) -> bool:
+        ttl_ms = max(1, int(ttl_seconds * 1000))
+        keys = [self._key(key), *self._tag_keys(tags)]
+        try:
+            stored = await self._conn.execute(
+                "EVAL", _SET_IF_CURRENT, len(keys), *keys, entry.to_bytes(), ttl_ms, since, key
+            )
+        except Exception as exc:
+            self._failed("SET", exc)
+            return False
+        return bool(stored)
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        keys = [self._generation_key(), *self._tag_keys(tags)]
+        try:
+            return await self._conn.execute(
+                "EVAL", _INVALIDATE, len(keys), *keys, self._key(""), self.version_ttl_seconds * 1000
+            )
+        except Exception as exc:
+            self._failed("invalidate", exc)
+            return 0
+
+    async def close(self) -> None:
+        await self._conn.close()
+
+    async def clear(self) -> None:
+        # Paylaşılan sunucuda önek taraması (SCAN) yapılmaz; girdiler TTL ile sona erer.
+        logger.info("Redis arka ucunda clear() desteklenmez; girdiler TTL ile sona erer.")
+
+    async def stats(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"errors": self.errors, "evictions": None, "expirations": None}
+        try:
+            info = await self._conn.execute("INFO", "stats")
+        except Exception as exc:
+            self._failed("INFO", exc)
+            return result
+        for line in (info or b"").decode().splitlines():
+            name, _, value = line.partition(":")
+            if name == "evicted_keys":
+                result["evictions"] = int(value)
+            elif name == "expired_keys":
+                result["expirations"] = int(value)
+        return result
+
+
+# ----------------------------------------------------------------------
+# Önbellek
+# ----------------------------------------------------------------------
+ComputeFunc = Callable[[AsyncSession], Awaitable[CachedResponse]]
+
+
+class ResponseCache:
+    """Etiketli geçersiz kılma ve stale-while-revalidate destekli yanıt önbelleği."""
+
+    def __init__(self, backend, ttl_seconds: float = 30.0, stale_seconds: float = 30.0, enabled: bool = True):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.enabled = enabled
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        # Etiket -> bu süreçte son geçersiz kılındığı an (yalnızca replika gecikme penceresi kadar tutulur).
+        self._recent_invalidations: Dict[str, float] = {}
+
+        # Metrikler
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.skipped_stores = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.invalidations = 0
+        self.invalidated_entries = 0
+
+    def usable_for(self, request: Request) -> bool:
+        """
+        Önbellek bu istek için kullanılabilir mi? İstemci güçlü tutarlılık istediyse
+        (X-Consistency: strong) veya yeni yazma yaptıysa önbellek atlanır.
+        """
+        return self.enabled and not prefers_primary(request)
+
+    async def fetch(
+        self, key: str, tags: List[str], compute: ComputeFunc, request: Optional[Request] = None
+    ) -> Tuple[CachedResponse, str]:
+        """
+        Girdiyi önbellekten döndürür; yoksa hesaplayıp yazar.
+        (girdi, durum) döner; durum "HIT", "STALE" veya "MISS"tir.
+        request verilirse compute, isteğin okuma oturumuyla (read_session_factory) çağrılır;
+        oturum yalnızca dolumda seçilir. compute içinde fırlatılan HTTPException (örn. 404)
+        önbelleğe alınmaz.
+        """
+        entry = await self.backend.get(key)
+        if entry is not None:
+            age = time.time() - entry.stored_at
+            if age <= self.ttl_seconds:
+                self.hits += 1
+                return entry, "HIT"
+            if age <= self.ttl_seconds + self.stale_seconds:
+                self.stale_hits += 1
+                self._schedule_refresh(key, tags, compute, request)
+                return entry, "STALE"
+
+        self.misses += 1
+        entry = await self._compute_and_store(key, tags, compute, request)
+        return entry, "MISS"
+
+    def _lag_window(self) -> float:
+        return replica_monitor.max_lag + replica_monitor.check_interval
+
+    def _recently_invalidated(self, tags: Iterable[str]) -> bool:
+        cutoff = time.monotonic() - self._lag_window()
+        return any(self._recent_invalidations.get(tag, cutoff) > cutoff for tag in tags)
+
+    async def _session_factory(self, tags: List[str], request: Optional[Request]):
+        # Yakın zamanda geçersiz kılınan girdiler replikadan doldurulmaz (bkz. dosya başı).
+        if request is None or self._recently_invalidated(tags):
+            return AsyncSessionLocal
+        return await read_session_factory(request)
+
+    async def _compute_and_store(
+        self, key: str, tags: List[str], compute: ComputeFunc, request: Optional[Request] = None
+    ) -> CachedResponse:
+        since = await self.backend.generation()
+        session_factory = await self._session_factory(tags, request)
+        async with session_factory() as session:
+            entry = await compute(session)
+        entry.stored_at = time.time()
+
+        # Hesaplama sırasında bir yazma rota etiketlerini veya yanıtın kendi etiketlerini
+        # (entry.tags) geçersiz kıldıysa sonuç eskidir; arka uç yazmayı atlar.
+        if since is None or not await self.backend.set(
+            key, entry, self.ttl_seconds + self.stale_seconds, [*tags, *entry.tags], since
+        ):
+            self.skipped_stores += 1
+            return entry
+        self.stores += 1
+        return entry
+
+    def _schedule_refresh(self, key: str, tags: List[str], compute: ComputeFunc, request: Optional[Request]) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.create_task(self._refresh(key, tags, compute, request))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, key: str, tags: List[str], compute: ComputeFunc, request: Optional[Request]) -> None:
+        try:
+            await self._compute_and_store(key, tags, compute, request)
+            self.refreshes += 1
+        except Exception:
+            # 404 vb. durumlarda eski girdi TTL dolunca kendiliğinden düşer.
+            self.refresh_failures += 1
+            logger.exception("Önbellek girdisi arka planda yenilenemedi: %s", key)
+        finally:
+            self._refreshing.discard(key)
+
+    async def invalidate(self, *tags: str) -> int:
+        """Etiketlere bağlı tüm girdileri siler. Yazma rotaları commit sonrası çağırır."""
+        if not self.enabled or not tags:
+            return 0
+        if replica_monitor.enabled:
+            now = time.monotonic()
+            cutoff = now - self._lag_window()
+            self._recent_invalidations = {
+                tag: at for tag, at in self._recent_invalidations.items() if at > cutoff
+            }
+            self._recent_invalidations.update(dict.fromkeys(tags, now))
+        removed = await self.backend.invalidate_tags(tags)
+        self.invalidations += 1
+        self.invalidated_entries += removed
+        return removed
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    async def close(self) -> None:
+        """Arka plandaki yenilemeleri iptal eder ve arka uç bağlantısını kapatır."""
+        for task in list(self._tasks):
+            task.cancel()
+        await self.backend.close()
+
+    async def stats(self) -> Dict[str, Any]:
+        """İzleme için önbellek metriklerini döndürür."""
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "enabled": self.enabled,
+            "ttl_seconds": self.ttl_seconds,
+            "stale_seconds": self.stale_seconds,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": ((self.hits + self.stale_hits) / lookups) if lookups else 0.0,
+            "stores": self.stores,
+            "skipped_stores": self.skipped_stores,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "invalidations": self.invalidations,
+            "invalidated_entries": self.invalidated_entries,
+            **await self.backend.stats(),
+        }
+
+
+def create_response_cache() -> ResponseCache:
+    """Ayarlara göre (settings.response_cache_backend) önbelleği oluşturur."""
+    kind = settings.response_cache_backend
+    ttl = settings.response_cache_ttl_seconds
+    stale = settings.response_cache_stale_seconds
+    if kind == "redis":
+        if not settings.response_cache_url:
+            raise ValueError("RESPONSE_CACHE_BACKEND=redis için RESPONSE_CACHE_URL ayarlanmalıdır.")
+        backend = RedisCacheBackend(settings.response_cache_url)
+    elif kind in ("memory", "none"):
+        backend = MemoryCacheBackend(max_entries=settings.response_cache_max_entries, ttl_seconds=ttl + stale)
+    else:
+        raise ValueError(f"Geçersiz önbellek arka ucu: '{kind}'. 'memory', 'redis' veya 'none' olmalı.")
+    return ResponseCache(backend, ttl_seconds=ttl, stale_seconds=stale, enabled=kind != "none")
+
+
+# Uygulama genelinde kullanılan yanıt önbelleği.
+response_cache = create_response_cache()
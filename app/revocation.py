@@ -0,0 +1,166 @@
+# app/revocation.py
+
+# Bu dosya, yalnızca talepler (claims) ile kimlik doğrulamada kullanılan bellek içi
+# token iptal listesini içerir.
+#
+# Token'lar kullanıcı id'si ('uid') ve token sürümünü ('ver') taşır. Bir kullanıcının
+# token'ları iptal edildiğinde (askıya alma, rol değişikliği, silme, admin iptali)
+# users.token_version artırılır ve token_revocations tablosuna bir kayıt eklenir.
+# Her süreç bu tabloyu id sırasıyla artımlı okur; böylece iptaller diğer süreçlere
+# en geç bir yenileme aralığında ulaşır. İptali yapan süreç listeyi hemen günceller.
+# Otomatik artan id'ler commit sırasıyla değil, ekleme sırasıyla verilir: 11 numaralı
+# kayıt 10'dan önce commit edilebilir. Bu yüzden her yenilemede son okunan id'nin
+# gerisindeki bir pencere (lookback_ids) yeniden okunur ve pencerede daha önce
+# görülmemiş kayıtlar uygulanır; geç commit edilen kayıtlar böylece atlanmaz.
+#
+# Liste yalnızca son token ömrü kadar süredeki iptalleri tutar: daha önce verilmiş
+# bir token'ın süresi zaten dolmuştur ve askıdaki kullanıcılar yeni token alamaz.
+# Bu yüzden liste küçük kalır ve Bloom filtresi yerine kesin bir sözlükle tutulur.
+# Listede görünen token'lar yine de reddedilmeden önce veritabanından doğrulanır
+# (bkz. routers/auth.py); liste yalnızca hangi isteklerin doğrulanacağını seçer.
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models.user import TokenRevocation
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """user_id -> (en küçük geçerli token sürümü, askıda mı, kaydedildiği an) eşlemesi."""
+
+    def __init__(self, retention_seconds: float, refresh_seconds: float = 5.0, lookback_ids: int = 1000):
+        self.retention_seconds = retention_seconds
+        self.refresh_seconds = refresh_seconds
+        self.lookback_ids = lookback_ids
+        self._entries: Dict[int, Tuple[int, bool, float]] = {}
+        self._last_id = 0
+        # Geri bakma penceresinde zaten uygulanmış kayıt id'leri.
+        self._seen: Set[int] = set()
+        # (okunan en büyük id, okunduğu an). Yeterince eski kayıtlar tablodan silinir.
+        self._watermarks: List[Tuple[int, float]] = []
+        self._last_refresh: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.hits = 0
+
+    # ------------------------------------------------------------------
+    # Sorgulama
+    # ------------------------------------------------------------------
+    def is_revoked(self, user_id: int, token_version: int) -> bool:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return False
+        min_version, suspended, _ = entry
+        if suspended or token_version < min_version:
+            self.hits += 1
+            return True
+        return False
+
+    @property
+    def healthy(self) -> bool:
+        """Liste yakın zamanda yenilendiyse True. Değilse talepler tek başına güvenilmez."""
+        return self._last_refresh is not None and time.monotonic() - self._last_refresh < 3 * self.refresh_seconds
+
+    # ------------------------------------------------------------------
+    # Güncelleme
+    # ------------------------------------------------------------------
+    def record(self, user_id: int, min_version: int, suspended: bool) -> None:
+        """Bir iptali listeye uygular (aynı kullanıcı için sürüm geriye gitmez)."""
+        current = self._entries.get(user_id)
+        if current is not None and current[0] > min_version:
+            min_version = current[0]
+        self._entries[user_id] = (min_version, suspended, time.monotonic())
+
+    async def refresh(self, session: AsyncSession) -> int:
+        """Son okunan kayıttan (ve geri bakma penceresinden) sonraki yeni iptalleri yükler; yüklenen kayıt sayısını döndürür."""
+        window_start = max(0, self._last_id - self.lookback_ids)
+        result = await session.execute(
+            select(
+                TokenRevocation.id, TokenRevocation.user_id,
+                TokenRevocation.min_token_version, TokenRevocation.suspended,
+            )
+            .where(TokenRevocation.id > window_start)
+            .order_by(TokenRevocation.id)
+        )
+        rows = [row for row in result.all() if row[0] not in self._seen]
+        for row_id, user_id, min_version, suspended in rows:
+            self.record(user_id, min_version, bool(suspended))
+            self._seen.add(row_id)
+            self._last_id = max(self._last_id, row_id)
+        # Pencerenin gerisinde kalan id'ler bir daha okunmaz; kümeden çıkarılır.
+        window_start = self._last_id - self.lookback_ids
+        self._seen = {row_id for row_id in self._seen if row_id > window_start}
+
+        now = time.monotonic()
+        self._prune(now)
+        if rows:
+            self._watermarks.append((self._last_id, now))
+        await self._purge_table(session, now)
+        self._last_refresh = now
+        self.refreshes += 1
+        return len(rows)
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.retention_seconds
+        expired = [user_id for user_id, (_, _, recorded_at) in self._entries.items() if recorded_at < cutoff]
+        for user_id in expired:
+            del self._entries[user_id]
+
+    async def _purge_table(self, session: AsyncSession, now: float) -> None:
+        # İki token ömründen eski kayıtlar artık hiçbir süreç için gerekli değildir.
+        # Saat/saat dilimi farklarından etkilenmemek için silme id üzerinden yapılır.
+        cutoff = now - 2 * self.retention_seconds
+        purge_up_to = None
+        while self._watermarks and self._watermarks[0][1] < cutoff:
+            purge_up_to = self._watermarks.pop(0)[0]
+        if purge_up_to is not None:
+            await session.execute(delete(TokenRevocation).where(TokenRevocation.id <= purge_up_to))
+            await session.commit()
+
+    # ------------------------------------------------------------------
+    # Arka plan yenileme
+    # ------------------------------------------------------------------
+    def start(self, session_factory) -> None:
+        """İptal listesini refresh_seconds aralıklarla yenileyen arka plan görevini başlatır."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run(session_factory))
+
+    async def _run(self, session_factory) -> None:
+        # İlk yükleme başlangıçta yapılır (bkz. main.py); görev bir aralık sonra başlar.
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                async with session_factory() as session:
+                    await self.refresh(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.refresh_failures += 1
+                logger.exception("Token iptal listesi yenilenemedi.")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "last_id": self._last_id,
+            "lookback_ids": self.lookback_ids,
+            "healthy": self.healthy,
+            "refresh_seconds": self.refresh_seconds,
+            "retention_seconds": self.retention_seconds,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "hits": self.hits,
+        }
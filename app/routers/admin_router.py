@@ -1,37 +1,60 @@
 # Gerekli kütüphaneler import ediliyor
-import uuid
+import enum
 from typing import List, Optional, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from pydantic import BaseModel, Field, EmailStr 
 
+from sqlalchemy import func, literal_column, or_, select, union
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .auth import (
+    principal_cache,
+    revocation_list,
+    get_current_principal,
+    get_password_hash_async,
+    invalidate_principal,
+    revoke_tokens,
+    apply_revocation,
+)
+from ..database import get_db, get_read_db, engine, read_engine, pool_stats, replica_monitor
+from ..pagination import (
+    capped_count_query,
+    decode_cursor,
+    keyset_after,
+    next_cursor,
+    total_count_headers,
+    NEXT_CURSOR_HEADER,
+)
+from ..passwords import password_pool
+from ..reference_data import reference_data
+from ..response_cache import JOBS_LIST_TAG, response_cache, user_tag
+from ..serialization import trusted_json_response
+from ..slow_queries import slow_query_log
+from ..job_matching import open_job_index
+from ..models.category_models import Category, Service
+from ..models.district_models import District
+from ..models.user import User, RoleName
+from ..schemas import category_schema, district_schema
+
 # ----------------------------------------------------------------------
 # SCHEMAS (Veri Modelleri)
 # ----------------------------------------------------------------------
 
-class UserInDB(BaseModel):
-    """Veritabanındaki kullanıcı verilerini temsil eden model."""
-    id: uuid.UUID = Field(default_factory=uuid.uuid4, description="Kullanıcının benzersiz ID'si")
-    email: EmailStr = Field(..., description="Kullanıcının e-posta adresi", examples=["john.doe@example.com"])
-    first_name: str = Field(..., description="Kullanıcının adı")
-    last_name: str = Field(..., description="Kullanıcının soyadı")
-    role_name: str = Field("customer", description="Kullanıcının rolü ('admin' veya 'customer')")
-    password_hash: str = Field(..., description="Parolanın hash'lenmiş hali")
-    is_active: bool = Field(True, description="Kullanıcı hesabının aktif olup olmadığı")
-
 class UserPublic(BaseModel):
     """API yanıtları için parola gibi hassas verileri içermeyen model."""
-    id: uuid.UUID
+    id: int
     email: EmailStr
     first_name: str
     last_name: str
-    role_name: str
+    role_name: Optional[RoleName] = Field(None, description="Rol referans verisinde bulunamazsa null.")
     is_active: bool
 
     model_config = {
         "from_attributes": True,
         "json_schema_extra": {
             "example": {
-                "id": str(uuid.uuid4()),
+                "id": 42,
                 "email": "test@example.com",
                 "first_name": "Test",
                 "last_name": "Kullanıcı",
@@ -56,64 +79,25 @@ class UserUpdateRequest(BaseModel):
 
 class UserUpdateRoleRequest(BaseModel):
     """Kullanıcı rolü güncelleme isteği için kullanılan model."""
-    new_role: str = Field(..., description="Kullanıcının atanacağı yeni rol ('admin' veya 'customer')")
+    new_role: str = Field(..., description="Kullanıcının atanacağı yeni rol ('admin', 'provider' veya 'customer')")
 
-ALLOWED_ROLES = ["admin", "customer"]
-# ----------------------------------------------------------------------
-# MOCK VERİ (Veritabanı Simülasyonu)
-# ----------------------------------------------------------------------
-MOCK_USERS: Dict[uuid.UUID, UserInDB] = {}
-
-def initialize_mock_users():
-    """Uygulama her yüklendiğinde mock kullanıcı verilerini oluşturur ve günceller."""
-    global MOCK_USERS
-    MOCK_USERS.clear()
-
-    admin_id = uuid.uuid4()
-    MOCK_USERS[admin_id] = UserInDB(
-        id=admin_id,
-        email="admin@example.com",
-        first_name="Admin",
-        last_name="User",
-        role_name="admin",
-        password_hash="fake-hashed-password-1"
-    )
+ALLOWED_ROLES = [role.value for role in RoleName]
 
-    customer1_id = uuid.uuid4()
-    MOCK_USERS[customer1_id] = UserInDB(
-        id=customer1_id, email="customer1@example.com", first_name="Ayşe", last_name="Yılmaz", role_name="customer", password_hash="fake-hashed-password-2"
-    )
-
-    customer2_id = uuid.uuid4()
-    MOCK_USERS[customer2_id] = UserInDB(
-        id=customer2_id, email="customer2@example.com", first_name="Mehmet", last_name="Demir", role_name="customer", password_hash="fake-hashed-password-3"
-    )
-    # Pasif bir kullanıcı ekleyelim
-    customer3_id = uuid.uuid4()
-    MOCK_USERS[customer3_id] = UserInDB(
-        id=customer3_id, email="inactive@example.com", first_name="Pasif", last_name="Kullanıcı", is_active=False, password_hash="fake-hashed-password-4"
-    )
-
-initialize_mock_users()
+# Kullanıcı listesinde toplam sayının hesaplanacağı üst sınır (bkz. capped_count_query).
+USER_COUNT_CAP = 10000
 
 # ----------------------------------------------------------------------
 # Yetkilendirme (Auth) Bağımlılıkları
 # ----------------------------------------------------------------------
 
-def get_current_admin_user() -> UserInDB:
-    """Authorization başlığını kontrol ederek geçerli admin kullanıcısını döndürür."""
-    admin_user = next((u for u in MOCK_USERS.values() if u.role_name == "admin"), None)
-    if not admin_user:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Backend hatası: Mock admin kullanıcısı bulunamadı."
-        )
-    if admin_user.role_name != "admin":
+async def get_current_admin_user(current_user: User = Depends(get_current_principal)) -> User:
+    """Token'daki kullanıcıyı doğrular ve admin rolünde olduğunu kontrol eder."""
+    if current_user.role_name != RoleName.admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Bu işleme erişim yetkiniz yok."
         )
-    return admin_user
+    return current_user
 
 
 # ----------------------------------------------------------------------
@@ -126,6 +110,119 @@ admin_router = APIRouter(
     dependencies=[Depends(get_current_admin_user)],
 )
 
+# ----------------------------------------------------------------------
+# Yardımcılar
+# ----------------------------------------------------------------------
+
+_ADMIN_USER_COLUMNS = (User.id, User.email, User.first_name, User.last_name, User.role_id, User.is_active)
+
+
+def _like_prefix(value: str) -> str:
+    # LIKE joker karakterleri (%, _) aranan metnin parçası olarak ele alınır.
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _search_conditions(search: str) -> list:
+    pattern = _like_prefix(search)
+    conditions = [
+        User.email.like(pattern, escape="\\"),
+        User.first_name.like(pattern, escape="\\"),
+        User.last_name.like(pattern, escape="\\"),
+    ]
+    if search.isdigit():
+        conditions.append(User.id == int(search))
+    return conditions
+
+
+def search_breadth_query(search: str, cap: int):
+    """
+    Arama koşullarının (e-posta, ad, soyad) her birinin eşleşme sayısını en fazla
+    cap + 1'e kadar sayan tek sorgu. Her sayım yalnızca kendi indeksinin kısa bir
+    aralığını okur; sonuç, sayfanın hangi planla alınacağını seçmek için kullanılır.
+    """
+    counts = [
+        select(func.count()).select_from(
+            select(literal_column("1")).select_from(User).where(condition).limit(cap + 1).subquery()
+        ).scalar_subquery()
+        for condition in _search_conditions(search)
+    ]
+    return select(*counts)
+
+
+def admin_users_query(
+    search: Optional[str] = None,
+    role_id: Optional[int] = None,
+    is_active: Optional[bool] = None,
+    broad: bool = False,
+):
+    """
+    Admin kullanıcı listesi için filtreli sorguyu üretir (sıralama ve limit hariç).
+
+    Arama; e-posta, ad ve soyadda ÖNEK eşleşmesidir (LIKE 'metin%'). Sayısal
+    aramalar ayrıca id ile eşleşir. MySQL'in utf8mb4_0900_ai_ci harmanlaması
+    sayesinde eşleşme büyük/küçük harf ve aksan duyarsızdır ("ayse" -> "Ayşe").
+
+    İki plan vardır (bkz. search_breadth_query):
+    - Seçici aramalar: Her sütun kendi indeksiyle aralık taraması yapar; eşleşen
+      id'ler UNION ile birleştirilip birincil anahtar üzerinden kullanıcılara bağlanır.
+      (Tek bir OR koşulu planlayıcıyı çoğu zaman tam tablo taramasına götürür.)
+    - Geniş aramalar (broad=True, örn. "Meh"): On binlerce id'yi birleştirip sıralamak
+      yerine birincil anahtar sırasıyla okunup OR koşulu uygulanır; eşleşmeler yoğun
+      olduğundan sayfa birkaç bin satır içinde dolar.
+    """
+    query = select(*_ADMIN_USER_COLUMNS)
+    if search:
+        conditions = _search_conditions(search)
+        if broad:
+            query = query.where(or_(*conditions))
+        else:
+            matches = union(*(select(User.id).where(condition) for condition in conditions)).subquery("matches")
+            query = query.select_from(matches.join(User, User.id == matches.c.id))
+    if role_id is not None:
+        query = query.where(User.role_id == role_id)
+    if is_active is not None:
+        query = query.where(User.is_active == is_active)
+    return query
+
+
+def admin_users_page_query(query, limit: int, after: Optional[List[Any]] = None):
+    """Filtreli sorguyu id sırasına göre keyset ile sayfalar."""
+    if after:
+        query = query.where(keyset_after([User.id], after, [False]))
+    return query.order_by(User.id).limit(limit)
+
+
+def _role_name(role_id: int) -> Optional[RoleName]:
+    # Bilinmeyen rol başka bir rol gibi gösterilmez; yanıtta null döner.
+    role = reference_data.role(role_id)
+    return role.role_name if role else None
+
+
+def user_public_item(user: Any) -> Dict[str, Any]:
+    """Kullanıcı satırından (veya ORM nesnesinden) UserPublic yapısında bir sözlük üretir."""
+    return {
+        "id": user.id,
+        "email": user.email,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "role_name": role_name.value if (role_name := _role_name(user.role_id)) else None,
+        "is_active": bool(user.is_active),
+    }
+
+
+async def _get_user_or_404(db: AsyncSession, user_id: int) -> User:
+    user = await db.get(User, user_id)
+    if not user:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kullanıcı bulunamadı.")
+    return user
+
+
+def _email_in_use() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Bu e-posta adresi zaten kullanılıyor."
+    )
+
 # ----------------------------------------------------------------------
 # 1. KULLANICI LİSTELEME VE ARAMA
 # ----------------------------------------------------------------------
@@ -134,22 +231,45 @@ admin_router = APIRouter(
     response_model=List[UserPublic],
     summary="1. Tüm Kullanıcıları Listele ve Ara"
 )
-def get_all_users(
-    search: Optional[str] = Query(None, description="ID, Ad, Soyad veya E-posta ile arama yapın.")
+async def get_all_users(
+    db: AsyncSession = Depends(get_read_db),
+    search: Optional[str] = Query(None, min_length=1, max_length=255, description="ID, Ad, Soyad veya E-posta başlangıcı ile arama yapın."),
+    role: Optional[RoleName] = Query(None, description="Role göre filtrele."),
+    is_active: Optional[bool] = Query(None, description="Aktiflik durumuna göre filtrele."),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None
 ):
-    """Sistemdeki tüm kullanıcıları listeler veya arama sorgusuna göre filtreler."""
-    initialize_mock_users() 
-    users_list = list(MOCK_USERS.values())
+    """
+    Sistemdeki kullanıcıları id sırasıyla listeler veya arama sorgusuna göre filtreler.
+    Toplam eşleşme sayısı 'X-Total-Count' başlığında döner (USER_COUNT_CAP üzerindeyse
+    sınır değeri ve 'X-Total-Count-Capped: true'). Bir sonraki sayfa için
+    'X-Next-Cursor' başlığındaki değer 'cursor' olarak gönderilir.
+    """
+    await reference_data.ensure(db)
+    role_id = None
+    if role is not None:
+        role_ref = reference_data.role_by_name(role)
+        if role_ref is None:
+            return trusted_json_response([], headers=total_count_headers(0, USER_COUNT_CAP))
+        role_id = role_ref.id
+
+    broad = False
     if search:
-        search_lower = search.lower()
-        users_list = [
-            user for user in users_list
-            if (search_lower in user.first_name.lower() or
-                search_lower in user.last_name.lower() or
-                search_lower in user.email.lower() or
-                str(user.id).lower().startswith(search_lower))
-        ]
-    return [UserPublic.model_validate(user) for user in users_list]
+        branch_counts = (await db.execute(search_breadth_query(search, USER_COUNT_CAP))).one()
+        broad = max(branch_counts) > USER_COUNT_CAP
+    query = admin_users_query(search, role_id, is_active, broad=broad)
+    after = decode_cursor(cursor, 1) if cursor else None
+    users = (await db.execute(admin_users_page_query(query, limit, after))).all()
+
+    # Toplam sayı yalnızca ilk sayfada hesaplanır; sonraki sayfalar aynı filtreyi paylaşır.
+    headers = {}
+    if after is None:
+        total = (await db.execute(capped_count_query(query, USER_COUNT_CAP))).scalar_one()
+        headers.update(total_count_headers(total, USER_COUNT_CAP))
+    cursor_value = next_cursor(users, limit, "id")
+    if cursor_value:
+        headers[NEXT_CURSOR_HEADER] = cursor_value
+    return trusted_json_response([user_public_item(user) for user in users], headers=headers)
 
 # ----------------------------------------------------------------------
 # 2. KULLANICI OLUŞTURMA
@@ -160,26 +280,28 @@ def get_all_users(
     status_code=status.HTTP_201_CREATED,
     summary="2. Yeni Kullanıcı Oluşturma"
 )
-def create_user(user_data: UserCreateRequest):
-    """Yeni bir kullanıcı hesabı oluşturur."""
-    if any(user.email == user_data.email for user in MOCK_USERS.values()):
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Bu e-posta adresi zaten kullanılıyor."
-        )
+async def create_user(user_data: UserCreateRequest, db: AsyncSession = Depends(get_db)):
+    """Yeni bir müşteri hesabı oluşturur. E-posta tekilliği veritabanındaki UNIQUE indeksle sağlanır."""
+    await reference_data.ensure(db)
+    role = reference_data.role_by_name(RoleName.customer)
+    if role is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Müşteri rolü bulunamadı.")
 
-    # Parola hash'leme simülasyonu
-    hashed_password = f"hashed_{user_data.password}"
-    
-    new_user = UserInDB(
+    new_user = User(
         email=user_data.email,
         first_name=user_data.first_name,
         last_name=user_data.last_name,
-        password_hash=hashed_password
+        password_hash=await get_password_hash_async(user_data.password),
+        role_id=role.id,
+        is_active=True,
     )
-    MOCK_USERS[new_user.id] = new_user
-    
-    return UserPublic.model_validate(new_user)
+    db.add(new_user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise _email_in_use()
+    return user_public_item(new_user)
 
 # ----------------------------------------------------------------------
 # 3. KULLANICI BİLGİLERİNİ GÜNCELLEME
@@ -189,23 +311,30 @@ def create_user(user_data: UserCreateRequest):
     response_model=UserPublic,
     summary="3. Kullanıcı Bilgilerini Güncelleme (Ad/Soyad/E-posta)"
 )
-def update_user_info(
-    user_id: uuid.UUID,
-    user_update: UserUpdateRequest
+async def update_user_info(
+    user_id: int,
+    user_update: UserUpdateRequest,
+    db: AsyncSession = Depends(get_db)
 ):
     """Belirtilen ID'ye sahip kullanıcının bilgilerini (ad, soyad, e-posta) günceller."""
-    user = MOCK_USERS.get(user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kullanıcı bulunamadı.")
-    
+    user = await _get_user_or_404(db, user_id)
+
     # Sadece gönderilen alanları güncelle
     update_data = user_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         if value is not None:
             setattr(user, key, value)
-    
-    MOCK_USERS[user_id] = user
-    return UserPublic.model_validate(user)
+
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise _email_in_use()
+
+    # Ad/soyad ilan detayı ve değerlendirme yanıtlarında gömülü taşınır.
+    if "first_name" in update_data or "last_name" in update_data:
+        await response_cache.invalidate(user_tag(user_id))
+    return user_public_item(user)
 
 # ----------------------------------------------------------------------
 # 4. ROL VE YETKİ YÖNETİMİ
@@ -213,27 +342,33 @@ def update_user_info(
 @admin_router.patch(
     "/users/{user_id}/role",
     response_model=UserPublic,
-    summary="4. Kullanıcı Rolünü Güncelle ('admin' veya 'customer')"
+    summary="4. Kullanıcı Rolünü Güncelle ('admin', 'provider' veya 'customer')"
 )
-def update_user_role(
-    user_id: uuid.UUID,
-    role_update: UserUpdateRoleRequest
+async def update_user_role(
+    user_id: int,
+    role_update: UserUpdateRoleRequest,
+    db: AsyncSession = Depends(get_db)
 ):
     """Belirtilen ID'ye sahip kullanıcının rolünü günceller."""
-    user = MOCK_USERS.get(user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kullanıcı bulunamadı.")
-    
     new_role = role_update.new_role.lower()
     if new_role not in ALLOWED_ROLES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Geçersiz rol: '{role_update.new_role}'. Sadece {ALLOWED_ROLES} rolleri geçerlidir."
         )
-    
-    user.role_name = new_role
-    MOCK_USERS[user_id] = user
-    return UserPublic.model_validate(user)
+    await reference_data.ensure(db)
+    role = reference_data.role_by_name(RoleName(new_role))
+    if role is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"'{new_role}' rolü bulunamadı.")
+
+    user = await _get_user_or_404(db, user_id)
+    # role_id ataması kimlik önbelleğindeki kaydı da geçersiz kılar (bkz. auth.py).
+    # Token'lar rolü taşıdığı için eski rolle verilmiş token'lar da iptal edilir.
+    user.role_id = role.id
+    revocation = revoke_tokens(db, user)
+    await db.commit()
+    apply_revocation(revocation)
+    return user_public_item(user)
 
 # ----------------------------------------------------------------------
 # 5a. KULLANICI HESABINI ASKIYA AL / AKTİFLEŞTİR
@@ -243,16 +378,17 @@ def update_user_role(
     response_model=UserPublic,
     summary="5a. Kullanıcı Hesabını Askıya Al / Aktifleştir"
 )
-def suspend_user(user_id: uuid.UUID):
+async def suspend_user(user_id: int, db: AsyncSession = Depends(get_db)):
     """Belirtilen ID'ye sahip kullanıcının hesabının aktiflik durumunu tersine çevirir."""
-    user = MOCK_USERS.get(user_id)
-    if not user:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kullanıcı bulunamadı.")
+    user = await _get_user_or_404(db, user_id)
 
-    # Durumu tersine çevir
+    # Durumu tersine çevir. Askıya almada mevcut token'lar iptal edilir; yeniden
+    # aktifleştirmede yeni kayıt, iptal listesindeki askı işaretini kaldırır.
     user.is_active = not user.is_active
-    MOCK_USERS[user_id] = user
-    return UserPublic.model_validate(user)
+    revocation = revoke_tokens(db, user)
+    await db.commit()
+    apply_revocation(revocation)
+    return user_public_item(user)
 
 # ----------------------------------------------------------------------
 # 5b. KULLANICI HESABINI SİLME
@@ -262,10 +398,183 @@ def suspend_user(user_id: uuid.UUID):
     status_code=status.HTTP_204_NO_CONTENT,
     summary="5b. Kullanıcı Hesabını Kalıcı Olarak Silme"
 )
-def delete_user(user_id: uuid.UUID):
-    """Belirtilen ID'ye sahip kullanıcıyı sistemden kalıcı olarak siler."""
-    if user_id not in MOCK_USERS:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kullanıcı bulunamadı.")
-    
-    del MOCK_USERS[user_id]
-    return
+async def delete_user(user_id: int, db: AsyncSession = Depends(get_db)):
+    """
+    Belirtilen ID'ye sahip kullanıcıyı sistemden kalıcı olarak siler.
+    İlanı, teklifi veya değerlendirmesi olan kullanıcılar silinemez (409); askıya alınmalıdır.
+    """
+    user = await _get_user_or_404(db, user_id)
+    email = user.email
+
+    # İptal kaydı silmeyle aynı işlemde yazılır; silme başarısız olursa o da geri alınır.
+    revocation = revoke_tokens(db, user, suspended=True)
+    await db.delete(user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Kullanıcının ilişkili kayıtları (ilan, teklif, değerlendirme) var. Silmek yerine askıya alın."
+        )
+    invalidate_principal(email)
+    apply_revocation(revocation)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+# ----------------------------------------------------------------------
+# 5c. KULLANICININ TOKEN'LARINI İPTAL ETME
+# ----------------------------------------------------------------------
+@admin_router.post(
+    "/users/{user_id}/revoke-tokens",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="5c. Kullanıcının Tüm Token'larını İptal Et (Oturumları Kapat)"
+)
+async def revoke_user_tokens(user_id: int, db: AsyncSession = Depends(get_db)):
+    """Kullanıcının o ana kadar aldığı tüm token'ları geçersiz kılar; kullanıcı yeniden giriş yapmalıdır."""
+    user = await _get_user_or_404(db, user_id)
+    revocation = revoke_tokens(db, user)
+    await db.commit()
+    apply_revocation(revocation)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+# ----------------------------------------------------------------------
+# 6. ÖNBELLEK İSTATİSTİKLERİ
+# ----------------------------------------------------------------------
+# İstatistik uç noktaları async tanımlanır: düz 'def' rotalar thread havuzunda çalışır ve
+# olay döngüsünün aynı anda değiştirdiği sözlükleri (önbellekler, parmak izi özetleri,
+# ilan indeksi) okurken "mutated during iteration" hatası alabilir.
+@admin_router.get(
+    "/stats/principal-cache",
+    summary="6. Kimlik (Principal) Önbelleği İstatistikleri"
+)
+async def get_principal_cache_stats() -> Dict[str, Any]:
+    """Kimlik doğrulama önbelleğinin sayaçlarını ve token iptal listesinin durumunu döndürür."""
+    return {**principal_cache.stats(), "revocations": revocation_list.stats()}
+
+@admin_router.get(
+    "/stats/db-pool",
+    summary="6b. Veritabanı Bağlantı Havuzu İstatistikleri"
+)
+async def get_db_pool_stats() -> Dict[str, Any]:
+    """Havuzdaki kullanılan/boşta/taşma bağlantı sayıları ile bağlantı alma (bekleme) sürelerini döndürür."""
+    stats = {"primary": pool_stats(engine), "replica": replica_monitor.stats()}
+    if replica_monitor.enabled:
+        stats["replica"]["pool"] = pool_stats(read_engine)
+    return stats
+
+@admin_router.get(
+    "/stats/password-pool",
+    summary="7. Parola İşçi Havuzu Metrikleri"
+)
+async def get_password_pool_stats() -> Dict[str, Any]:
+    """Parola hashleme havuzunun kuyruk derinliği, bekleme ve hash sürelerini döndürür."""
+    return password_pool.stats()
+
+@admin_router.get(
+    "/stats/response-cache",
+    summary="7b. Yanıt Önbelleği İstatistikleri"
+)
+async def get_response_cache_stats() -> Dict[str, Any]:
+    """Yanıt önbelleğinin isabet oranı, çıkarma, yenileme ve geçersiz kılma sayaçlarını döndürür."""
+    return await response_cache.stats()
+
+class SlowQueryOrder(str, enum.Enum):
+    total_time = "total_time"
+    max_time = "max_time"
+    p95 = "p95"
+    count = "count"
+    slow_count = "slow_count"
+
+@admin_router.get(
+    "/stats/slow-queries",
+    summary="7c. Yavaş Sorgular (Parmak İzi Özetleri)"
+)
+async def get_slow_query_stats(
+    limit: int = Query(20, ge=1, le=200),
+    order_by: SlowQueryOrder = Query(SlowQueryOrder.total_time, description="Sıralama ölçütü (büyükten küçüğe)"),
+) -> Dict[str, Any]:
+    """
+    Sorgu parmak izlerini varsayılan olarak toplam süreye göre sıralar. Her parmak izi için
+    adet, toplam/ortalama/en yüksek/p95 süre, satır sayısı, son yavaş örneğin parametre
+    biçimleri ve (örneklenmişse) EXPLAIN planı döner.
+    """
+    return {**slow_query_log.summary(), "top": slow_query_log.top(limit, order_by.value)}
+
+@admin_router.delete(
+    "/stats/slow-queries",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="7d. Yavaş Sorgu Özetlerini Sıfırla"
+)
+async def reset_slow_query_stats():
+    """Parmak izi özetlerini sıfırlar (örn. bir dağıtımdan sonra temiz ölçüm için)."""
+    slow_query_log.reset()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+@admin_router.get(
+    "/stats/job-index",
+    summary="7e. Sağlayıcı-İlan Eşleştirme İndeksi İstatistikleri"
+)
+async def get_job_index_stats() -> Dict[str, Any]:
+    """Bellek içi açık ilan indeksinin boyutunu ve son eşitlemeden bu yana geçen süreyi döndürür."""
+    return open_job_index.stats()
+
+# ----------------------------------------------------------------------
+# 8. REFERANS VERİ YÖNETİMİ (Kategori / Hizmet / İlçe)
+# ----------------------------------------------------------------------
+# Her yazma işleminden sonra bellekteki referans veri deposu yenilenir;
+# böylece yeni sürüm ve ETag'ler hemen geçerli olur.
+@admin_router.post(
+    "/categories",
+    response_model=category_schema.Category,
+    status_code=status.HTTP_201_CREATED,
+    summary="8a. Yeni Kategori Oluşturma"
+)
+async def create_category(category_data: category_schema.CategoryCreate, db: AsyncSession = Depends(get_db)):
+    """Yeni bir kategori oluşturur ve referans veri deposunu yeniler."""
+    category = Category(**category_data.model_dump())
+    db.add(category)
+    await db.commit()
+    await reference_data.load(db)
+    return reference_data.snapshot.categories[category.id]
+
+@admin_router.post(
+    "/services",
+    response_model=category_schema.Service,
+    status_code=status.HTTP_201_CREATED,
+    summary="8b. Yeni Hizmet Oluşturma"
+)
+async def create_service(service_data: category_schema.ServiceCreate, db: AsyncSession = Depends(get_db)):
+    """Yeni bir hizmet oluşturur ve referans veri deposunu yeniler."""
+    await reference_data.ensure(db)
+    if service_data.category_id not in reference_data.snapshot.categories:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kategori bulunamadı.")
+    service = Service(**service_data.model_dump())
+    db.add(service)
+    await db.commit()
+    await reference_data.load(db)
+    return reference_data.service(service.id)
+
+@admin_router.post(
+    "/districts",
+    response_model=district_schema.District,
+    status_code=status.HTTP_201_CREATED,
+    summary="8c. Yeni İlçe Oluşturma"
+)
+async def create_district(district_data: district_schema.DistrictCreate, db: AsyncSession = Depends(get_db)):
+    """Yeni bir ilçe oluşturur ve referans veri deposunu yeniler."""
+    district = District(**district_data.model_dump())
+    db.add(district)
+    await db.commit()
+    await reference_data.load(db)
+    return reference_data.district(district.id)
+
+@admin_router.post(
+    "/reference-data/refresh",
+    summary="8d. Referans Veri Deposunu Yenile"
+)
+async def refresh_reference_data(db: AsyncSession = Depends(get_db)) -> Dict[str, Any]:
+    """Veritabanına doğrudan yapılan değişikliklerden sonra referans veri deposunu yeniden yükler."""
+    snapshot = await reference_data.load(db)
+    # İlan listeleri hizmet/ilçe bilgisini gömülü taşır; değişmiş olabilirler.
+    await response_cache.invalidate(JOBS_LIST_TAG)
+    return {"version": snapshot.version, "loaded_at": snapshot.loaded_at}
@@ -1,19 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import contextvars
+import logging
+from dataclasses import dataclass
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
-from passlib.context import CryptContext
+from sqlalchemy.orm import Session, object_session, selectinload
+from sqlalchemy import event, update
 from datetime import datetime, timedelta, timezone
 from jose import JWTError, jwt
 
-from ..database import get_db
-from ..models.user import User, Role, RoleName
+from ..cache import TTLCache
+from ..config import settings
+from ..database import AsyncSessionLocal, get_db, get_read_db, read_session_factory
+from ..query_stats import query_budget
+from ..reference_data import reference_data
+from ..passwords import (
+    pwd_context,
+    hash_password,
+    verify_password as _verify_password,
+    hash_password_async,
+    verify_password_async,
+    needs_rehash,
+    password_pool,
+    PasswordPoolOverloaded,
+)
+from ..revocation import RevocationList
+from ..models.user import User, Role, RoleName, TokenRevocation
+from ..models.provider_models import Provider
 from ..schemas.user_schema import UserCreate, UserResponse, UserLogin, Token
 
-# Şifre hashleme için CryptContext objesi oluşturulur. Artık Argon2 kullanılıyor.
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
-
 # FastAPI için bir yönlendirici (router) oluşturulur.
 # auth_router = APIRouter() # <- BU SATIR DÜZELTİLDİ
 auth_router = APIRouter(
@@ -31,15 +49,146 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 # Bu sınıf, tokenUrl parametresini kullanarak JWT'nin nereden alınacağını belirtir.
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 
+# Kimliği doğrulanmış kullanıcılar (principal) için süreç içi önbellek.
+# Anahtar token'daki 'sub' (e-posta) değeridir. Böylece korumalı rotalarda
+# her istekte User + Role sorgusu (2 sorgu) çalıştırılmaz.
+principal_cache = TTLCache(
+    max_size=settings.principal_cache_max_size,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+)
+
+# İptal edilen token'ların bellekteki listesi. Token ömrü boyunca (ve saat farkları için
+# bir dakika fazlası) tutulur; uygulama yaşam döngüsünde arka planda yenilenir.
+revocation_list = RevocationList(
+    retention_seconds=ACCESS_TOKEN_EXPIRE_MINUTES * 60 + 60,
+    refresh_seconds=settings.auth_revocation_refresh_seconds,
+)
+
+def invalidate_principal(email: str | None) -> None:
+    """
+    Removes a cached principal so the next request reloads it from the database.
+    Must be called after commit; bulk update(User) statements do not fire the
+    attribute listeners below and have to call this explicitly.
+    """
+    if email:
+        principal_cache.invalidate(email)
+
+# Oturumda commit edildiğinde önbellekten silinecek e-postalar (Session.info anahtarı).
+_PENDING_INVALIDATIONS = "principal_invalidations"
+
+def _invalidate_after_commit(target: User, *emails) -> None:
+    # Önbellek commit'ten önce silinirse eşzamanlı bir istek commit edilmemiş (eski)
+    # satırı yeniden önbelleğe koyup TTL boyunca kullanabilir; silme commit'e ertelenir.
+    session = object_session(target)
+    if session is None:
+        for email in emails:
+            invalidate_principal(email)
+        return
+    session.info.setdefault(_PENDING_INVALIDATIONS, set()).update(e for e in emails if isinstance(e, str))
+
+@event.listens_for(Session, "after_commit")
+def _flush_principal_invalidations(session):
+    for email in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        invalidate_principal(email)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_principal_invalidations(session):
+    session.info.pop(_PENDING_INVALIDATIONS, None)
+
+# Kullanıcının rolü, aktiflik durumu veya e-postası değiştiğinde önbellekteki
+# kaydı (commit sonrasında) geçersiz kıl. E-posta değişiminde eski anahtar da silinmelidir.
+@event.listens_for(User.email, "set")
+def _invalidate_on_email_change(target, value, oldvalue, initiator):
+    _invalidate_after_commit(target, oldvalue, value)
+
+@event.listens_for(User.role_id, "set")
+@event.listens_for(User.role, "set")
+@event.listens_for(User.is_active, "set")
+@event.listens_for(User.token_version, "set")
+def _invalidate_on_principal_change(target, value, oldvalue, initiator):
+    # Yüklenmemiş bir özelliğe erişip sorgu tetiklememek için __dict__ kullanılır.
+    _invalidate_after_commit(target, target.__dict__.get("email"))
+
 # Şifreyi hashlemek için yardımcı fonksiyon.
+# Not: Senkron çalışır ve olay döngüsünü bloklar; async handler'larda
+# get_password_hash_async kullanılmalıdır.
 def get_password_hash(password: str) -> str:
     """Hashes a password using the configured scheme (Argon2)."""
-    return pwd_context.hash(password)
+    return hash_password(password)
 
 # Şifreyi doğrulamak için yardımcı fonksiyon.
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain password against a hashed one."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return _verify_password(plain_password, hashed_password)
+
+# Havuz dolduğunda istemciye 503 döndürülür; böylece giriş patlamaları
+# diğer istekleri (örn. ilan listeleme) bekletmez.
+def _password_pool_overloaded() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Sunucu şu anda çok yoğun. Lütfen kısa bir süre sonra tekrar deneyin.",
+        headers={"Retry-After": "1"},
+    )
+
+async def get_password_hash_async(password: str) -> str:
+    """Hashes a password in the password worker pool."""
+    try:
+        return await hash_password_async(password)
+    except PasswordPoolOverloaded:
+        raise _password_pool_overloaded()
+
+async def verify_password_in_pool(plain_password: str, hashed_password: str) -> bool:
+    """Verifies a password in the password worker pool."""
+    try:
+        return await verify_password_async(plain_password, hashed_password)
+    except PasswordPoolOverloaded:
+        raise _password_pool_overloaded()
+
+logger = logging.getLogger(__name__)
+
+# Arka planda çalışan yeniden hashleme görevleri (görevlerin çöp toplanmaması için tutulur).
+_rehash_tasks: set[asyncio.Task] = set()
+
+async def _rehash_password(user_id: int, plain_password: str, old_hash: str) -> None:
+    # Havuzda bekleyen iş varsa etkileşimli girişlere yer bırakmak için atla;
+    # hash güncel olmadığı sürece bir sonraki girişte tekrar denenir.
+    if password_pool.queued:
+        return
+    try:
+        new_hash = await hash_password_async(plain_password)
+    except PasswordPoolOverloaded:
+        return
+    # Hash yalnızca bu arada değişmediyse yazılır; eşzamanlı bir parola
+    # değişikliğinin üzerine eski parolanın hash'i yazılmaz.
+    async with AsyncSessionLocal() as db:
+        await db.execute(
+            update(User)
+            .where(User.id == user_id, User.password_hash == old_hash)
+            .values(password_hash=new_hash)
+        )
+        await db.commit()
+
+def _log_rehash_failure(task: asyncio.Task) -> None:
+    _rehash_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Parola yeniden hashlenemedi.", exc_info=task.exception())
+
+def schedule_password_rehash(user_id: int, plain_password: str, old_hash: str) -> None:
+    """
+    Parametreleri güncel olmayan bir hash'i arka planda yeniden hesaplayıp yazar.
+    Giriş yanıtı bu işi beklemez. Görev boş bir bağlamda başlatılır; böylece
+    sorguları isteğin sorgu istatistiklerine (Server-Timing, bütçe) sayılmaz.
+    """
+    task = contextvars.Context().run(
+        asyncio.get_running_loop().create_task, _rehash_password(user_id, plain_password, old_hash)
+    )
+    _rehash_tasks.add(task)
+    task.add_done_callback(_log_rehash_failure)
+
+async def drain_password_rehashes() -> None:
+    """Uygulama kapanırken süren yeniden hashleme görevlerinin bitmesini bekler."""
+    if _rehash_tasks:
+        await asyncio.gather(*_rehash_tasks, return_exceptions=True)
 
 # JWT token oluşturmak için yardımcı fonksiyon.
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
@@ -69,18 +218,19 @@ async def register_user(
             detail="Bu e-posta adresi zaten kayıtlı."
         )
 
-    # 2. Kullanıcının rolünü (örn: customer) veritabanından bul.
+    # 2. Kullanıcının rolünü (örn: customer) referans veri deposundan bul.
     # Bu adım, veritabanı şemasının istediği 'role_id'yi bulmak için zorunludur.
-    role_obj = await db.execute(select(Role).where(Role.role_name == user_data.role_name))
-    role = role_obj.scalar_one_or_none()
+    # Roller başlangıçta yüklendiği için burada sorgu çalışmaz.
+    await reference_data.ensure(db)
+    role = reference_data.role_by_name(user_data.role_name)
     if not role:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Belirtilen rol adı '{user_data.role_name}' bulunamadı."
         )
 
-    # 3. Şifreyi güvenli bir şekilde hashle.
-    hashed_password = get_password_hash(user_data.password)
+    # 3. Şifreyi güvenli bir şekilde hashle (işçi havuzunda, olay döngüsünü bloklamadan).
+    hashed_password = await get_password_hash_async(user_data.password)
 
     # 4. Yeni kullanıcı objesini oluştur. Artık role_id'yi kullanabiliriz.
     new_user = User(
@@ -92,6 +242,13 @@ async def register_user(
         is_active=True
     )
 
+    # Sağlayıcı (provider) profilini kullanıcıyla aynı işlemde oluştur; böylece
+    # teklif verme rotası profili aramak veya oluşturmak zorunda kalmaz.
+    if role.role_name == RoleName.provider:
+        new_user.provider_profile = Provider(
+            business_name=f"{user_data.first_name} {user_data.last_name}" # Varsayılan iş adı
+        )
+
     # 5. Kullanıcıyı veritabanına ekle ve değişikliği kaydet.
     db.add(new_user)
     await db.commit()
@@ -101,7 +258,7 @@ async def register_user(
 
 # Giriş rotası. Kullanıcı giriş yapar ve bir JWT token alır.
 # Artık JSON body kullanıyor.
-@auth_router.post("/login", response_model=Token)
+@auth_router.post("/login", response_model=Token, dependencies=[Depends(query_budget(2))])
 async def login_for_access_token(
     user_data: UserLogin,
     db: AsyncSession = Depends(get_db)
@@ -111,53 +268,195 @@ async def login_for_access_token(
     result = await db.execute(query)
     user = result.scalars().first()
 
-    if not user or not verify_password(user_data.password, user.password_hash):
+    if not user or not await verify_password_in_pool(user_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if not user.is_active:
+        raise _suspended_exception()
+    # Argon2 parametreleri değiştiyse hash'i yanıtı geciktirmeden güncelle.
+    if settings.password_rehash_on_login and needs_rehash(user.password_hash):
+        schedule_password_rehash(user.id, user_data.password, user.password_hash)
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         # Rol adını user objesinin ilişkili rolünden alıp stringe çeviriyoruz.
-        data={"sub": user.email, "role": user.role.role_name.value},
+        # 'uid' ve 'ver', yalnızca talepler ile doğrulamada (auth_stateless) kullanılır.
+        data={
+            "sub": user.email,
+            "role": user.role.role_name.value,
+            "uid": user.id,
+            "ver": user.token_version,
+        },
         expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
-# Mevcut kullanıcıyı almak için yardımcı fonksiyon.
-async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def _suspended_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="Hesabınız askıya alınmış.",
+    )
+
+def _decode_token(token: str) -> dict:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        role_name: RoleName = payload.get("role")
-        if email is None:
-            raise credentials_exception
-        token_data = {"email": email, "role": role_name}
     except JWTError:
-        raise credentials_exception
-    
+        raise _credentials_exception()
+    if payload.get("sub") is None:
+        raise _credentials_exception()
+    return payload
+
+@dataclass(frozen=True)
+class CachedUser:
+    """
+    Kimlik önbelleğinde tutulan, değiştirilemez kullanıcı görüntüsü. Aynı nesne eşzamanlı
+    isteklerde paylaşıldığı için oturumdan ayrılmış bir User yerine bu kullanılır.
+    """
+
+    id: int
+    email: str
+    first_name: str
+    last_name: str
+    is_active: bool
+    token_version: int
+    role: Role
+
+    @property
+    def role_name(self) -> RoleName:
+        return self.role.role_name
+
+async def _load_user(email: str, db: AsyncSession) -> CachedUser:
+    """Kullanıcıyı rolüyle birlikte veritabanından yükler ve kimlik önbelleğine koyar."""
     # Kullanıcıyı ve ilişkili rolünü tek bir sorguda getir.
-    user_query = select(User).options(selectinload(User.role)).where(User.email == token_data["email"])
+    user_query = select(User).options(selectinload(User.role)).where(User.email == email)
     user_result = await db.execute(user_query)
     user = user_result.scalars().first()
-    
+
     if user is None:
-        raise credentials_exception
-    
-    # Kullanıcı objesine, ilişkili role_name özelliğini ekle.
-    user.role_name = user.role.role_name
-    
+        raise _credentials_exception()
+
+    cached = CachedUser(
+        id=user.id,
+        email=user.email,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        is_active=bool(user.is_active),
+        token_version=user.token_version or 0,
+        role=user.role,
+    )
+    principal_cache.set(email, cached)
+    return cached
+
+def _cached_user(payload: dict) -> CachedUser | None:
+    """
+    Önbellekteki kullanıcıyı döndürür. Önbellekteki kayıt başka bir süreçte yapılan
+    iptali henüz görmemiş olabilir; iptal listesinde görünen kullanıcılar bu yüzden
+    veritabanından yeniden yüklenir.
+    """
+    user = principal_cache.get(payload["sub"])
+    if user is not None and revocation_list.is_revoked(user.id, payload.get("ver", 0)):
+        principal_cache.invalidate(payload["sub"])
+        return None
+    return user
+
+def _check_user(user: CachedUser, payload: dict) -> CachedUser:
+    """Hesabın aktif olduğunu ve token'ın kullanıcının güncel token sürümüyle verildiğini doğrular."""
+    if not user.is_active:
+        raise _suspended_exception()
+    # 'ver' taşımayan (eski) token'lar sürüm 0 kabul edilir. Sürüm yalnızca artar; eşitlik
+    # aranması, silinen bir kullanıcının id'si yeniden kullanıldığında eski token'ların
+    # yeni kullanıcıya geçmesini de engeller.
+    if payload.get("ver", 0) != user.token_version or payload.get("uid", user.id) != user.id:
+        raise _credentials_exception()
     return user
 
+# Mevcut kullanıcıyı almak için yardımcı fonksiyon.
+# Kullanıcı sorgusu GET isteklerinde replikaya yönlendirilebilir; yazma isteklerinde
+# get_read_db birincili kullanır (bkz. prefers_primary).
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_read_db)):
+    payload = _decode_token(token)
+    # Önce önbelleğe bak; isabet varsa veritabanına hiç gidilmez.
+    user = _cached_user(payload)
+    if user is None:
+        user = await _load_user(payload["sub"], db)
+    return _check_user(user, payload)
+
+
+class Principal:
+    """
+    Yalnızca token taleplerinden oluşturulan kimlik. Rotaların kullandığı alanlarda
+    (id, role_name, role.role_name) User nesnesi gibi davranır.
+    """
+
+    __slots__ = ("id", "email", "role_name", "role", "token_version")
+
+    def __init__(self, id: int, email: str, role, token_version: int):
+        self.id = id
+        self.email = email
+        self.role = role
+        self.role_name = role.role_name
+        self.token_version = token_version
+
+
+def _principal_from_claims(payload: dict) -> Principal | None:
+    user_id, token_version, role_name = payload.get("uid"), payload.get("ver"), payload.get("role")
+    if user_id is None or token_version is None or role_name not in RoleName.__members__:
+        return None
+    role = reference_data.role_by_name(RoleName(role_name))
+    if role is None:
+        return None
+    return Principal(user_id, payload["sub"], role, token_version)
+
+# Yalnızca kimlik ve rol gereken rotalar için bağımlılık. auth_stateless açıksa ve iptal
+# listesi güncelse istek veritabanına gitmeden token talepleriyle doğrulanır. İptal
+# listesinde görünen token'lar, listesi güncel olmayan süreçler ve uid/ver taşımayan eski
+# token'lar get_current_user ile aynı yoldan doğrulanır; oturum yalnızca önbellek
+# ıskalamasında açılır (yazma isteklerinde birincilde).
+async def get_current_principal(request: Request, token: str = Depends(oauth2_scheme)):
+    payload = _decode_token(token)
+    if settings.auth_stateless and revocation_list.healthy:
+        principal = _principal_from_claims(payload)
+        if principal is not None and not revocation_list.is_revoked(principal.id, principal.token_version):
+            return principal
+
+    user = _cached_user(payload)
+    if user is None:
+        session_factory = await read_session_factory(request)
+        async with session_factory() as db:
+            user = await _load_user(payload["sub"], db)
+    return _check_user(user, payload)
+
+def revoke_tokens(db: AsyncSession, user: User, suspended: bool | None = None) -> TokenRevocation:
+    """
+    Kullanıcının o ana kadar aldığı tüm token'ları geçersiz kılar: token_version artırılır
+    ve diğer süreçlerin okuyacağı iptal kaydı oturuma eklenir. Commit sonrasında çağıran
+    taraf kaydı apply_revocation ile bu sürecin listesine de uygulamalıdır.
+    """
+    user.token_version = (user.token_version or 0) + 1
+    revocation = TokenRevocation(
+        user_id=user.id,
+        min_token_version=user.token_version,
+        suspended=(not user.is_active) if suspended is None else suspended,
+    )
+    db.add(revocation)
+    return revocation
+
+def apply_revocation(revocation: TokenRevocation) -> None:
+    """Commit edilmiş bir iptal kaydını bu sürecin iptal listesine hemen uygular."""
+    revocation_list.record(revocation.user_id, revocation.min_token_version, revocation.suspended)
+
 # Kullanıcıya özel hoş geldin mesajı veren korumalı rota.
-@auth_router.get("/me", response_model=UserResponse)
+@auth_router.get("/me", response_model=UserResponse, dependencies=[Depends(query_budget(2))])
 async def read_current_user(current_user: User = Depends(get_current_user)):
     return current_user
 
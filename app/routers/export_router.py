@@ -0,0 +1,127 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import select
+
+# Proje içi importlar
+from ..database import read_session_factory
+from ..exports import DataFormat, export_response
+from ..models.job_models import Job, JobStatus, Offer, OfferStatus
+from ..models.review_models import Review
+from ..models.user import User, Role, RoleName
+from .admin_router import get_current_admin_user
+
+router = APIRouter(
+    prefix="/api/v1/admin/exports",
+    tags=["Data Export (Admin)"],
+    dependencies=[Depends(get_current_admin_user)],
+)
+
+# Tüm dışa aktarmalar birincil anahtar sırasıyla akar; böylece çıktı kararlıdır ve
+# veritabanı sıralama için ek bellek kullanmaz.
+
+
+def _export_name(resource: str) -> str:
+    return f"{resource}-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}"
+
+
+def _created_between(query, column, created_from: Optional[datetime], created_to: Optional[datetime]):
+    # Tarih aralığı [created_from, created_to) olarak uygulanır.
+    if created_from is not None:
+        query = query.where(column >= created_from)
+    if created_to is not None:
+        query = query.where(column < created_to)
+    return query
+
+
+@router.get("/users", summary="Kullanıcıları Dışa Aktar (NDJSON/CSV)")
+async def export_users(
+    request: Request,
+    format: DataFormat = Query(DataFormat.ndjson, description="Çıktı biçimi: ndjson veya csv"),
+    role: Optional[RoleName] = None,
+    is_active: Optional[bool] = None,
+):
+    """
+    Kullanıcıları (parola hash'i hariç) akış halinde dışa aktarır.
+    'Accept-Encoding: gzip' gönderilirse çıktı sıkıştırılır.
+    """
+    query = (
+        select(
+            User.id, User.email, User.first_name, User.last_name, User.phone_number,
+            Role.role_name.label("role_name"), User.is_active,
+        )
+        .join(Role, Role.id == User.role_id)
+        .order_by(User.id)
+    )
+    if role is not None:
+        query = query.where(Role.role_name == role)
+    if is_active is not None:
+        query = query.where(User.is_active == is_active)
+    return export_response(request, await read_session_factory(request), query, format, _export_name("users"))
+
+
+@router.get("/jobs", summary="İlanları Dışa Aktar (NDJSON/CSV)")
+async def export_jobs(
+    request: Request,
+    format: DataFormat = Query(DataFormat.ndjson, description="Çıktı biçimi: ndjson veya csv"),
+    status: Optional[JobStatus] = None,
+    is_active: Optional[bool] = None,
+    created_from: Optional[datetime] = Query(None, description="Bu tarih ve sonrasında oluşturulanlar"),
+    created_to: Optional[datetime] = Query(None, description="Bu tarihten önce oluşturulanlar"),
+):
+    """İlanları akış halinde dışa aktarır. Durum ve oluşturulma tarihi aralığına göre filtrelenebilir."""
+    query = select(
+        Job.id, Job.customer_id, Job.service_id, Job.district_id, Job.title, Job.description,
+        Job.status, Job.is_active, Job.created_at, Job.updated_at,
+    ).order_by(Job.id)
+    if status is not None:
+        query = query.where(Job.status == status)
+    if is_active is not None:
+        query = query.where(Job.is_active == is_active)
+    query = _created_between(query, Job.created_at, created_from, created_to)
+    return export_response(request, await read_session_factory(request), query, format, _export_name("jobs"))
+
+
+@router.get("/offers", summary="Teklifleri Dışa Aktar (NDJSON/CSV)")
+async def export_offers(
+    request: Request,
+    format: DataFormat = Query(DataFormat.ndjson, description="Çıktı biçimi: ndjson veya csv"),
+    status: Optional[OfferStatus] = None,
+    job_id: Optional[int] = None,
+    created_from: Optional[datetime] = Query(None, description="İlanı bu tarih ve sonrasında oluşturulanlar"),
+    created_to: Optional[datetime] = Query(None, description="İlanı bu tarihten önce oluşturulanlar"),
+):
+    """
+    Teklifleri akış halinde dışa aktarır. Tekliflerin kendi oluşturulma tarihi
+    tutulmadığı için tarih aralığı teklifin verildiği ilanın tarihine uygulanır.
+    """
+    query = select(
+        Offer.id, Offer.job_id, Offer.provider_id, Offer.offer_price, Offer.message, Offer.status,
+    ).order_by(Offer.id)
+    if status is not None:
+        query = query.where(Offer.status == status)
+    if job_id is not None:
+        query = query.where(Offer.job_id == job_id)
+    if created_from is not None or created_to is not None:
+        query = _created_between(query.join(Job, Job.id == Offer.job_id), Job.created_at, created_from, created_to)
+    return export_response(request, await read_session_factory(request), query, format, _export_name("offers"))
+
+
+@router.get("/reviews", summary="Değerlendirmeleri Dışa Aktar (NDJSON/CSV)")
+async def export_reviews(
+    request: Request,
+    format: DataFormat = Query(DataFormat.ndjson, description="Çıktı biçimi: ndjson veya csv"),
+    provider_id: Optional[int] = None,
+    created_from: Optional[datetime] = Query(None, description="Bu tarih ve sonrasında oluşturulanlar"),
+    created_to: Optional[datetime] = Query(None, description="Bu tarihten önce oluşturulanlar"),
+):
+    """Değerlendirmeleri akış halinde dışa aktarır."""
+    query = select(
+        Review.id, Review.job_id, Review.provider_id, Review.customer_id, Review.rating,
+        Review.comment, Review.created_at,
+    ).order_by(Review.id)
+    if provider_id is not None:
+        query = query.where(Review.provider_id == provider_id)
+    query = _created_between(query, Review.created_at, created_from, created_to)
+    return export_response(request, await read_session_factory(request), query, format, _export_name("reviews"))
@@ -0,0 +1,272 @@
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Proje içi importlar
+from ..bulk_import import (
+    ImportReportBuilder,
+    detect_format,
+    insert_rows,
+    iter_chunks,
+    iter_records,
+    read_body,
+    unique_by,
+)
+from ..database import get_db
+from ..exports import DataFormat
+from ..models.category_models import Service
+from ..models.job_models import Job, JobStatus
+from ..models.provider_models import Provider
+from ..models.user import User, RoleName
+from ..passwords import hash_passwords_async
+from ..reference_data import reference_data
+from ..response_cache import JOBS_LIST_TAG, response_cache
+from ..schemas.import_schemas import ImportReport, JobImportRow, ServiceImportRow, UserImportRow
+from ..search import search_backend
+from ..job_matching import open_job_index
+from .admin_router import get_current_admin_user
+
+router = APIRouter(
+    prefix="/api/v1/admin/imports",
+    tags=["Data Import (Admin)"],
+    dependencies=[Depends(get_current_admin_user)],
+)
+
+# Tüm içe aktarmalar aynı akışı izler: gövde satırlara ayrılır, her parça
+# doğrulanır, yabancı anahtarlar parça başına tek sorguyla çözülür ve geçerli
+# satırlar tek bir toplu INSERT ile eklenip onaylanır. Önceki parçalar, sonraki
+# bir parçadaki hatadan etkilenmez.
+
+_FORMAT_QUERY = Query(None, description="Girdi biçimi: ndjson veya csv (verilmezse Content-Type başlığından belirlenir)")
+_DRY_RUN_QUERY = Query(False, description="True ise satırlar yalnızca doğrulanır, veritabanına yazılmaz")
+
+
+@router.post("/jobs", response_model=ImportReport, summary="İlanları Toplu İçe Aktar (NDJSON/CSV)")
+async def import_jobs(
+    request: Request,
+    format: Optional[DataFormat] = _FORMAT_QUERY,
+    dry_run: bool = _DRY_RUN_QUERY,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    İlanları toplu olarak ekler. Her satırda title, description, service_id,
+    district_id ve müşteriyi belirten customer_id veya customer_email bulunur.
+    Müşteri, hizmet ve ilçe her parça için tek seferde doğrulanır.
+    """
+    data_format = detect_format(request, format)
+    records = iter_records(await read_body(request), data_format)
+    builder = ImportReportBuilder(dry_run)
+
+    await reference_data.ensure(db)
+    customer_role = reference_data.role_by_name(RoleName.customer)
+    # Bellek içi arama indeksi, eklenen ilanları sonradan tek sorguyla indeksler.
+    last_job_id = None
+    if search_backend.maintains_index and not dry_run:
+        last_job_id = (await db.execute(select(func.max(Job.id)))).scalar() or 0
+
+    for chunk in iter_chunks(records):
+        rows: List[Tuple[int, JobImportRow]] = builder.validate(JobImportRow, chunk)
+        if not rows:
+            continue
+        await reference_data.ensure(
+            db, {item.service_id for _, item in rows}, {item.district_id for _, item in rows}
+        )
+        customer_ids = {item.customer_id for _, item in rows if item.customer_id is not None}
+        customer_emails = {item.customer_email for _, item in rows if item.customer_email is not None}
+        result = await db.execute(
+            select(User.id, User.email, User.role_id).where(
+                or_(User.id.in_(customer_ids), User.email.in_(customer_emails))
+            )
+        )
+        users = result.all()
+        users_by_id = {user.id: user for user in users}
+        users_by_email = {user.email.lower(): user for user in users}
+
+        values = []
+        for row, item in rows:
+            errors = []
+            customer = (
+                users_by_id.get(item.customer_id) if item.customer_id is not None
+                else users_by_email.get(item.customer_email.lower())
+            )
+            if customer is None or customer_role is None or customer.role_id != customer_role.id:
+                errors.append("Müşteri bulunamadı (kullanıcı yok veya 'customer' rolünde değil).")
+            elif item.customer_email is not None and customer.email.lower() != item.customer_email.lower():
+                errors.append("'customer_id' ile 'customer_email' aynı kullanıcıyı göstermiyor.")
+            if reference_data.service(item.service_id) is None:
+                errors.append(f"ID'si {item.service_id} olan bir hizmet bulunamadı.")
+            if reference_data.district(item.district_id) is None:
+                errors.append(f"ID'si {item.district_id} olan bir ilçe bulunamadı.")
+            if errors:
+                builder.fail(row, *errors)
+                continue
+            values.append((row, {
+                "customer_id": customer.id,
+                "service_id": item.service_id,
+                "district_id": item.district_id,
+                "title": item.title,
+                "description": item.description,
+                "status": JobStatus.open,
+                "is_active": True,
+            }))
+
+        async def insert_jobs(items: List[dict]) -> None:
+            await db.execute(insert(Job), items)
+
+        await insert_rows(db, builder, values, insert_jobs)
+
+    if builder.report.inserted and not dry_run:
+        if last_job_id is not None:
+            await search_backend.index_jobs_after(db, last_job_id)
+        # Yeni ilanları sağlayıcı eşleştirme indeksine hemen ekle (arka plan eşitlemesini beklemeden).
+        if open_job_index.ready:
+            await open_job_index.sync(db)
+        await response_cache.invalidate(JOBS_LIST_TAG)
+    return builder.finish()
+
+
+@router.post("/users", response_model=ImportReport, summary="Kullanıcıları Toplu İçe Aktar (NDJSON/CSV)")
+async def import_users(
+    request: Request,
+    format: Optional[DataFormat] = _FORMAT_QUERY,
+    dry_run: bool = _DRY_RUN_QUERY,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Müşteri ve hizmet sağlayıcı hesaplarını toplu olarak oluşturur. Parolalar
+    düz metin gelir; her parçanın parolaları parola havuzunda paralel hashlenir.
+    Sağlayıcılar için, kayıt akışındaki gibi varsayılan bir profil açılır.
+    """
+    data_format = detect_format(request, format)
+    records = iter_records(await read_body(request), data_format)
+    builder = ImportReportBuilder(dry_run)
+
+    await reference_data.ensure(db)
+    provider_role = reference_data.role_by_name(RoleName.provider)
+    seen_emails: Dict[str, int] = {}
+    seen_phones: Dict[str, int] = {}
+
+    for chunk in iter_chunks(records):
+        rows: List[Tuple[int, UserImportRow]] = builder.validate(UserImportRow, chunk)
+        rows = unique_by(rows, lambda item: item.email.lower(), seen_emails, builder, "E-posta")
+        rows = unique_by(rows, lambda item: item.phone_number, seen_phones, builder, "Telefon numarası")
+        if not rows:
+            continue
+
+        # Kayıtlı e-posta ve telefonlar parça başına tek sorguyla bulunur.
+        emails = {item.email for _, item in rows}
+        phones = {item.phone_number for _, item in rows if item.phone_number}
+        result = await db.execute(
+            select(User.email, User.phone_number).where(
+                or_(User.email.in_(emails), User.phone_number.in_(phones))
+            )
+        )
+        taken_emails, taken_phones = set(), set()
+        for email, phone_number in result.all():
+            taken_emails.add(email.lower())
+            taken_phones.add(phone_number)
+
+        accepted = []
+        for row, item in rows:
+            errors = []
+            if item.email.lower() in taken_emails:
+                errors.append("Bu e-posta adresi zaten kayıtlı.")
+            if item.phone_number and item.phone_number in taken_phones:
+                errors.append("Bu telefon numarası zaten kayıtlı.")
+            role = reference_data.role_by_name(item.role_name)
+            if role is None:
+                errors.append(f"'{item.role_name.value}' rolü bulunamadı.")
+            if errors:
+                builder.fail(row, *errors)
+                continue
+            accepted.append((row, item, role.id))
+
+        hashes = [None] * len(accepted)
+        if accepted and not dry_run:
+            hashes = await hash_passwords_async([item.password for _, item, _ in accepted])
+        values = [
+            (row, {
+                "email": item.email,
+                "password_hash": password_hash,
+                "first_name": item.first_name,
+                "last_name": item.last_name,
+                "phone_number": item.phone_number,
+                "is_active": item.is_active,
+                "role_id": role_id,
+            })
+            for (row, item, role_id), password_hash in zip(accepted, hashes)
+        ]
+
+        async def insert_users(items: List[dict]) -> None:
+            await db.execute(insert(User), items)
+            provider_emails = [
+                item["email"] for item in items if provider_role is not None and item["role_id"] == provider_role.id
+            ]
+            if not provider_emails:
+                return
+            # MySQL'de toplu INSERT eklenen ID'leri döndürmez; sağlayıcılar e-postayla geri okunur.
+            result = await db.execute(
+                select(User.id, User.first_name, User.last_name).where(User.email.in_(provider_emails))
+            )
+            await db.execute(insert(Provider), [
+                {"user_id": user_id, "business_name": f"{first_name} {last_name}"}  # Varsayılan iş adı
+                for user_id, first_name, last_name in result.all()
+            ])
+
+        await insert_rows(db, builder, values, insert_users)
+
+    return builder.finish()
+
+
+@router.post("/services", response_model=ImportReport, summary="Hizmetleri Toplu İçe Aktar (NDJSON/CSV)")
+async def import_services(
+    request: Request,
+    format: Optional[DataFormat] = _FORMAT_QUERY,
+    dry_run: bool = _DRY_RUN_QUERY,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Hizmetleri toplu olarak ekler. Kategori referans veri deposundan doğrulanır;
+    aynı kategoride aynı slug'a sahip ikinci bir hizmet eklenmez. İşlem sonunda
+    referans veri deposu yenilenir.
+    """
+    data_format = detect_format(request, format)
+    records = iter_records(await read_body(request), data_format)
+    builder = ImportReportBuilder(dry_run)
+
+    await reference_data.ensure(db)
+    seen_slugs: Dict[Tuple[int, str], int] = {}
+
+    for chunk in iter_chunks(records):
+        rows: List[Tuple[int, ServiceImportRow]] = builder.validate(ServiceImportRow, chunk)
+        rows = unique_by(rows, lambda item: (item.category_id, item.slug), seen_slugs, builder, "Kategori içindeki slug")
+        if not rows:
+            continue
+        result = await db.execute(
+            select(Service.category_id, Service.slug).where(Service.slug.in_({item.slug for _, item in rows}))
+        )
+        taken = set(result.all())
+
+        categories = reference_data.snapshot.categories
+        values = []
+        for row, item in rows:
+            errors = []
+            if item.category_id not in categories:
+                errors.append(f"ID'si {item.category_id} olan bir kategori bulunamadı.")
+            if (item.category_id, item.slug) in taken:
+                errors.append("Bu kategoride aynı slug'a sahip bir hizmet zaten var.")
+            if errors:
+                builder.fail(row, *errors)
+                continue
+            values.append((row, item.model_dump()))
+
+        async def insert_services(items: List[dict]) -> None:
+            await db.execute(insert(Service), items)
+
+        await insert_rows(db, builder, values, insert_services)
+
+    if builder.report.inserted and not dry_run:
+        await reference_data.load(db)
+    return builder.finish()
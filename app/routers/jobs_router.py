@@ -1,29 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from pydantic import TypeAdapter
+from sqlalchemy import func, tuple_, update
 from sqlalchemy.orm import joinedload
-from typing import List
+from datetime import datetime
+from typing import List, Optional
 
 # Async için importlar eklendi
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select 
 
 # Proje içi importlar
-from ..models.job_models import Job
-from ..models.user import User 
+from ..models.job_models import Job, JobStatus
+from ..models.user import User, RoleName
 from ..schemas import job_schemas
-from ..database import get_db
-from .auth import get_current_user
+from ..database import get_db, get_read_db
+from ..pagination import decode_cursor, encode_cursor, keyset_after, next_cursor, NEXT_CURSOR_HEADER
+from ..search import search_backend, tokenize, JobSearchFilters
+from ..job_matching import open_job_index
+from ..reference_data import reference_data
+from ..serialization import dump_trusted, trusted_json_response
+from ..http_cache import is_not_modified, make_version_etag, not_modified, validator_headers
+from ..response_cache import CachedResponse, JOBS_LIST_TAG, cache_key, job_tag, response_cache, user_tag
+from ..query_stats import query_budget
+from .auth import get_current_principal
+from .providers_router import subscription_pairs
 
 router = APIRouter(
     prefix="/api/v1/jobs",
     tags=["Jobs (İlanlar)"]
 )
 
+# İlanlar sık güncellenir: istemci önbelleğe alabilir ama her kullanımda
+# (If-None-Match / If-Modified-Since ile) yeniden doğrulamalıdır.
+JOBS_CACHE_CONTROL = "public, no-cache"
+
+_job_response_adapter = TypeAdapter(job_schemas.JobResponse)
+
 # DEĞİŞİKLİK: Endpoint birleştirildi ve akıllı hale getirildi.
-@router.post("/", response_model=job_schemas.JobResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/", response_model=job_schemas.JobResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(query_budget(6))])
 async def create_job( 
     job_data: job_schemas.JobCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_principal)
 ):
     """
     Giriş yapan kullanıcı için veya (Admin/Provider ise) belirtilen müşteri için
@@ -32,6 +51,19 @@ async def create_job(
     customer_id_to_assign = None
     role = current_user.role.role_name.value
 
+    # Hizmet ve ilçe ID'lerini referans veri deposundan doğrula (sorgu yok).
+    await reference_data.ensure(db, [job_data.service_id], [job_data.district_id])
+    if not reference_data.service(job_data.service_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"ID'si {job_data.service_id} olan bir hizmet bulunamadı."
+        )
+    if not reference_data.district(job_data.district_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"ID'si {job_data.district_id} olan bir ilçe bulunamadı."
+        )
+
     if role == 'customer':
         # Müşteri ise, ilanı kendi adına açar.
         customer_id_to_assign = current_user.id
@@ -44,24 +76,19 @@ async def create_job(
                 detail=f"'{role}' rolüyle ilan oluşturmak için bir 'customer_id' göndermelisiniz."
             )
         
-        # Gönderilen customer_id'nin geçerli bir müşteri olup olmadığını doğrula
+        # Gönderilen customer_id'nin geçerli bir müşteri olup olmadığını doğrula.
+        # Rol, referans veri deposundan çözülür; ayrıca rol sorgusu yapılmaz.
         customer_user_result = await db.execute(select(User).where(User.id == job_data.customer_id))
         customer = customer_user_result.scalars().first()
         
-        # Müşterinin rolünü de kontrol et
         if not customer:
              raise HTTPException(
-                status_code=status.HTTP_44_NOT_FOUND,
+                status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"ID'si {job_data.customer_id} olan bir kullanıcı bulunamadı."
             )
         
-        # Gelen customer'ın rolünü yükle (Eğer user modelinde 'role' ilişkisi varsa)
-        customer_role_result = await db.execute(
-            select(User).options(joinedload(User.role)).where(User.id == job_data.customer_id)
-        )
-        customer_with_role = customer_role_result.scalars().first()
-
-        if not customer_with_role or customer_with_role.role.role_name.value != 'customer':
+        customer_role = reference_data.role(customer.role_id)
+        if not customer_role or customer_role.role_name.value != 'customer':
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"ID'si {job_data.customer_id} olan bir 'customer' bulunamadı."
@@ -80,47 +107,373 @@ async def create_job(
     await db.commit()
     await db.refresh(new_job)
 
+    # Arama indeksini güncelle (bellek içi arka uçta; MySQL'de FULLTEXT kendiliğinden güncellenir).
+    search_backend.index_job(new_job.id, new_job.title, new_job.description)
+    # Sağlayıcı eşleştirme indeksine ekle ("bana uygun ilanlar" akışı).
+    open_job_index.add(new_job.id, new_job.service_id, new_job.district_id, new_job.created_at)
+    # Önbellekteki ilan listelerini geçersiz kıl.
+    await response_cache.invalidate(JOBS_LIST_TAG)
+
     # Dönen yanıtın customer verisini yükle (JobResponse şeması için gerekli)
     await db.refresh(new_job, attribute_names=['customer'])
     return new_job
 
 # DEĞİKLİK: /privileged-create endpoint'i silindi.
 
-@router.get("/", response_model=List[job_schemas.JobListResponse])
-async def get_all_jobs(db: AsyncSession = Depends(get_db), skip: int = 0, limit: int = 100):
+def open_jobs_page_query(limit: int, skip: int = 0, after: Optional[list] = None):
     """
-    Sistemdeki tüm aktif ve açık ilanları listeler.
+    Aktif ve açık ilanların bir sayfası için sorguyu üretir.
+    'after' verilirse (created_at, id) değerlerinden sonrası keyset ile getirilir,
+    aksi halde (geriye uyumluluk için) OFFSET kullanılır.
     """
+    # Sıralama, (is_active, status, created_at, id) bileşik indeksiyle birebir uyumludur.
+    # Hizmet ve ilçe bilgileri JOIN ile değil, referans veri deposundan eklenir.
     query = (
         select(Job)
-        .options(joinedload(Job.service), joinedload(Job.district))
         .filter(Job.is_active == True, Job.status == 'open')
-        .order_by(Job.created_at.desc())
-        .offset(skip)
+        .order_by(Job.created_at.desc(), Job.id.desc())
         .limit(limit)
     )
-    result = await db.execute(query)
-    jobs = result.scalars().all()
-    
-    return jobs
+    if after:
+        query = query.filter(keyset_after([Job.created_at, Job.id], after, [True, True]))
+    elif skip:
+        query = query.offset(skip)
+    return query
+
+def job_list_item(job: Job, **extra) -> dict:
+    """
+    İlanı, hizmet ve ilçe bilgilerini referans veri deposundan ekleyerek yanıt sözlüğüne çevirir.
+    Sözlük JobListResponse şemasıyla birebir aynı biçimdedir ve doğrulama yapılmadan
+    doğrudan orjson ile serileştirilir (bkz. app/serialization.py).
+    """
+    return {
+        "id": job.id,
+        "title": job.title,
+        "description": job.description,
+        "service_id": job.service_id,
+        "district_id": job.district_id,
+        "status": job.status,
+        "created_at": job.created_at,
+        "service": reference_data.service_json(job.service_id),
+        "district": reference_data.district_json(job.district_id),
+        **extra,
+    }
+
+async def open_jobs_version(db: AsyncSession, request: Request) -> tuple:
+    """
+    İlan listelerinin sürümünü (ETag, Last-Modified) ucuz bir sorguyla belirler:
+    tüm ilanlarda MAX(updated_at) (idx_jobs_updated_at), açık ilanlarda MAX(created_at)
+    ve COUNT (idx_jobs_active_status_created). Herhangi bir ilan eklendiğinde,
+    güncellendiğinde veya listeden çıktığında bu değerlerden en az biri değişir.
+    """
+    open_filter = (Job.is_active == True, Job.status == 'open')
+    max_updated, max_created, open_count = (await db.execute(select(
+        select(func.max(Job.updated_at)).scalar_subquery(),
+        select(func.max(Job.created_at)).where(*open_filter).scalar_subquery(),
+        select(func.count()).select_from(Job).where(*open_filter).scalar_subquery(),
+    ))).one()
+
+    # Gövde, hizmet/ilçe bilgilerini de içerdiği için referans verilerin içerik ETag'leri de eklenir.
+    etag = make_version_etag(
+        "jobs", max_updated, max_created, open_count,
+        reference_data.payload("services")[1], reference_data.payload("districts")[1],
+        request.url.path, request.url.query,
+    )
+    timestamps = [t for t in (max_updated, max_created) if t is not None]
+    return etag, max(timestamps) if timestamps else None
+
+@router.get("/", response_model=List[job_schemas.JobListResponse], dependencies=[Depends(query_budget(3))])
+async def get_all_jobs(
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None
+):
+    """
+    Sistemdeki tüm aktif ve açık ilanları listeler.
+
+    İki sayfalama modu vardır:
+    - skip/limit: Eski (geriye uyumlu) mod. Derin sayfalarda yavaşlar.
+    - cursor: Bir önceki yanıtın 'X-Next-Cursor' başlığındaki değer gönderilir.
+      (created_at, id) üzerinden keyset sayfalama yapar; sayfa derinliğinden bağımsızdır.
+    """
+    if cursor and skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'cursor' ve 'skip' parametreleri birlikte kullanılamaz."
+        )
+
+    after = decode_cursor(cursor, 2, (datetime, int)) if cursor else None
+
+    async def build_page(session: AsyncSession, version: Optional[tuple] = None) -> CachedResponse:
+        await reference_data.ensure(session)
+        etag, last_modified = version or await open_jobs_version(session, request)
+        query = open_jobs_page_query(limit=limit, skip=skip, after=after)
+        jobs = (await session.execute(query)).scalars().all()
+        await reference_data.ensure(session, {j.service_id for j in jobs}, {j.district_id for j in jobs})
+
+        # Sayfa doluysa bir sonraki sayfanın imlecini başlıkta döndür.
+        # Böylece yanıt gövdesi (liste) eski istemcilerle uyumlu kalır.
+        headers = validator_headers(etag, JOBS_CACHE_CONTROL, last_modified)
+        cursor_value = next_cursor(jobs, limit, "created_at", "id")
+        if cursor_value:
+            headers[NEXT_CURSOR_HEADER] = cursor_value
+
+        # Liste doğrulamasız olarak doğrudan JSON'a serileştirilir (response_model yalnızca dokümantasyon için).
+        return CachedResponse(dump_trusted([job_list_item(job) for job in jobs]), headers)
+
+    # Yanıt önbelleği (ilan eklenince/atanınca geçersiz kılınır).
+    if response_cache.usable_for(request):
+        entry, cache_status = await response_cache.fetch(cache_key(request), [JOBS_LIST_TAG], build_page, request)
+        return entry.respond(request, cache_status)
+
+    # İstemcinin kopyası güncelse sayfa sorgusu hiç çalıştırılmaz.
+    await reference_data.ensure(db)
+    version = await open_jobs_version(db, request)
+    if is_not_modified(request, *version):
+        return not_modified(version[0], JOBS_CACHE_CONTROL, version[1])
+    return (await build_page(db, version)).respond(request)
+
+# Not: Bu rota "/{job_id}" rotasından ÖNCE tanımlanmalıdır.
+@router.get("/for-me", response_model=List[job_schemas.JobListResponse], dependencies=[Depends(query_budget(3))])
+async def get_jobs_for_me(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_principal),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None
+):
+    """
+    Giriş yapan sağlayıcının abone olduğu hizmet ve ilçelerdeki açık ilanları en yeniden
+    eskiye listeler (abonelik: PUT /api/v1/providers/me/subscriptions).
+    Bir sonraki sayfa için 'X-Next-Cursor' başlığındaki değer 'cursor' olarak gönderilir.
+
+    İlan kimlikleri bellek içi eşleştirme indeksinden seçilir (bkz. app/job_matching.py);
+    süre toplam ilan sayısına değil, dönen ilan sayısına bağlıdır. İlanlar birincil
+    anahtarla tek sorguda okunur. İndeks henüz kurulmadıysa aynı sonuç SQL ile üretilir.
+    """
+    if current_user.role.role_name.value != 'provider':
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Bu akış yalnızca 'provider' rolündeki kullanıcılar içindir."
+        )
+    after = decode_cursor(cursor, 2, (datetime, int)) if cursor else None
+    pairs = await subscription_pairs(db, current_user.id)
+    if not pairs:
+        return trusted_json_response([])
+
+    open_filter = (Job.is_active == True, Job.status == JobStatus.open)
+    if open_job_index.ready:
+        keys = open_job_index.feed(pairs, limit, tuple(after) if after else None)
+        jobs_by_id = {}
+        if keys:
+            result = await db.execute(select(Job).where(Job.id.in_([job_id for _, job_id in keys]), *open_filter))
+            jobs_by_id = {job.id: job for job in result.scalars().all()}
+        # Başka bir worker'da az önce kapanan ilanlar sorguda elenir; sayfa sırası indeksten gelir.
+        jobs = [jobs_by_id[job_id] for _, job_id in keys if job_id in jobs_by_id]
+        last_key = keys[-1] if len(keys) == limit else None
+    else:
+        query = (
+            select(Job)
+            .where(*open_filter, tuple_(Job.service_id, Job.district_id).in_(pairs))
+            .order_by(Job.created_at.desc(), Job.id.desc())
+            .limit(limit)
+        )
+        if after:
+            query = query.filter(keyset_after([Job.created_at, Job.id], after, [True, True]))
+        jobs = (await db.execute(query)).scalars().all()
+        last_key = (jobs[-1].created_at, jobs[-1].id) if len(jobs) == limit else None
+
+    await reference_data.ensure(db, {j.service_id for j in jobs}, {j.district_id for j in jobs})
+    headers = {NEXT_CURSOR_HEADER: encode_cursor(*last_key)} if last_key else None
+    return trusted_json_response([job_list_item(job) for job in jobs], headers)
 
-@router.get("/{job_id}", response_model=job_schemas.JobResponse)
-async def get_job_by_id(job_id: int, db: AsyncSession = Depends(get_db)):
+@router.get("/search", response_model=List[job_schemas.JobSearchResult], dependencies=[Depends(query_budget(2))])
+async def search_jobs(
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    q: Optional[str] = Query(None, description="Başlık ve açıklamada aranacak metin"),
+    service_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    district_id: Optional[int] = None,
+    city_name: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None
+):
+    """
+    Aktif ve açık ilanlarda hizmet, kategori, ilçe ve şehir filtreleriyle arama yapar.
+    'q' verilirse sonuçlar ilgi skoruna göre, verilmezse en yeniden eskiye sıralanır.
+    Bir sonraki sayfa için 'X-Next-Cursor' başlığındaki değer 'cursor' olarak gönderilir.
+    """
+    filters = JobSearchFilters(
+        service_id=service_id,
+        category_id=category_id,
+        district_id=district_id,
+        city_name=city_name,
+    )
+    # İlgi sıralamasının imleci (skor, id), tarih sıralamasınınki (created_at, id) taşır.
+    cursor_types = ((int, float), int) if q and tokenize(q) else (datetime, int)
+    after = decode_cursor(cursor, 2, cursor_types) if cursor else None
+
+    async def build_results(session: AsyncSession, version: Optional[tuple] = None) -> CachedResponse:
+        await reference_data.ensure(session)
+        etag, last_modified = version or await open_jobs_version(session, request)
+        results = await search_backend.search(session, filters, q, limit, after)
+        await reference_data.ensure(
+            session, {job.service_id for job, _ in results}, {job.district_id for job, _ in results}
+        )
+
+        headers = validator_headers(etag, JOBS_CACHE_CONTROL, last_modified)
+        if len(results) == limit:
+            last_job, last_score = results[-1]
+            first_key = last_score if last_score is not None else last_job.created_at
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(first_key, last_job.id)
+
+        return CachedResponse(dump_trusted([job_list_item(job, score=score) for job, score in results]), headers)
+
+    if response_cache.usable_for(request):
+        entry, cache_status = await response_cache.fetch(cache_key(request), [JOBS_LIST_TAG], build_results, request)
+        return entry.respond(request, cache_status)
+
+    # Sonuçlar yalnızca ilanlara ve referans verilere bağlıdır; liste sürümü değişmediyse 304.
+    await reference_data.ensure(db)
+    version = await open_jobs_version(db, request)
+    if is_not_modified(request, *version):
+        return not_modified(version[0], JOBS_CACHE_CONTROL, version[1])
+    return (await build_results(db, version)).respond(request)
+
+def _job_etag(job_id: int, updated_at, created_at, job_status, is_active, first_name, last_name) -> str:
+    # JobResponse gövdesini değiştirebilecek sürüm alanları (başlık/açıklama değişiklikleri updated_at'i günceller).
+    return make_version_etag("job", job_id, updated_at, created_at, job_status, is_active, first_name, last_name)
+
+
+@router.get("/{job_id}", response_model=job_schemas.JobResponse, dependencies=[Depends(query_budget(2))])
+async def get_job_by_id(job_id: int, request: Request, db: AsyncSession = Depends(get_read_db)):
     """
     Belirtilen ID'ye sahip ilanın detaylarını getirir.
+
+    Yanıt ETag ve Last-Modified başlıklarıyla döner. İstemci If-None-Match veya
+    If-Modified-Since gönderirse önce yalnızca sürüm sütunları okunur; kopya
+    güncelse ilişkiler yüklenmeden 304 döndürülür.
     """
-    query = (
-        select(Job)
-        .options(joinedload(Job.customer))
-        .filter(Job.id == job_id)
+    not_found = HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"ID'si {job_id} olan bir ilan bulunamadı."
     )
-    job_result = await db.execute(query)
-    job = job_result.scalars().first()
-    
+
+    async def build_detail(session: AsyncSession) -> CachedResponse:
+        query = (
+            select(Job)
+            .options(joinedload(Job.customer))
+            .filter(Job.id == job_id)
+        )
+        job_result = await session.execute(query)
+        job = job_result.scalars().first()
+
+        if not job:
+            raise not_found
+
+        etag = _job_etag(
+            job.id, job.updated_at, job.created_at, job.status, job.is_active,
+            job.customer.first_name, job.customer.last_name,
+        )
+        last_modified = job.updated_at or job.created_at
+        return CachedResponse(
+            _job_response_adapter.dump_json(job_schemas.JobResponse.model_validate(job)),
+            validator_headers(etag, JOBS_CACHE_CONTROL, last_modified),
+            tags=[user_tag(job.customer_id)],
+        )
+
+    # Yanıt önbelleği (ilan atanınca/yeniden açılınca geçersiz kılınır).
+    if response_cache.usable_for(request):
+        entry, cache_status = await response_cache.fetch(cache_key(request), [job_tag(job_id)], build_detail, request)
+        return entry.respond(request, cache_status)
+
+    if "if-none-match" in request.headers or "if-modified-since" in request.headers:
+        version = (await db.execute(
+            select(Job.updated_at, Job.created_at, Job.status, Job.is_active, User.first_name, User.last_name)
+            .join(User, User.id == Job.customer_id)
+            .where(Job.id == job_id)
+        )).first()
+        if not version:
+            raise not_found
+        etag = _job_etag(job_id, *version)
+        last_modified = version.updated_at or version.created_at
+        if is_not_modified(request, etag, last_modified):
+            return not_modified(etag, JOBS_CACHE_CONTROL, last_modified)
+
+    return (await build_detail(db)).respond(request)
+
+
+async def _transition_job(
+    db: AsyncSession,
+    job_id: int,
+    current_user: User,
+    allowed_from: tuple,
+    new_status: JobStatus,
+) -> Job:
+    """
+    İlanın durumunu koşullu olarak değiştirir (yalnızca ilan sahibi veya admin).
+    Geçiş, kabul işlemindeki gibi tek bir koşullu UPDATE ile yapılır; eşzamanlı
+    iki geçişten yalnızca biri başarılı olur.
+    """
+    job = (await db.execute(
+        select(Job).options(joinedload(Job.customer)).where(Job.id == job_id).with_for_update(of=Job)
+    )).scalar_one_or_none()
     if not job:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"ID'si {job_id} olan bir ilan bulunamadı."
         )
+    if job.customer_id != current_user.id and current_user.role_name != RoleName.admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Yalnızca kendi ilanlarınızın durumunu değiştirebilirsiniz."
+        )
+    if job.status not in allowed_from:
+        allowed = ", ".join(f"'{s.value}'" for s in allowed_from)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Bu ilan '{job.status.value}' durumunda. Yalnızca {allowed} durumundaki ilanlar '{new_status.value}' yapılabilir."
+        )
+
+    changed = await db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == job.status)
+        .values(status=new_status)
+        .execution_options(synchronize_session=False)
+    )
+    if changed.rowcount != 1:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="İlanın durumu az önce değişti. Lütfen tekrar deneyin."
+        )
+    await db.commit()
+    await db.refresh(job, attribute_names=["status", "updated_at"])
+
+    # İlan artık açık değil: eşleştirme ve arama indekslerinden çıkar, önbellekteki detay ve listeleri geçersiz kıl.
+    open_job_index.remove(job_id)
+    search_backend.remove_job(job_id)
+    await response_cache.invalidate(job_tag(job_id), JOBS_LIST_TAG)
     return job
 
+
+@router.patch("/{job_id}/complete", response_model=job_schemas.JobResponse, dependencies=[Depends(query_budget(4))])
+async def complete_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_principal)
+):
+    """Atanmış ('assigned') bir ilanı tamamlandı ('completed') olarak işaretler. Ardından değerlendirme yapılabilir."""
+    return await _transition_job(db, job_id, current_user, (JobStatus.assigned,), JobStatus.completed)
+
+
+@router.patch("/{job_id}/cancel", response_model=job_schemas.JobResponse, dependencies=[Depends(query_budget(4))])
+async def cancel_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_principal)
+):
+    """Açık ('open') veya atanmış ('assigned') bir ilanı iptal eder ('cancelled')."""
+    return await _transition_job(db, job_id, current_user, (JobStatus.open, JobStatus.assigned), JobStatus.cancelled)
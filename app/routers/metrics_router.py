@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+# Proje içi importlar
+from ..metrics import PROMETHEUS_CONTENT_TYPE, metrics
+
+router = APIRouter(tags=["Monitoring"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics():
+    """Prometheus metin biçiminde uygulama metrikleri (istek gecikmeleri, havuz göstergeleri)."""
+    return PlainTextResponse(metrics.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,31 +1,89 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import joinedload
-from typing import List
+from sqlalchemy import and_, case, func, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import contains_eager, joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+from decimal import Decimal
+from typing import List, Optional
 
 # Proje içi importlar
-from ..database import get_db, async_session_maker
+from ..database import get_db, get_read_db
 from ..models.user import User
-from ..models.job_models import Job, Offer, Provider, JobStatus
-from ..schemas import offer_schemas
-from .auth import get_current_user
+from ..models.job_models import Job, Offer, Provider, JobStatus, OfferStatus
+from ..models.provider_models import ProviderStats
+from ..pagination import decode_cursor, encode_cursor, keyset_after, NEXT_CURSOR_HEADER
+from ..serialization import list_adapter, validate_list
+from ..http_cache import make_etag, validator_headers
+from ..response_cache import (
+    CachedResponse, JOBS_LIST_TAG, cache_key, job_offers_tag, job_tag, provider_tag, response_cache,
+)
+from ..schemas import offer_schema as offer_schemas
+from ..query_stats import query_budget
+from ..job_matching import open_job_index
+from ..search import search_backend
+from .auth import get_current_principal
 
 router = APIRouter(
     prefix="/api/v1",  # Ana prefix'i burada tutuyoruz
     tags=["Offers (Teklifler)"]
 )
 
-@router.post("/jobs/{job_id}/offers", response_model=offer_schemas.OfferResponse, status_code=status.HTTP_201_CREATED)
+async def ensure_provider_profile(db: AsyncSession, user_id: int) -> Provider:
+    """
+    Kullanıcının sağlayıcı profilini döndürür; yoksa oluşturur.
+    Profiller artık kayıt sırasında oluşturulur; bu yol yalnızca eski kayıtlar içindir.
+    Ekleme bir upsert ile yapılır (user_id benzersizdir), böylece eşzamanlı istekler
+    aynı kullanıcı için ikinci bir profil oluşturamaz.
+    """
+    values = {
+        "user_id": user_id,
+        # Varsayılan iş adı. Ad/soyad alt sorguyla okunur; yalnızca talepler ile
+        # doğrulanan isteklerde kimlik nesnesi bu alanları taşımaz.
+        "business_name": (
+            select(User.first_name + " " + User.last_name).where(User.id == user_id).scalar_subquery()
+        ),
+        "is_verified": False,
+    }
+    dialect = db.bind.dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(Provider).values(**values).prefix_with("IGNORE")
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        stmt = pg_insert(Provider).values(**values).on_conflict_do_nothing(index_elements=["user_id"])
+    else:
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        stmt = sqlite_insert(Provider).values(**values).on_conflict_do_nothing(index_elements=["user_id"])
+    await db.execute(stmt)
+    return (await db.execute(select(Provider).where(Provider.user_id == user_id))).scalar_one()
+
+
+def _is_duplicate_offer(exc: IntegrityError) -> bool:
+    """
+    Hata (job_id, provider_id) benzersiz kısıtından mı kaynaklanıyor? MySQL ve PostgreSQL
+    kısıt adını, SQLite ise sütunları ("offers.job_id, offers.provider_id") bildirir.
+    """
+    message = str(exc.orig)
+    return "uq_offers_job_provider" in message or "offers.job_id, offers.provider_id" in message
+
+
+@router.post("/jobs/{job_id}/offers", response_model=offer_schemas.OfferResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(query_budget(4))])
 async def create_offer_for_job(
     job_id: int,
     offer_data: offer_schemas.OfferCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_principal)
 ):
     """
     Giriş yapmış 'provider' rolündeki kullanıcının,
     belirtilen bir ilana (job) teklif vermesini sağlar.
+
+    Normal durumda iki veritabanı gidiş-dönüşü yapılır: ilan + sağlayıcı profili
+    için tek bir SELECT ve teklifin INSERT'i (commit ile birlikte). Mükerrer
+    teklifler (job_id, provider_id) benzersiz indeksiyle yakalanır.
     """
     
     # 1. Sadece 'provider' rolündekiler teklif verebilir
@@ -35,116 +93,228 @@ async def create_offer_for_job(
             detail="Yalnızca 'provider' rolündeki kullanıcılar teklif verebilir."
         )
 
-    # 2. İlanı (Job) bul
-    job = await db.get(Job, job_id)
-    if not job:
+    # 2. İlanı (Job) ve provider'ın profilini tek sorguda bul.
+    # provider_profile, 'providers' tablosundaki kayıttır.
+    row = (await db.execute(
+        select(Job.status, Job.customer_id, Provider)
+        .outerjoin(Provider, Provider.user_id == current_user.id)
+        .where(Job.id == job_id)
+    )).first()
+    if not row:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="İlan bulunamadı.")
+    job_status, job_customer_id, provider_profile = row
 
     # 3. İlanın durumunu kontrol et ('open' değilse teklif verilemez)
-    if job.status != JobStatus.open:
+    if job_status != JobStatus.open:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Bu ilan '{job.status.value}' durumunda. Yalnızca 'open' durumundaki ilanlara teklif verilebilir."
+            detail=f"Bu ilan '{job_status.value}' durumunda. Yalnızca 'open' durumundaki ilanlara teklif verilebilir."
         )
         
     # 4. Provider kendi ilanına teklif veremez
-    if job.customer_id == current_user.id:
+    if job_customer_id == current_user.id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Kendi açtığınız ilana teklif veremezsiniz."
         )
 
-    # 5. Provider'ın profilini bul veya oluştur (ÇOK ÖNEMLİ)
-    # provider_profile, 'providers' tablosundaki kayıttır.
-    provider_profile = (await db.execute(
-        select(Provider).where(Provider.user_id == current_user.id)
-    )).scalar_one_or_none()
-
-    if not provider_profile:
-        # Eğer 'provider' rolüyle kayıt olunmuş ama 'providers' tablosunda
-        # profili henüz oluşmamışsa, burada otomatik oluştur.
-        provider_profile = Provider(
-            user_id=current_user.id,
-            business_name=f"{current_user.first_name} {current_user.last_name}" # Varsayılan iş adı
-        )
-        db.add(provider_profile)
-        await db.flush() # ID'sini almak için veritabanına anlık gönder
-
-    # 6. Provider bu ilana daha önce teklif vermiş mi?
-    existing_offer = (await db.execute(
-        select(Offer).where(
-            Offer.job_id == job_id,
-            Offer.provider_id == provider_profile.id
-        )
-    )).scalar_one_or_none()
-
-    if existing_offer:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Bu ilana zaten bir teklif vermişsiniz."
-        )
+    # 5. Profil kayıt sırasında oluşturulmamışsa (eski kullanıcılar) şimdi oluştur.
+    if provider_profile is None:
+        provider_profile = await ensure_provider_profile(db, current_user.id)
 
-    # 7. Yeni teklifi oluştur
+    # 6. Yeni teklifi oluştur. Provider bu ilana daha önce teklif vermişse
+    # benzersiz indeks (uq_offers_job_provider) INSERT'i reddeder.
     new_offer = Offer(
         **offer_data.model_dump(),
         job_id=job_id,
         provider_id=provider_profile.id  # 'user.id' DEĞİL, 'provider.id'
     )
+    new_offer.provider = provider_profile # Yanıt için ek sorgu gerekmez
     db.add(new_offer)
-    await db.commit()
-    
-    # 8. Yanıt için verileri ilişkilerle birlikte yükle
-    await db.refresh(new_offer, attribute_names=["provider"])
+    try:
+        await db.commit()
+    except IntegrityError as exc:
+        await db.rollback()
+        # Yalnızca mükerrer teklif bu mesajla bildirilir; diğer ihlaller (örn. ilan
+        # eşzamanlı silindiyse yabancı anahtar hatası) olduğu gibi yükseltilir.
+        if not _is_duplicate_offer(exc):
+            raise
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bu ilana zaten bir teklif vermişsiniz."
+        )
+
+    # Önbellekteki teklif listelerini geçersiz kıl.
+    await response_cache.invalidate(job_offers_tag(job_id))
 
     return new_offer
 
 
-@router.get("/jobs/{job_id}/offers", response_model=List[offer_schemas.OfferResponse])
+# Teklif listesi kullanıcıya özeldir; ara sunucular saklamamalı, istemci her seferinde doğrulamalı.
+OFFERS_CACHE_CONTROL = "private, no-cache"
+
+# Sağlayıcının ortalama puanı (2 basamak). Henüz yorumu olmayanlar 0 kabul edilir ve sona düşer.
+_provider_rating = func.coalesce(
+    func.round(ProviderStats.rating_sum * 1.0 / func.nullif(ProviderStats.review_count, 0), 2), 0
+)
+_provider_verified = case((Provider.is_verified == True, 1), else_=0)  # noqa: E712
+
+# Sıralama seçeneği -> [(ifade, azalan mı), ...]. Son anahtar her zaman teklif ID'sidir,
+# böylece sıralama kesin (deterministic) olur ve keyset imleci güvenle kullanılabilir.
+OFFER_SORT_KEYS = {
+    offer_schemas.OfferSort.price: [(Offer.offer_price, False), (Offer.id, False)],
+    offer_schemas.OfferSort.rating: [(_provider_rating, True), (Offer.offer_price, False), (Offer.id, False)],
+    offer_schemas.OfferSort.recommended: [
+        (_provider_verified, True), (_provider_rating, True), (Offer.offer_price, False), (Offer.id, False)
+    ],
+}
+
+# Her sıralamanın imleç değerlerinin beklenen türleri (decode_cursor'a verilir); başka bir
+# sıralamanın veya sahte bir imlecin değerleri sorguya ulaşmadan 400 ile reddedilir.
+_PRICE = (Decimal, int, float)
+_RATING = (int, float, Decimal)
+OFFER_CURSOR_TYPES = {
+    offer_schemas.OfferSort.price: (_PRICE, int),
+    offer_schemas.OfferSort.rating: (_RATING, _PRICE, int),
+    offer_schemas.OfferSort.recommended: (int, _RATING, _PRICE, int),
+}
+
+
+@router.get("/jobs/{job_id}/offers", response_model=List[offer_schemas.RankedOfferResponse],
+            dependencies=[Depends(query_budget(3))])
 async def get_offers_for_job(
     job_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    sort: offer_schemas.OfferSort = offer_schemas.OfferSort.price,
+    status_filter: Optional[OfferStatus] = Query(None, alias="status"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_principal)
 ):
     """
     Giriş yapmış 'customer' (müşteri) rolündeki kullanıcının,
-    KENDİSİNE ait bir ilana gelen tüm teklifleri listelemesini sağlar.
+    KENDİSİNE ait bir ilana gelen teklifleri listelemesini sağlar.
+
+    Her teklif, sağlayıcı profili ve puan özetiyle (ortalama, yorum sayısı) döner.
+    - sort: 'price' (varsayılan), 'rating' veya 'recommended' (onaylı > puan > fiyat).
+    - status: Yalnızca belirtilen durumdaki teklifler (örn. 'pending').
+    - cursor: Bir sonraki sayfa için 'X-Next-Cursor' başlığındaki değer gönderilir.
+
+    Sahiplik kontrolü ve teklifler tek bir SQL ifadesiyle alınır: ilan satırı,
+    teklifler/sağlayıcılar/puan özetleriyle LEFT JOIN edilir.
     """
-    
-    # 1. İlanı (Job) bul
-    job = await db.get(Job, job_id)
-    if not job:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="İlan bulunamadı.")
-        
-    # 2. Güvenlik Kontrolü: İlan, giriş yapan kullanıcıya mı ait?
-    if job.customer_id != current_user.id:
+    sort_keys = OFFER_SORT_KEYS[sort]
+    columns = [column for column, _ in sort_keys]
+    descending = [desc for _, desc in sort_keys]
+
+    # 1. Teklifler ilana LEFT JOIN ile bağlanır; teklif filtresi JOIN koşuluna yazılır.
+    # Böylece hiç teklifi olmayan (veya filtreye uyan teklifi olmayan) ilan için de
+    # sahiplik kontrolü için bir satır döner. Sağlayıcı ve puan özeti de düz LEFT JOIN
+    # ile eklenir (provider_id NOT NULL + yabancı anahtar olduğundan iç birleşimle aynı
+    # sonucu verir). İç içe birleşim '(offers JOIN providers)' bazı planlayıcılarda
+    # (SQLite) teklifler tablosunun tamamının taranmasına yol açıyordu.
+    offer_join = [Offer.job_id == Job.id]
+    if status_filter is not None:
+        offer_join.append(Offer.status == status_filter)
+    # İmleç koşulu puan özetine de bakabildiği için (sort=rating) JOIN'e değil WHERE'e yazılır.
+    after = decode_cursor(cursor, len(columns), OFFER_CURSOR_TYPES[sort]) if cursor else None
+    keyset = keyset_after(columns, after, descending) if after else None
+
+    query = (
+        select(Job.customer_id, Offer, ProviderStats.review_count, _provider_rating.label("provider_rating"))
+        .select_from(Job)
+        .outerjoin(Offer, and_(*offer_join))
+        .outerjoin(Provider, Provider.id == Offer.provider_id)
+        .outerjoin(ProviderStats, ProviderStats.provider_id == Provider.id)
+        .options(contains_eager(Offer.provider))
+        .where(Job.id == job_id)
+        .order_by(*(column.desc() if desc else column.asc() for column, desc in sort_keys))
+        .limit(limit)
+    )
+    if keyset is not None:
+        query = query.where(or_(Offer.id.is_(None), keyset))
+
+    async def build_offers(session: AsyncSession) -> CachedResponse:
+        rows = (await session.execute(query)).all()
+        owner_id = rows[0].customer_id if rows else None
+        if not rows and keyset is not None:
+            # Son sayfadan sonraki imleç: hiçbir teklif imleç koşulunu sağlamadığında ilan
+            # satırı da elenir. Sahiplik kontrolü için ilan ayrıca (birincil anahtarla) okunur.
+            owner_id = (await session.execute(select(Job.customer_id).where(Job.id == job_id))).scalar_one_or_none()
+
+        # 2. İlan bulunamadı
+        if owner_id is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="İlan bulunamadı.")
+
+        # 3. Teklifleri puan özetiyle birlikte hazırla
+        offers = []
+        for row in rows:
+            if row.Offer is None:  # İlanın (filtreye uyan) teklifi yok
+                break
+            offer = row.Offer
+            offer.provider_review_count = row.review_count or 0
+            offer.provider_rating = float(row.provider_rating) if row.review_count else None
+            offers.append(offer)
+
+        headers = {}
+        if len(offers) == limit:
+            last = rows[len(offers) - 1]
+            key_values = {
+                offer_schemas.OfferSort.price: [last.Offer.offer_price],
+                offer_schemas.OfferSort.rating: [last.provider_rating, last.Offer.offer_price],
+                offer_schemas.OfferSort.recommended: [
+                    int(bool(last.Offer.provider.is_verified)), last.provider_rating, last.Offer.offer_price
+                ],
+            }[sort]
+            headers[NEXT_CURSOR_HEADER] = encode_cursor(*key_values, last.Offer.id)
+
+        # Teklif ve puan özeti tablolarında sürüm sütunu olmadığından ETag gövdeden üretilir:
+        # veritabanı işi azalmaz ama değişmeyen liste için gövde yeniden gönderilmez.
+        body = list_adapter(offer_schemas.RankedOfferResponse).dump_json(
+            validate_list(offer_schemas.RankedOfferResponse, offers)
+        )
+        headers.update(validator_headers(make_etag(body), OFFERS_CACHE_CONTROL))
+        return CachedResponse(
+            body,
+            headers,
+            # İlan sahibi değişmez; önbellekten sunarken sahiplik bu değerle kontrol edilir.
+            meta={"owner_id": owner_id},
+            # Sağlayıcının puanı değişince (yeni değerlendirme) bu liste de geçersiz olur.
+            tags=[provider_tag(offer.provider_id) for offer in offers],
+        )
+
+    # Yanıt önbelleği (teklif eklenince/kabul/ret edilince geçersiz kılınır).
+    cache_status = None
+    if response_cache.usable_for(request):
+        entry, cache_status = await response_cache.fetch(cache_key(request), [job_offers_tag(job_id)], build_offers, request)
+    else:
+        entry = await build_offers(db)
+
+    # 4. Güvenlik Kontrolü: İlan, giriş yapan kullanıcıya mı ait?
+    if entry.meta["owner_id"] != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Yalnızca kendi ilanınıza gelen teklifleri görebilirsiniz."
         )
-        
-    # 3. İlana ait teklifleri, provider bilgileriyle birlikte çek
-    query = (
-        select(Offer)
-        .options(joinedload(Offer.provider))
-        .where(Offer.job_id == job_id)
-        .order_by(Offer.offer_price.asc()) # En düşük tekliften sırala
-    )
-    
-    result = await db.execute(query)
-    offers = result.scalars().all()
-    
-    return offers
 
-@router.patch("/offers/{offer_id}/accept", response_model=offer_schemas.OfferResponse)
+    return entry.respond(request, cache_status)
+
+@router.patch("/offers/{offer_id}/accept", response_model=offer_schemas.OfferResponse,
+              dependencies=[Depends(query_budget(9))])
 async def accept_offer(
     offer_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_principal)
 ):
     """
     Müşterinin, kendi ilanına gelen bir teklifi kabul etmesini sağlar.
     Teklif kabul edildiğinde, ilanın durumu 'assigned' olur ve diğer tüm bekleyen teklifler reddedilir.
     Sadece ilanın sahibi (customer) tarafından çağrılabilir.
+
+    Kabul işlemi atomik bir durum geçişidir: ilan satırı kilitlenir (SELECT ... FOR UPDATE),
+    ilan 'open' -> 'assigned' koşullu olarak güncellenir ve diğer bekleyen teklifler
+    tek bir toplu UPDATE ile reddedilir. Aynı anda gelen iki kabulden yalnızca biri başarılı olur.
     """
     # 1. Sadece 'customer' rolündekiler teklif kabul edebilir/reddedebilir
     if current_user.role.role_name.value != 'customer':
@@ -153,26 +323,35 @@ async def accept_offer(
             detail="Yalnızca 'customer' rolündeki kullanıcılar teklifleri yönetebilir."
         )
 
-    # 2. Teklifi ve ilişkili ilanı bul
-    offer = await db.get(Offer, offer_id, options=[joinedload(Offer.job)])
-    if not offer:
+    # 2. Teklifin ait olduğu ilanı bul
+    job_id = (await db.execute(select(Offer.job_id).where(Offer.id == offer_id))).scalar_one_or_none()
+    if job_id is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teklif bulunamadı.")
-    
-    job = offer.job
+
+    # 3. İlan satırını kilitle. Aynı ilan için eşzamanlı kabul istekleri burada sıraya girer.
+    job = (await db.execute(select(Job).where(Job.id == job_id).with_for_update())).scalar_one_or_none()
     if not job: # Bu durum normalde olmamalı, çünkü offer'ın job_id'si var.
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Teklifin ilişkili olduğu ilan bulunamadı.")
 
-    # 3. Güvenlik Kontrolü: İlan, giriş yapan kullanıcıya mı ait?
+    # 4. Güvenlik Kontrolü: İlan, giriş yapan kullanıcıya mı ait?
     if job.customer_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Yalnızca kendi ilanınızdaki teklifleri yönetebilirsiniz."
         )
 
-    # 4. Teklifin ve ilanın durumunu kontrol et
-    if offer.status != offer.status.pending:
+    # 5. Teklifi kilit altında (en güncel haliyle) sağlayıcı bilgisiyle birlikte oku
+    offer = (await db.execute(
+        select(Offer)
+        .options(joinedload(Offer.provider))
+        .where(Offer.id == offer_id)
+        .with_for_update(of=Offer)
+        .execution_options(populate_existing=True)
+    )).scalar_one()
+
+    # 6. Teklifin ve ilanın durumunu kontrol et
+    if offer.status != OfferStatus.pending:
         raise HTTPException(
-        raise HTTPException( # offer.status.pending yerine OfferStatus.pending kullanılmalı
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Bu teklif '{offer.status.value}' durumunda. Yalnızca 'pending' durumundaki teklifler kabul edilebilir."
         )
@@ -183,26 +362,43 @@ async def accept_offer(
             detail=f"Bu ilan '{job.status.value}' durumunda. Yalnızca 'open' durumundaki ilanlara teklif kabul edilebilir."
         )
 
-    # 5. Teklifi kabul et ve ilanı ata
-    offer.status = offer.status.accepted
-    offer.status = OfferStatus.accepted # offer.status.accepted yerine OfferStatus.accepted kullanılmalı
-    job.status = JobStatus.assigned
-
-    # 6. Aynı ilana ait diğer tüm bekleyen teklifleri reddet
-    other_pending_offers_query = select(Offer).where(
-        Offer.job_id == job.id,
-        Offer.id != offer_id,
-        Offer.status == offer.status.pending
-        Offer.status == OfferStatus.pending # offer.status.pending yerine OfferStatus.pending kullanılmalı
+    # 7. İlanı koşullu olarak ata ('open' -> 'assigned'). Satır kilidi desteklenmeyen
+    # veritabanlarında da yalnızca bir işlem bu geçişi yapabilir.
+    assigned = await db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.status == JobStatus.open)
+        .values(status=JobStatus.assigned)
+        .execution_options(synchronize_session=False)
     )
-    other_pending_offers_result = await db.execute(other_pending_offers_query)
-    other_pending_offers = other_pending_offers_result.scalars().all()
+    if assigned.rowcount != 1:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Bu ilan için başka bir teklif az önce kabul edildi."
+        )
+    # Durum yukarıdaki UPDATE ile yazıldı; nesne kirli işaretlenmesin (commit'te ikinci UPDATE olmasın).
+    set_committed_value(job, "status", JobStatus.assigned)
+    offer.status = OfferStatus.accepted
 
-    for other_offer in other_pending_offers:
-        other_offer.status = offer.status.rejected
+    # 8. Aynı ilana ait diğer tüm bekleyen teklifleri tek bir toplu UPDATE ile reddet
+    await db.execute(
+        update(Offer)
+        .where(
+            Offer.job_id == job.id,
+            Offer.status == OfferStatus.pending,
+            Offer.id != offer_id
+        )
+        .values(status=OfferStatus.rejected)
+        .execution_options(synchronize_session=False)
+    )
 
     await db.commit()
-    await db.refresh(offer, attribute_names=["provider", "job"])
+
+    # İlan artık açık değil; sağlayıcı eşleştirme ve arama indekslerinden çıkar.
+    open_job_index.remove(job.id)
+    search_backend.remove_job(job.id)
+    # İlan detayı, ilan listeleri ve teklif listesi değişti.
+    await response_cache.invalidate(job_tag(job.id), JOBS_LIST_TAG, job_offers_tag(job.id))
     
     return offer
 
@@ -210,7 +406,7 @@ async def accept_offer(
 async def reject_offer(
     offer_id: int,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_principal)
 ):
     """
     Müşterinin, kendi ilanına gelen bir teklifi reddetmesini sağlar.
@@ -241,17 +437,24 @@ async def reject_offer(
         )
 
     # 4. Teklifi reddet
-    previous_offer_status = offer.status # Durum değişikliği öncesi kontrol için sakla
-    offer.status = offer.status.rejected
     previous_offer_status = offer.status # Durum değişikliği öncesi kontrol için sakla (OfferStatus enum değeri)
-    offer.status = OfferStatus.rejected # offer.status.rejected yerine OfferStatus.rejected kullanılmalı
+    offer.status = OfferStatus.rejected
 
     # 5. Eğer bu teklif daha önce kabul edilmişse, ilanın durumunu 'open' olarak geri çevir
-    if previous_offer_status == offer.status.accepted and job.status == JobStatus.assigned:
+    invalidated_tags = [job_offers_tag(job.id)]
+    reopened = False
     if previous_offer_status == OfferStatus.accepted and job.status == JobStatus.assigned: # offer.status.accepted yerine OfferStatus.accepted kullanılmalı
         job.status = JobStatus.open
+        reopened = True
+        invalidated_tags += [job_tag(job.id), JOBS_LIST_TAG]
 
     await db.commit()
+    if reopened:
+        # İlan bu istekle yeniden açıldı; aktifse eşleştirme ve arama indekslerine geri ekle.
+        open_job_index.apply(job.id, job.service_id, job.district_id, job.created_at, job.status, job.is_active)
+        if job.is_active:
+            search_backend.index_job(job.id, job.title, job.description)
+    await response_cache.invalidate(*invalidated_tags)
     await db.refresh(offer, attribute_names=["provider", "job"])
     
     return offer
@@ -0,0 +1,113 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from typing import List, Tuple
+
+# Proje içi importlar
+from ..database import get_db, get_read_db
+from ..models.user import User
+from ..models.provider_models import Provider, ProviderSubscription
+from ..schemas.provider_schema import ProviderSubscriptionResponse, ProviderSubscriptionUpdate
+from ..reference_data import reference_data
+from ..query_stats import query_budget
+from .auth import get_current_principal
+from .offers_router import ensure_provider_profile
+
+router = APIRouter(
+    prefix="/api/v1/providers",
+    tags=["Providers (Sağlayıcılar)"]
+)
+
+# Bir sağlayıcının abone olabileceği en fazla (hizmet, ilçe) çifti sayısı.
+MAX_SUBSCRIPTION_PAIRS = 1000
+
+
+def _require_provider(current_user: User) -> None:
+    if current_user.role.role_name.value != 'provider':
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Yalnızca 'provider' rolündeki kullanıcılar ilan aboneliklerini yönetebilir."
+        )
+
+
+async def subscription_pairs(db: AsyncSession, user_id: int) -> List[Tuple[int, int]]:
+    """Sağlayıcının (kullanıcı id'si ile) abone olduğu (service_id, district_id) çiftlerini döndürür."""
+    result = await db.execute(
+        select(ProviderSubscription.service_id, ProviderSubscription.district_id)
+        .join(Provider, Provider.id == ProviderSubscription.provider_id)
+        .where(Provider.user_id == user_id)
+    )
+    return [(service_id, district_id) for service_id, district_id in result.all()]
+
+
+def _subscription_response(pairs) -> dict:
+    return {
+        "service_ids": sorted({service_id for service_id, _ in pairs}),
+        "district_ids": sorted({district_id for _, district_id in pairs}),
+    }
+
+
+@router.get("/me/subscriptions", response_model=ProviderSubscriptionResponse,
+            dependencies=[Depends(query_budget(2))])
+async def get_my_subscriptions(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_principal)
+):
+    """Giriş yapan sağlayıcının ilan aboneliğini (hizmetler ve ilçeler) döndürür."""
+    _require_provider(current_user)
+    return _subscription_response(await subscription_pairs(db, current_user.id))
+
+
+@router.put("/me/subscriptions", response_model=ProviderSubscriptionResponse,
+            dependencies=[Depends(query_budget(4))])
+async def replace_my_subscriptions(
+    subscription: ProviderSubscriptionUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_principal)
+):
+    """
+    Giriş yapan sağlayıcının ilan aboneliğini değiştirir. Listelenen hizmetlerin
+    listelenen ilçelerdeki açık ilanları GET /api/v1/jobs/for-me akışında gösterilir.
+    Boş listeler aboneliği kaldırır.
+    """
+    _require_provider(current_user)
+    service_ids = sorted(set(subscription.service_ids))
+    district_ids = sorted(set(subscription.district_ids))
+    if len(service_ids) * len(district_ids) > MAX_SUBSCRIPTION_PAIRS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"En fazla {MAX_SUBSCRIPTION_PAIRS} (hizmet, ilçe) çiftine abone olunabilir."
+        )
+
+    # Hizmet ve ilçe ID'lerini referans veri deposundan doğrula (sorgu yok).
+    await reference_data.ensure(db, service_ids, district_ids)
+    missing_services = [i for i in service_ids if not reference_data.service(i)]
+    if missing_services:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"ID'si {missing_services[0]} olan bir hizmet bulunamadı."
+        )
+    missing_districts = [i for i in district_ids if not reference_data.district(i)]
+    if missing_districts:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"ID'si {missing_districts[0]} olan bir ilçe bulunamadı."
+        )
+
+    provider_id = (await db.execute(
+        select(Provider.id).where(Provider.user_id == current_user.id)
+    )).scalar_one_or_none()
+    if provider_id is None:
+        provider_id = (await ensure_provider_profile(db, current_user.id)).id
+
+    # Abonelik bütünüyle değiştirilir: eski çiftler silinir, yenileri tek ifadeyle eklenir.
+    await db.execute(delete(ProviderSubscription).where(ProviderSubscription.provider_id == provider_id))
+    pairs = [(service_id, district_id) for service_id in service_ids for district_id in district_ids]
+    if pairs:
+        await db.execute(insert(ProviderSubscription), [
+            {"provider_id": provider_id, "service_id": service_id, "district_id": district_id}
+            for service_id, district_id in pairs
+        ])
+    await db.commit()
+    return _subscription_response(pairs)
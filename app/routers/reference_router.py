@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Proje içi importlar
+from ..database import get_db
+from ..http_cache import cached_json_response
+from ..reference_data import reference_data
+
+router = APIRouter(
+    prefix="/api/v1",
+    tags=["Reference Data (Referans Veriler)"]
+)
+
+# Referans veriler nadiren değiştiği için istemci ve ara sunucular kısa süre önbellekleyebilir.
+# Süre dolduğunda istemci If-None-Match ile sorar; değişiklik yoksa 304 döner.
+REFERENCE_CACHE_CONTROL = "public, max-age=300"
+
+
+async def _reference_response(name: str, request: Request, db: AsyncSession):
+    # Depo henüz yüklenmemişse (örn. başlangıçta veritabanı erişilemediyse) şimdi yükle.
+    await reference_data.ensure(db)
+    payload, etag = reference_data.payload(name)
+    return cached_json_response(request, payload, etag, REFERENCE_CACHE_CONTROL)
+
+
+@router.get("/roles")
+async def get_roles(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Sistemdeki rolleri listeler (bellekteki referans veri deposundan).
+    """
+    return await _reference_response("roles", request, db)
+
+
+@router.get("/categories")
+async def get_categories(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Kategorileri, bağlı hizmetleriyle birlikte listeler (bellekteki referans veri deposundan).
+    """
+    return await _reference_response("categories", request, db)
+
+
+@router.get("/services")
+async def get_services(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Hizmetleri listeler (bellekteki referans veri deposundan).
+    """
+    return await _reference_response("services", request, db)
+
+
+@router.get("/districts")
+async def get_districts(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    İlçeleri şehir bilgisiyle birlikte listeler (bellekteki referans veri deposundan).
+    """
+    return await _reference_response("districts", request, db)
@@ -1,29 +1,80 @@
-    
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from pydantic import TypeAdapter
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import joinedload
-from typing import List
+from datetime import datetime
+from typing import Optional
 
 # Proje içi importlar
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models.user import User
-from ..models.job_models import Job, Offer, JobStatus
+from ..models.job_models import Job, Offer, JobStatus, OfferStatus
+from ..models.provider_models import Provider, ProviderStats
 from ..models.review_models import Review # Review modelini import et
-from ..schemas import review_schema
-from .auth import get_current_user
+from ..schemas import review_schemas
+from ..pagination import decode_cursor, keyset_after, next_cursor, NEXT_CURSOR_HEADER
+from ..serialization import validate_list
+from ..response_cache import CachedResponse, cache_key, provider_tag, response_cache, user_tag
+from ..query_stats import query_budget
+from .auth import get_current_principal
 
-reviews_router = APIRouter(
+router = APIRouter(
     prefix="/api/v1",
     tags=["Reviews (Değerlendirmeler)"]
 )
 
-@reviews_router.post("/jobs/{job_id}/reviews", response_model=review_schema.Review, status_code=status.HTTP_201_CREATED)
+
+async def record_review_in_stats(db: AsyncSession, provider_id: int, rating: int) -> None:
+    """
+    Sağlayıcının puan özetini (adet, toplam, 1-5 histogramı) tek bir upsert
+    ifadesiyle artırır. Çağıranın işlemi (transaction) içinde çalışır; böylece
+    değerlendirme ve özet birlikte commit edilir ya da birlikte geri alınır.
+    """
+    values = {
+        "provider_id": provider_id,
+        "review_count": 1,
+        "rating_sum": rating,
+        **{f"rating_{i}": int(i == rating) for i in range(1, 6)},
+    }
+    increments = {
+        "review_count": ProviderStats.review_count + 1,
+        "rating_sum": ProviderStats.rating_sum + rating,
+        f"rating_{rating}": getattr(ProviderStats, f"rating_{rating}") + 1,
+    }
+
+    dialect = db.bind.dialect.name
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        stmt = mysql_insert(ProviderStats).values(**values).on_duplicate_key_update(**increments)
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        stmt = pg_insert(ProviderStats).values(**values).on_conflict_do_update(
+            index_elements=["provider_id"], set_=increments
+        )
+    else:
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        stmt = sqlite_insert(ProviderStats).values(**values).on_conflict_do_update(
+            index_elements=["provider_id"], set_=increments
+        )
+    await db.execute(stmt)
+
+
+def _already_reviewed() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Bu ilan için zaten bir yorum yapılmış."
+    )
+
+
+@router.post("/jobs/{job_id}/reviews", response_model=review_schemas.ReviewResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=[Depends(query_budget(7))])
 async def create_review_for_job(
     job_id: int,
-    review_data: review_schema.ReviewCreate,
+    review_data: review_schemas.ReviewCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_principal)
 ):
     """
     Müşterinin, tamamlanmış bir iş (job) için hizmet sağlayıcıya (provider) yorum ve puan bırakmasını sağlar.
@@ -36,8 +87,8 @@ async def create_review_for_job(
             detail="Yalnızca 'customer' rolündeki kullanıcılar yorum yapabilir."
         )
 
-    # 2. İlanı (Job) bul ve ilişkili teklifi (accepted olanı) yükle
-    job = await db.get(Job, job_id, options=[joinedload(Job.offers)])
+    # 2. İlanı (Job) bul
+    job = await db.get(Job, job_id)
     if not job:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="İlan bulunamadı.")
 
@@ -55,25 +106,108 @@ async def create_review_for_job(
             detail=f"Bu ilan '{job.status.value}' durumunda. Yalnızca 'completed' durumundaki ilanlara yorum yapılabilir."
         )
 
-    # 5. İlan için daha önce yorum yapılmış mı kontrol et
+    # 5. Yorumlanacak sağlayıcı, ilanda kabul edilmiş teklifin sahibidir (yalnızca o teklif okunur).
+    provider_id = (await db.execute(
+        select(Offer.provider_id)
+        .where(Offer.job_id == job_id, Offer.status == OfferStatus.accepted)
+        .limit(1)
+    )).scalar_one_or_none()
+    if provider_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Bu ilanda kabul edilmiş bir teklif bulunmuyor."
+        )
+
+    # 6. İlan için daha önce yorum yapılmış mı kontrol et
     existing_review = (await db.execute(
         select(Review).where(Review.job_id == job_id)
     )).scalar_one_or_none()
 
     if existing_review:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Bu ilan için zaten bir yorum yapılmış."
-        )
+        raise _already_reviewed()
 
-    # 6. Yeni yorumu oluştur
+    # 7. Yeni yorumu oluştur ve sağlayıcının puan özetini aynı işlemde güncelle
     new_review = Review(
         **review_data.model_dump(),
         job_id=job_id,
+        provider_id=provider_id,
         customer_id=current_user.id # Yorumu yapan müşteri
     )
     db.add(new_review)
-    await db.commit()
+    try:
+        await db.flush()
+        await record_review_in_stats(db, provider_id, review_data.rating)
+        await db.commit()
+    except IntegrityError:
+        # Eşzamanlı ikinci yorum, kontrolden sonra reviews.job_id benzersiz anahtarına takılır.
+        await db.rollback()
+        raise _already_reviewed()
     await db.refresh(new_review)
 
-    return new_review
\ No newline at end of file
+    # Sağlayıcının puanı değişti: değerlendirme listesi ve sağlayıcının yer aldığı teklif listeleri.
+    await response_cache.invalidate(provider_tag(provider_id))
+
+    return new_review
+
+
+# Sayfa yanıtı derlenmiş adaptörle doğrudan JSON'a serileştirilir.
+_reviews_page_adapter = TypeAdapter(review_schemas.ProviderReviewsResponse)
+
+
+@router.get("/providers/{provider_id}/reviews", response_model=review_schemas.ProviderReviewsResponse,
+            dependencies=[Depends(query_budget(3))])
+async def get_provider_reviews(
+    provider_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None
+):
+    """
+    Sağlayıcının puan özetini (adet, ortalama, 1-5 dağılımı) ve değerlendirmelerini
+    en yeniden eskiye listeler. Değerlendirmeyi yapan müşteri bilgisi aynı sorguda yüklenir.
+    Bir sonraki sayfa için 'X-Next-Cursor' başlığındaki değer 'cursor' olarak gönderilir.
+    """
+    after = decode_cursor(cursor, 2, (datetime, int)) if cursor else None
+
+    async def build_page(session: AsyncSession) -> CachedResponse:
+        # 1. Puan özetini al. Özet yoksa sağlayıcının varlığını kontrol et (henüz yorumu olmayabilir).
+        stats = await session.get(ProviderStats, provider_id)
+        if stats is None:
+            if await session.get(Provider, provider_id) is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sağlayıcı bulunamadı.")
+            summary = review_schemas.ProviderRatingSummary(provider_id=provider_id)
+        else:
+            summary = review_schemas.ProviderRatingSummary.model_validate(stats)
+
+        # 2. Değerlendirmeleri, müşteri bilgisiyle birlikte tek sorguda getir (keyset sayfalama).
+        query = (
+            select(Review)
+            .options(joinedload(Review.customer))
+            .where(Review.provider_id == provider_id)
+            .order_by(Review.created_at.desc(), Review.id.desc())
+            .limit(limit)
+        )
+        if after:
+            query = query.where(keyset_after([Review.created_at, Review.id], after, [True, True]))
+        reviews = (await session.execute(query)).scalars().all()
+
+        headers = {}
+        cursor_value = next_cursor(reviews, limit, "created_at", "id")
+        if cursor_value:
+            headers[NEXT_CURSOR_HEADER] = cursor_value
+
+        page = review_schemas.ProviderReviewsResponse.model_construct(
+            summary=summary,
+            reviews=validate_list(review_schemas.ReviewForProviderResponse, reviews),
+        )
+        return CachedResponse(
+            _reviews_page_adapter.dump_json(page), headers,
+            tags=[user_tag(customer_id) for customer_id in {review.customer_id for review in reviews}],
+        )
+
+    # Yanıt önbelleği (sağlayıcıya yeni değerlendirme gelince geçersiz kılınır).
+    if response_cache.usable_for(request):
+        entry, cache_status = await response_cache.fetch(cache_key(request), [provider_tag(provider_id)], build_page, request)
+        return entry.respond(request, cache_status)
+    return (await build_page(db)).respond(request)
@@ -0,0 +1,52 @@
+from pydantic import BaseModel, EmailStr, Field, model_validator
+from typing import List, Optional
+
+from .category_schema import ServiceCreate
+from .job_schemas import JobBase
+from ..models.user import RoleName
+
+# Toplu içe aktarma satırları. CSV'deki boş hücreler alan hiç gönderilmemiş sayılır.
+
+# İlan satırı: müşteri ID'si veya e-postası ile belirtilir.
+class JobImportRow(JobBase):
+    customer_id: Optional[int] = Field(None, description="İlanı açan müşterinin ID'si")
+    customer_email: Optional[EmailStr] = Field(None, description="İlanı açan müşterinin e-postası (ID yerine)")
+
+    @model_validator(mode="after")
+    def _customer_given(self):
+        if self.customer_id is None and self.customer_email is None:
+            raise ValueError("'customer_id' veya 'customer_email' gönderilmelidir.")
+        return self
+
+# Kullanıcı satırı: parola düz metin gelir ve içe aktarma sırasında hashlenir.
+class UserImportRow(BaseModel):
+    email: EmailStr
+    password: str = Field(..., min_length=6)
+    first_name: str = Field(..., min_length=1, max_length=100)
+    last_name: str = Field(..., min_length=1, max_length=100)
+    role_name: RoleName = RoleName.customer
+    phone_number: Optional[str] = Field(None, max_length=20)
+    is_active: bool = True
+
+    @model_validator(mode="after")
+    def _no_admin(self):
+        if self.role_name == RoleName.admin:
+            raise ValueError("Toplu içe aktarma ile admin kullanıcısı oluşturulamaz.")
+        return self
+
+# Hizmet satırı
+class ServiceImportRow(ServiceCreate):
+    pass
+
+# Satır bazında hata raporu. 'row', verinin (başlık hariç) 1'den başlayan sıra numarasıdır.
+class ImportRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+class ImportReport(BaseModel):
+    total_rows: int = 0
+    inserted: int = 0
+    failed: int = 0
+    dry_run: bool = False
+    errors: List[ImportRowError] = []
+    errors_truncated: bool = Field(False, description="Hata listesi sınıra ulaştığı için kısaltıldıysa True")
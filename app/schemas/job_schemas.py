@@ -39,3 +39,34 @@ class Job(JobBase):
     class Config:
         from_attributes = True
 
+# İlan detayı ve oluşturma yanıtı (müşteri özetiyle birlikte).
+class JobResponse(JobBase):
+    id: int
+    customer_id: int
+    status: JobStatus
+    is_active: bool
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    customer: UserSimple
+
+    class Config:
+        from_attributes = True
+
+# İlan listeleme yanıtı (hizmet ve ilçe bilgisiyle birlikte).
+class JobListResponse(BaseModel):
+    id: int
+    title: str
+    description: str
+    service_id: int
+    district_id: int
+    status: JobStatus
+    created_at: datetime
+    service: Service
+    district: District
+
+    class Config:
+        from_attributes = True
+
+# Arama sonucu; metin sorgusu varsa ilgi skoru da döner.
+class JobSearchResult(JobListResponse):
+    score: Optional[float] = None
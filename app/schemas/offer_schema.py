@@ -1,15 +1,17 @@
+import enum
 from pydantic import BaseModel
 from typing import Optional
 from decimal import Decimal
 from ..models.job_models import OfferStatus
+from .provider_schema import Provider
 
 class OfferBase(BaseModel):
     offer_price: Decimal
     message: Optional[str] = None
 
+# İlan ID'si URL'den, sağlayıcı ise giriş yapan kullanıcıdan alınır.
 class OfferCreate(OfferBase):
-    job_id: int
-    provider_id: int
+    pass
 
 class OfferUpdate(BaseModel):
     status: OfferStatus
@@ -22,3 +24,21 @@ class Offer(OfferBase):
 
     class Config:
         from_attributes = True
+
+# Teklif yanıtı (teklifi veren sağlayıcının profiliyle birlikte).
+class OfferResponse(Offer):
+    provider: Provider
+
+    class Config:
+        from_attributes = True
+
+# Bir ilana gelen tekliflerin sıralama seçenekleri.
+class OfferSort(str, enum.Enum):
+    price = "price"              # En düşük fiyat önce
+    rating = "rating"            # En yüksek sağlayıcı puanı önce, eşitlikte düşük fiyat
+    recommended = "recommended"  # Önce onaylı sağlayıcılar, sonra puan, sonra fiyat
+
+# Müşterinin ilan teklifleri listesinde, sağlayıcının puan özetiyle birlikte dönen teklif.
+class RankedOfferResponse(OfferResponse):
+    provider_rating: Optional[float] = None
+    provider_review_count: int = 0
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 class ProviderBase(BaseModel):
     business_name: Optional[str] = None
@@ -15,3 +15,13 @@ class Provider(ProviderBase):
 
     class Config:
         from_attributes = True
+
+# Sağlayıcının ilan aboneliği: listelenen hizmetlerin listelenen ilçelerdeki ilanları
+# (hizmetler x ilçeler) "bana uygun ilanlar" akışında gösterilir.
+class ProviderSubscriptionUpdate(BaseModel):
+    service_ids: List[int] = Field(default_factory=list, max_length=100)
+    district_ids: List[int] = Field(default_factory=list, max_length=100)
+
+class ProviderSubscriptionResponse(BaseModel):
+    service_ids: List[int]
+    district_ids: List[int]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 
 # Temel Kullanıcı Bilgisi (Değerlendirmeyi yapanı göstermek için)
@@ -41,7 +41,7 @@ class ReviewForProviderResponse(BaseModel):
     class Config:
         from_attributes = True
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, Optional
 from datetime import datetime
 
 # Temel Kullanıcı Bilgisi (Değerlendirmeyi yapanı göstermek için)
@@ -81,4 +81,19 @@ class ReviewForProviderResponse(BaseModel):
     customer: ReviewerInfo # Değerlendirmeyi yapan müşteri bilgisi
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Bir sağlayıcının puan özeti (provider_stats tablosundan).
+class ProviderRatingSummary(BaseModel):
+    provider_id: int
+    review_count: int = 0
+    average_rating: Optional[float] = None
+    histogram: Dict[int, int] = Field(default_factory=lambda: {i: 0 for i in range(1, 6)})
+
+    class Config:
+        from_attributes = True
+
+# Sağlayıcı değerlendirme sayfası: puan özeti + değerlendirmeler.
+class ProviderReviewsResponse(BaseModel):
+    summary: ProviderRatingSummary
+    reviews: list[ReviewForProviderResponse]
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, EmailStr
+from typing import Optional
 from ..models.user import RoleName
 
 # Kullanıcı oluşturmak için kullanılacak Pydantic modeli.
@@ -21,6 +22,24 @@ class UserResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# Rol referans verisi yanıtı.
+class RoleResponse(BaseModel):
+    id: int
+    role_name: RoleName
+    description: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+# İlan ve benzeri yanıtlarda kullanıcıyı özet olarak göstermek için kullanılan model.
+class UserSimple(BaseModel):
+    id: int
+    first_name: str
+    last_name: str
+
+    class Config:
+        from_attributes = True
+
 # JWT token için Pydantic modeli.
 class Token(BaseModel):
     access_token: str
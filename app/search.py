@@ -0,0 +1,254 @@
+# app/search.py
+
+# Bu dosya, ilan (Job) arama motorunu içerir.
+# - MySQL'de başlık + açıklama üzerindeki FULLTEXT indeksi (MATCH ... AGAINST) kullanılır.
+# - SQLite ve testler için süreç içi (in-process) ters indeks (inverted index) kullanılır.
+# Her iki arka uç da aynı filtreleri uygular ve sonuçları tek bir sorguda döndürür.
+# Kategori ve şehir filtreleri referans veri deposundan ID listesine çevrilir;
+# hizmet ve ilçe bilgileri de yanıt oluşturulurken depodan eklenir (JOIN yok).
+
+import math
+import re
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from .config import settings
+from .database import engine
+from .models.job_models import Job, JobStatus
+from .reference_data import reference_data
+from .pagination import keyset_after
+from .text_utils import turkish_fold, turkish_lower
+
+# "auto": MySQL'de fulltext, diğer veritabanlarında bellek içi indeks.
+SEARCH_BACKEND = settings.search_backend
+
+# ----------------------------------------------------------------------
+# Kelimelere ayırma (tokenization)
+# ----------------------------------------------------------------------
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Metni katlanmış (folded) kelimelere ayırır. Tek harfli kelimeler atlanır."""
+    return [token for token in _TOKEN_RE.findall(turkish_fold(text)) if len(token) > 1]
+
+
+# ----------------------------------------------------------------------
+# Arama filtreleri
+# ----------------------------------------------------------------------
+@dataclass
+class JobSearchFilters:
+    service_id: Optional[int] = None
+    category_id: Optional[int] = None
+    district_id: Optional[int] = None
+    city_name: Optional[str] = None
+
+
+def _filtered_jobs_query(filters: JobSearchFilters):
+    """Aktif/açık ilanlar için filtreleri uygulayan temel sorguyu döndürür."""
+    query = select(Job).filter(Job.is_active == True, Job.status == JobStatus.open)
+    if filters.service_id is not None:
+        query = query.filter(Job.service_id == filters.service_id)
+    if filters.district_id is not None:
+        query = query.filter(Job.district_id == filters.district_id)
+    # Kategori ve şehir, referans veri deposundan ID listesine çözülür (JOIN/alt sorgu yok).
+    if filters.category_id is not None:
+        query = query.filter(Job.service_id.in_(reference_data.service_ids_for_category(filters.category_id)))
+    if filters.city_name:
+        query = query.filter(Job.district_id.in_(reference_data.district_ids_for_city(filters.city_name)))
+    return query
+
+
+# ----------------------------------------------------------------------
+# Arama arka uçları
+# ----------------------------------------------------------------------
+class SearchBackend(ABC):
+    """Arama arka uçlarının ortak arayüzü."""
+
+    async def search(
+        self,
+        db: AsyncSession,
+        filters: JobSearchFilters,
+        q: Optional[str],
+        limit: int,
+        after: Optional[list] = None,
+    ) -> List[Tuple[Job, Optional[float]]]:
+        """(ilan, skor) çiftlerini ilgiye göre sıralı döndürür."""
+        if not q or not tokenize(q):
+            return await self._recent(db, filters, limit, after)
+        return await self._ranked(db, filters, q, limit, after)
+
+    async def _recent(self, db, filters, limit, after) -> List[Tuple[Job, Optional[float]]]:
+        # Metin sorgusu yoksa en yeni ilanlar (created_at, id) keyset ile listelenir.
+        query = _filtered_jobs_query(filters).order_by(Job.created_at.desc(), Job.id.desc()).limit(limit)
+        if after:
+            query = query.filter(keyset_after([Job.created_at, Job.id], after, [True, True]))
+        result = await db.execute(query)
+        return [(job, None) for job in result.scalars().all()]
+
+    @abstractmethod
+    async def _ranked(self, db, filters, q, limit, after) -> List[Tuple[Job, Optional[float]]]:
+        """Metin sorgusuyla eşleşen ilanları (ilan, skor) çiftleri olarak skor sırasıyla döndürür."""
+
+    # Bellekte kendi indeksini tutan arka uçlar True döner (toplu eklemelerden
+    # sonra yeni ilanların indekslenmesi gerekir; bkz. index_jobs_after).
+    maintains_index = False
+
+    # İndeks bakım kancaları; veritabanı tabanlı arka uçlarda bir şey yapmaz. Yalnızca
+    # aktif ve açık ilanlar indekslenir: ilan atanınca, tamamlanınca veya iptal edilince
+    # remove_job, yeniden açılınca index_job çağrılır.
+    def index_job(self, job_id: int, title: str, description: str) -> None:
+        pass
+
+    async def index_jobs_after(self, db: AsyncSession, last_id: int) -> None:
+        """ID'si last_id'den büyük ilanları indeksler (toplu içe aktarma sonrası)."""
+        pass
+
+    def remove_job(self, job_id: int) -> None:
+        pass
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        pass
+
+
+class MySQLFulltextBackend(SearchBackend):
+    """MySQL FULLTEXT (title, description) indeksi üzerinden ilgi sıralı arama."""
+
+    async def _ranked(self, db, filters, q, limit, after):
+        from sqlalchemy.dialects.mysql import match
+
+        score = match(Job.title, Job.description, against=turkish_lower(q)).in_natural_language_mode()
+        query = (
+            _filtered_jobs_query(filters)
+            .add_columns(score.label("score"))
+            .filter(score > 0)
+            .order_by(score.desc(), Job.id.desc())
+            .limit(limit)
+        )
+        if after:
+            query = query.filter(keyset_after([score, Job.id], after, [True, True]))
+        result = await db.execute(query)
+        return [(row[0], float(row[1])) for row in result.all()]
+
+
+class InvertedIndexBackend(SearchBackend):
+    """Testler ve SQLite için süreç içi ters indeks (BM25 skorlaması)."""
+
+    k1 = 1.2
+    b = 0.75
+    maintains_index = True
+
+    def __init__(self):
+        # kelime -> {job_id: kelime frekansı}
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        # job_id -> (belge uzunluğu, benzersiz kelimeler)
+        self._documents: Dict[int, Tuple[int, Tuple[str, ...]]] = {}
+        self._total_length = 0
+
+    def index_job(self, job_id: int, title: str, description: str) -> None:
+        self.remove_job(job_id)
+        tokens = tokenize(f"{title} {description}")
+        frequencies: Dict[str, int] = defaultdict(int)
+        for token in tokens:
+            frequencies[token] += 1
+        for token, tf in frequencies.items():
+            self._postings[token][job_id] = tf
+        self._documents[job_id] = (len(tokens), tuple(frequencies))
+        self._total_length += len(tokens)
+
+    def remove_job(self, job_id: int) -> None:
+        document = self._documents.pop(job_id, None)
+        if document is None:
+            return
+        length, terms = document
+        self._total_length -= length
+        for token in terms:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(job_id, None)
+                if not postings:
+                    del self._postings[token]
+
+    async def index_jobs_after(self, db: AsyncSession, last_id: int) -> None:
+        result = await db.execute(
+            select(Job.id, Job.title, Job.description)
+            .filter(Job.id > last_id, Job.is_active == True, Job.status == JobStatus.open)
+        )
+        for job_id, title, description in result.all():
+            self.index_job(job_id, title, description)
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        self._postings.clear()
+        self._documents.clear()
+        self._total_length = 0
+        result = await db.execute(
+            select(Job.id, Job.title, Job.description).filter(Job.is_active == True, Job.status == JobStatus.open)
+        )
+        for job_id, title, description in result.all():
+            self.index_job(job_id, title, description)
+
+    def score(self, q: str) -> Dict[int, float]:
+        """Sorgudaki kelimeler için belge başına BM25 skorlarını hesaplar."""
+        document_count = len(self._documents)
+        if not document_count:
+            return {}
+        average_length = self._total_length / document_count or 1.0
+        scores: Dict[int, float] = defaultdict(float)
+        for token in set(tokenize(q)):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for job_id, tf in postings.items():
+                length = self._documents[job_id][0]
+                norm = tf + self.k1 * (1 - self.b + self.b * length / average_length)
+                scores[job_id] += idf * tf * (self.k1 + 1) / norm
+        return scores
+
+    async def _ranked(self, db, filters, q, limit, after):
+        scores = self.score(q)
+        ranked = sorted(scores.items(), key=lambda item: (item[1], item[0]), reverse=True)
+        if after:
+            after_score, after_id = float(after[0]), int(after[1])
+            ranked = [
+                (job_id, s) for job_id, s in ranked
+                if s < after_score or (s == after_score and job_id < after_id)
+            ]
+        if not ranked:
+            return []
+
+        # Filtreler veritabanında uygulanır. Adaylar skor sırasıyla, sayfa dolana kadar
+        # büyüyen parçalar halinde getirilir; yaygın kelimelerde tüm aday listesi
+        # (posting listesi) tek sorguda okunmaz.
+        page: List[Tuple[Job, float]] = []
+        start, chunk_size = 0, max(2 * limit, 50)
+        while start < len(ranked) and len(page) < limit:
+            chunk = ranked[start:start + chunk_size]
+            result = await db.execute(_filtered_jobs_query(filters).filter(Job.id.in_([job_id for job_id, _ in chunk])))
+            jobs = {job.id: job for job in result.scalars().all()}
+            page.extend((jobs[job_id], s) for job_id, s in chunk if job_id in jobs)
+            start += len(chunk)
+            # Filtre seçiciyse sonraki parçalar büyütülür (sorgu sayısı logaritmik kalır).
+            chunk_size = min(chunk_size * 2, 1000)
+        return page[:limit]
+
+
+def create_search_backend(dialect_name: str) -> SearchBackend:
+    """Ayara ve veritabanı türüne göre uygun arama arka ucunu oluşturur."""
+    kind = SEARCH_BACKEND
+    if kind == "auto":
+        kind = "fulltext" if dialect_name == "mysql" else "memory"
+    if kind == "fulltext":
+        return MySQLFulltextBackend()
+    if kind == "memory":
+        return InvertedIndexBackend()
+    raise ValueError(f"Geçersiz arama arka ucu: '{SEARCH_BACKEND}'.")
+
+
+# Uygulama genelinde kullanılan arama arka ucu.
+search_backend = create_search_backend(engine.dialect.name)
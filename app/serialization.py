@@ -0,0 +1,77 @@
+# app/serialization.py
+
+# Bu dosya, liste uç noktaları için hızlı JSON serileştirme yardımcılarını içerir.
+# FastAPI, response_model verilen bir rotada dönen her nesneyi önce şemaya göre
+# doğrular (from_attributes), sonra Python sözlüklerine çevirir ve en son JSON'a
+# döker. Yüzlerce satırlık listelerde bu, isteğin en pahalı kısmı olur.
+# Burada iki hızlı yol vardır:
+# - Kendi sorgularımızdan gelen, şemaya uygun kurulmuş sözlükler (güvenilir veri)
+#   doğrulama yapılmadan doğrudan orjson ile serileştirilir.
+# - ORM nesneleri ise bir kez derlenen TypeAdapter ile doğrulanıp tek adımda
+#   (pydantic-core ile) JSON baytlarına dökülür.
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import orjson
+from fastapi import Response
+from pydantic import TypeAdapter
+
+# UTC zaman damgaları pydantic ile aynı biçimde ("...Z") yazılır.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+_list_adapters: Dict[Any, TypeAdapter] = {}
+
+
+def list_adapter(schema: Any) -> TypeAdapter:
+    """Şemanın List[...] TypeAdapter'ını bir kez oluşturup önbellekte tutar."""
+    adapter = _list_adapters.get(schema)
+    if adapter is None:
+        adapter = _list_adapters[schema] = TypeAdapter(List[schema])
+    return adapter
+
+
+def json_response(
+    adapter: TypeAdapter,
+    items: Any,
+    headers: Optional[Dict[str, str]] = None,
+    status_code: int = 200,
+) -> Response:
+    """
+    Önceden derlenmiş adaptörle serileştirilmiş JSON yanıtı döndürür.
+    Not: Rota bir Response nesnesi döndürdüğünde FastAPI, 'response: Response'
+    parametresine yazılan başlıkları eklemez; başlıklar burada verilmelidir.
+    """
+    return Response(
+        content=adapter.dump_json(items),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+def validate_list(schema: Any, objects: Iterable[Any]) -> list:
+    """ORM nesnelerini (from_attributes) şema listesine çevirir (tek derlenmiş doğrulayıcı ile)."""
+    return list_adapter(schema).validate_python(list(objects), from_attributes=True)
+
+
+def dump_trusted(content: Any) -> bytes:
+    """Şemaya uygun kurulmuş sözlük/liste içeriğini doğrulamadan orjson ile JSON baytlarına çevirir."""
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def trusted_json_response(
+    content: Any,
+    headers: Optional[Dict[str, str]] = None,
+    status_code: int = 200,
+) -> Response:
+    """
+    Şemaya uygun kurulmuş sözlük/liste içeriğini doğrulamadan orjson ile serileştirir.
+    Yalnızca kendi sorgularımızdan üretilen veriler için kullanılmalıdır.
+    Not: orjson Decimal serileştiremez; bu tür alanlar önce str/float'a çevrilmelidir.
+    """
+    return Response(
+        content=dump_trusted(content),
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
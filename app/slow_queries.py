@@ -0,0 +1,256 @@
+# app/slow_queries.py
+
+# Bu dosya, üretimde açık tutulabilecek hafif bir yavaş sorgu günlüğü içerir
+# (echo=True'nun aksine her ifadeyi loglamaz):
+# - Her ifade parmak izine (query_stats.fingerprint) indirgenir ve parmak izi başına
+#   bellekte kayan özetler tutulur: adet, toplam/en yüksek süre, son N sürenin p95'i, satır sayısı.
+# - Eşiği (SLOW_QUERY_MS) aşan ifadeler, parametre değerleri yerine yalnızca
+#   biçimleriyle (tür/uzunluk) loglanır; kişisel veri loga düşmez.
+# - Yavaş SELECT'lerin bir örnekleminde (SLOW_QUERY_EXPLAIN_SAMPLE_RATE) arka planda,
+#   ayrı bir bağlantıyla EXPLAIN çalıştırılır ve plan parmak izinin özetine eklenir.
+# - Admin uç noktası toplam süreye göre ilk N parmak izini döndürür.
+
+import asyncio
+import contextvars
+import logging
+import random
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+
+import orjson
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import settings
+from .query_stats import add_statement_observer, fingerprint
+
+logger = logging.getLogger(__name__)
+
+# p95 hesabı için parmak izi başına saklanan son süre sayısı.
+DURATION_WINDOW = 256
+# Aynı parmak izi için EXPLAIN en fazla bu sıklıkta (saniye) yeniden çalıştırılır.
+EXPLAIN_INTERVAL_SECONDS = 300.0
+
+# EXPLAIN sorgularının kendileri ölçülmez (yavaşsa kendini tekrar tekrar açıklamasın).
+_explaining: contextvars.ContextVar[bool] = contextvars.ContextVar("slow_query_explaining", default=False)
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """Parametre değerlerini biçimlerine indirger: 42 -> 'int', 'abc' -> 'str(3)'."""
+    if isinstance(parameters, dict):
+        return {key: parameter_shape(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if len(parameters) > 20:
+            return f"{type(parameters).__name__}[{len(parameters)}]"
+        return [parameter_shape(value) for value in parameters]
+    if parameters is None:
+        return "null"
+    if isinstance(parameters, (str, bytes)):
+        return f"{type(parameters).__name__}({len(parameters)})"
+    return type(parameters).__name__
+
+
+class FingerprintStats:
+    """Tek bir parmak izinin özeti."""
+
+    __slots__ = (
+        "fingerprint", "count", "total_time", "max_time", "rows", "slow_count",
+        "durations", "last_seen", "last_slow", "plan", "explained_at",
+    )
+
+    def __init__(self, fingerprint_text: str):
+        self.fingerprint = fingerprint_text
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.rows = 0
+        self.slow_count = 0
+        self.durations: Deque[float] = deque(maxlen=DURATION_WINDOW)
+        self.last_seen = 0.0
+        self.last_slow: Optional[Dict[str, Any]] = None
+        self.plan: Optional[List[Any]] = None
+        self.explained_at = 0.0
+
+    def p95(self) -> float:
+        if not self.durations:
+            return 0.0
+        ordered = sorted(self.durations)
+        return ordered[max(0, int(len(ordered) * 0.95 + 0.5) - 1)]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "total_ms": round(self.total_time * 1000, 2),
+            "avg_ms": round(self.total_time / self.count * 1000, 3) if self.count else 0.0,
+            "max_ms": round(self.max_time * 1000, 2),
+            "p95_ms": round(self.p95() * 1000, 2),
+            "rows": self.rows,
+            "slow_count": self.slow_count,
+            "last_seen": datetime.fromtimestamp(self.last_seen, timezone.utc).isoformat() if self.last_seen else None,
+            "last_slow": self.last_slow,
+            "plan": self.plan,
+        }
+
+
+class SlowQueryLog:
+    """Parmak izi başına sorgu özetleri ve yavaş sorgu günlüğü."""
+
+    def __init__(
+        self,
+        threshold_ms: float = 200.0,
+        explain_sample_rate: float = 0.1,
+        max_fingerprints: int = 1000,
+        enabled: bool = True,
+    ):
+        self.threshold = threshold_ms / 1000
+        self.explain_sample_rate = explain_sample_rate
+        self.max_fingerprints = max_fingerprints
+        self.enabled = enabled
+        # Parmak izi -> özet. En uzun süredir görülmeyen, sınır aşılınca atılır (LRU).
+        self._stats: "OrderedDict[str, FingerprintStats]" = OrderedDict()
+        self._engines: Dict[Any, AsyncEngine] = {}
+        self._explain_tasks: set = set()
+        self.evicted = 0
+        self.explain_failures = 0
+        self.started_at = time.time()
+
+    def install(self, *engines: AsyncEngine) -> None:
+        """Günlüğü sorgu olaylarına bağlar. EXPLAIN, ifadenin çalıştığı motorda yapılır."""
+        for async_engine in engines:
+            self._engines[async_engine.sync_engine] = async_engine
+        add_statement_observer(self.observe)
+
+    # ------------------------------------------------------------------
+    # Kayıt
+    # ------------------------------------------------------------------
+    def observe(self, conn, cursor, statement: str, parameters: Any, executemany: bool, elapsed: float) -> None:
+        if not self.enabled or _explaining.get():
+            return
+        fp = fingerprint(statement)
+        stats = self._stats.get(fp)
+        if stats is None:
+            stats = self._stats[fp] = FingerprintStats(fp)
+            if len(self._stats) > self.max_fingerprints:
+                self._stats.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._stats.move_to_end(fp)
+
+        stats.count += 1
+        stats.total_time += elapsed
+        stats.durations.append(elapsed)
+        stats.last_seen = time.time()
+        if elapsed > stats.max_time:
+            stats.max_time = elapsed
+        rowcount = getattr(cursor, "rowcount", -1)
+        if isinstance(rowcount, int) and rowcount > 0:
+            stats.rows += rowcount
+
+        if elapsed >= self.threshold:
+            self._record_slow(conn, stats, statement, parameters, executemany, elapsed, rowcount)
+
+    def _record_slow(self, conn, stats: FingerprintStats, statement, parameters, executemany, elapsed, rowcount) -> None:
+        stats.slow_count += 1
+        shape = (
+            {"executemany": len(parameters), "first": parameter_shape(parameters[0]) if parameters else None}
+            if executemany else parameter_shape(parameters)
+        )
+        stats.last_slow = {
+            "duration_ms": round(elapsed * 1000, 2),
+            "rows": rowcount if isinstance(rowcount, int) and rowcount >= 0 else None,
+            "parameters": shape,
+            "at": datetime.now(timezone.utc).isoformat(),
+        }
+        logger.warning("slow_query %s", orjson.dumps({
+            "fingerprint": stats.fingerprint,
+            "duration_ms": stats.last_slow["duration_ms"],
+            "threshold_ms": round(self.threshold * 1000, 2),
+            "rows": stats.last_slow["rows"],
+            "parameters": shape,
+        }).decode())
+
+        if (
+            not executemany
+            and stats.fingerprint.lstrip("( ").upper().startswith("SELECT")
+            and time.time() - stats.explained_at >= EXPLAIN_INTERVAL_SECONDS
+            and random.random() < self.explain_sample_rate
+        ):
+            self._schedule_explain(conn, stats, statement, parameters)
+
+    # ------------------------------------------------------------------
+    # EXPLAIN (örneklenmiş, arka planda)
+    # ------------------------------------------------------------------
+    def _schedule_explain(self, conn, stats: FingerprintStats, statement: str, parameters: Any) -> None:
+        async_engine = self._engines.get(conn.engine)
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if async_engine is None:
+            return
+        stats.explained_at = time.time()
+        # Görev boş bir bağlamda başlatılır; EXPLAIN, isteğin sorgu sayısına (query_stats) eklenmez.
+        task = contextvars.Context().run(loop.create_task, self._explain(async_engine, stats, statement, parameters))
+        self._explain_tasks.add(task)
+        task.add_done_callback(self._explain_tasks.discard)
+
+    async def _explain(self, async_engine: AsyncEngine, stats: FingerprintStats, statement: str, parameters: Any) -> None:
+        _explaining.set(True)
+        prefix = "EXPLAIN QUERY PLAN " if async_engine.dialect.name == "sqlite" else "EXPLAIN "
+        try:
+            async with async_engine.connect() as conn:
+                result = await conn.exec_driver_sql(prefix + statement, parameters or ())
+                stats.plan = [dict(row) for row in result.mappings().all()]
+        except Exception:
+            self.explain_failures += 1
+            logger.exception("Yavaş sorgu için EXPLAIN çalıştırılamadı: %s", stats.fingerprint)
+
+    async def close(self) -> None:
+        """Bekleyen EXPLAIN görevlerini iptal eder (uygulama kapanırken)."""
+        for task in list(self._explain_tasks):
+            task.cancel()
+        if self._explain_tasks:
+            await asyncio.gather(*self._explain_tasks, return_exceptions=True)
+
+    # ------------------------------------------------------------------
+    # Raporlama
+    # ------------------------------------------------------------------
+    def top(self, limit: int = 20, order_by: str = "total_time") -> List[Dict[str, Any]]:
+        """Parmak izlerini verilen ölçüte göre (büyükten küçüğe) sıralayıp ilk 'limit' kadarını döndürür."""
+        keys = {
+            "total_time": lambda s: s.total_time,
+            "max_time": lambda s: s.max_time,
+            "count": lambda s: s.count,
+            "p95": lambda s: s.p95(),
+            "slow_count": lambda s: s.slow_count,
+        }
+        ordered = sorted(self._stats.values(), key=keys[order_by], reverse=True)
+        return [stats.as_dict() for stats in ordered[:limit]]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "threshold_ms": round(self.threshold * 1000, 2),
+            "explain_sample_rate": self.explain_sample_rate,
+            "fingerprints": len(self._stats),
+            "max_fingerprints": self.max_fingerprints,
+            "evicted": self.evicted,
+            "explain_failures": self.explain_failures,
+            "since": datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+        }
+
+    def reset(self) -> None:
+        self._stats.clear()
+        self.evicted = 0
+        self.explain_failures = 0
+        self.started_at = time.time()
+
+
+slow_query_log = SlowQueryLog(
+    threshold_ms=settings.slow_query_ms,
+    explain_sample_rate=settings.slow_query_explain_sample_rate,
+    max_fingerprints=settings.slow_query_max_fingerprints,
+    enabled=settings.slow_query_log_enabled,
+)
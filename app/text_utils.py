@@ -0,0 +1,23 @@
+# app/text_utils.py
+
+# Türkçe metinler için harf katlama (case folding) yardımcıları.
+# Python'un str.lower() fonksiyonu 'I' -> 'i' ve 'İ' -> 'i̇' (birleşik nokta)
+# üretir; Türkçe'de doğrusu 'I' -> 'ı' ve 'İ' -> 'i' olmalıdır.
+
+_TURKISH_UPPER_MAP = str.maketrans({"I": "ı", "İ": "i"})
+
+# Aksan duyarsız eşleşme için (MySQL'in utf8mb4_0900_ai_ci harmanlamasına benzer)
+# Türkçe karakterler temel harflere indirgenir. "şişe" araması "sise" ile de eşleşir.
+_TURKISH_ASCII_MAP = str.maketrans({
+    "ı": "i", "ş": "s", "ğ": "g", "ü": "u", "ö": "o", "ç": "c", "â": "a", "î": "i", "û": "u",
+})
+
+
+def turkish_lower(text: str) -> str:
+    """Metni Türkçe kurallarına göre küçük harfe çevirir."""
+    return text.translate(_TURKISH_UPPER_MAP).lower()
+
+
+def turkish_fold(text: str) -> str:
+    """Metni küçük harfe çevirip Türkçe karakterleri temel harflere indirger."""
+    return turkish_lower(text).translate(_TURKISH_ASCII_MAP)
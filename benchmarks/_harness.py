@@ -0,0 +1,158 @@
+"""
+Benchmark ve kontrol betiklerinin ortak altyapısı.
+
+- use_temp_database: Uygulama modülleri içe aktarılmadan ÖNCE çağrılır; DATABASE_URL
+  geçici bir SQLite dosyasına yönlendirilir (ayarlar içe aktarmada okunur).
+- seed_reference / seed_reference_sync: şemayı oluşturur; roller, kategori, hizmetler,
+  ilçeler ve (verilirse) kullanıcılar ile sağlayıcı profillerini ekler.
+- app_client: uygulamayı yaşam döngüsüyle başlatır ve ağsız (ASGI) bir httpx istemcisi
+  verir; çıkışta veritabanı motorlarını kapatır.
+
+Bu modül app paketini tepe düzeyde içe aktarmaz; içe aktarmalar fonksiyonların içindedir.
+"""
+
+import os
+import sys
+import tempfile
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+# Betiğin ortamdaki DATABASE_URL'yi (boş, test amaçlı veritabanı) kullanmasını sağlayan bayrak.
+DATABASE_FROM_ENV_FLAG = "--database-url-from-env"
+
+ADMIN_ROLE_ID, PROVIDER_ROLE_ID, CUSTOMER_ROLE_ID = 1, 2, 3
+
+# Hizmet: (id, ad, slug); ilçe: (id, ad, şehir). Sayı verilirse sentetik kayıtlar üretilir.
+ServiceRows = Union[int, Sequence[Tuple[int, str, str]]]
+DistrictRows = Union[int, Sequence[Tuple[int, str, str]]]
+
+
+def temp_sqlite_path(prefix: str = "bench-") -> str:
+    """Yeni bir geçici dizinde SQLite dosya yolu döndürür."""
+    return os.path.join(tempfile.mkdtemp(prefix=prefix), "bench.db")
+
+
+def temp_sqlite_url(prefix: str = "bench-", path: Optional[str] = None, driver: str = "sqlite+aiosqlite") -> str:
+    """Geçici (veya verilen) SQLite dosyası için bağlantı URL'si üretir."""
+    return f"{driver}:///{path or temp_sqlite_path(prefix)}"
+
+
+def use_temp_database(prefix: str = "bench-", path: Optional[str] = None, allow_env: bool = False) -> None:
+    """
+    DATABASE_URL'yi geçici bir SQLite dosyasına yönlendirir ve arama arka ucunu bellek içi
+    indekse ayarlar. allow_env True ise ve komut satırında --database-url-from-env
+    verilmişse DATABASE_URL olduğu gibi bırakılır.
+    """
+    if not (allow_env and DATABASE_FROM_ENV_FLAG in sys.argv):
+        os.environ["DATABASE_URL"] = temp_sqlite_url(prefix, path)
+    os.environ.setdefault("SEARCH_BACKEND", "memory")
+
+
+def user_row(
+    user_id: int, email: str, role_id: int = CUSTOMER_ROLE_ID, password_hash: str = "x",
+    first_name: str = "Bench", last_name: Optional[str] = None,
+) -> Dict[str, Any]:
+    """users tablosuna eklenecek bir satır."""
+    return {
+        "id": user_id, "email": email, "password_hash": password_hash,
+        "first_name": first_name, "last_name": last_name or f"User {user_id}", "role_id": role_id,
+    }
+
+
+def _reference_rows(
+    users: Iterable[Dict[str, Any]], provider_user_ids: Sequence[int], services: ServiceRows, districts: DistrictRows,
+) -> List[Tuple[Any, List[Dict[str, Any]]]]:
+    from app.models.user import User, Role, RoleName
+    from app.models.category_models import Category, Service
+    from app.models.district_models import District
+    from app.models.provider_models import Provider
+    # Tüm modeller kaydedilir; create_all yalnızca içe aktarılmış modellerin tablolarını oluşturur.
+    from app.models import job_models, review_models  # noqa: F401
+
+    if isinstance(services, int):
+        services = [(i, f"Hizmet {i}", f"hizmet-{i}") for i in range(1, services + 1)]
+    if isinstance(districts, int):
+        districts = [(i, f"İlçe {i}", "İstanbul") for i in range(1, districts + 1)]
+    return [
+        (Role, [
+            {"id": ADMIN_ROLE_ID, "role_name": RoleName.admin},
+            {"id": PROVIDER_ROLE_ID, "role_name": RoleName.provider},
+            {"id": CUSTOMER_ROLE_ID, "role_name": RoleName.customer},
+        ]),
+        (User, list(users)),
+        (Provider, [
+            {"id": provider_id, "user_id": user_id, "business_name": f"Usta {provider_id}"}
+            for provider_id, user_id in enumerate(provider_user_ids, start=1)
+        ]),
+        (Category, [{"id": 1, "name": "Ev Hizmetleri", "slug": "ev-hizmetleri"}]),
+        (Service, [
+            {"id": service_id, "category_id": 1, "name": name, "slug": slug} for service_id, name, slug in services
+        ]),
+        (District, [
+            {"id": district_id, "name": name, "city_name": city} for district_id, name, city in districts
+        ]),
+    ]
+
+
+async def seed_reference(
+    conn, users: Iterable[Dict[str, Any]] = (), provider_user_ids: Sequence[int] = (),
+    services: ServiceRows = 1, districts: DistrictRows = 1,
+) -> None:
+    """
+    Şemayı oluşturur ve ortak referans verisini ekler (AsyncConnection, örn. engine.begin()).
+    Sağlayıcı profilleri provider_user_ids sırasıyla 1'den numaralanır.
+    """
+    from sqlalchemy import insert
+    from app.models.base import Base
+
+    reference = _reference_rows(users, provider_user_ids, services, districts)
+    await conn.run_sync(Base.metadata.create_all)
+    for model, rows in reference:
+        if rows:
+            await conn.execute(insert(model), rows)
+
+
+def seed_reference_sync(
+    conn, users: Iterable[Dict[str, Any]] = (), provider_user_ids: Sequence[int] = (),
+    services: ServiceRows = 1, districts: DistrictRows = 1,
+) -> None:
+    """seed_reference'ın senkron (create_engine ile açılmış bağlantı) karşılığı."""
+    from sqlalchemy import insert
+    from app.models.base import Base
+
+    reference = _reference_rows(users, provider_user_ids, services, districts)
+    Base.metadata.create_all(conn)
+    for model, rows in reference:
+        if rows:
+            conn.execute(insert(model), rows)
+
+
+async def dispose_engines() -> None:
+    """Birincil ve (ayrıysa) okuma motorunu kapatır."""
+    from app.database import engine, read_engine
+
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+
+
+@asynccontextmanager
+async def app_client(
+    app=None, base_url: str = "http://bench", raise_app_exceptions: bool = True,
+) -> AsyncIterator["httpx.AsyncClient"]:
+    """
+    Uygulamayı yaşam döngüsüyle (indeksler, arka plan görevleri) başlatır ve ağsız bir
+    istemci verir. raise_app_exceptions=False ile uygulama hataları istisna yerine 500
+    yanıtı olarak döner. Çıkışta veritabanı motorları kapatılır.
+    """
+    import httpx
+
+    if app is None:
+        from app.main import app
+    try:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=raise_app_exceptions)
+            async with httpx.AsyncClient(transport=transport, base_url=base_url) as client:
+                yield client
+    finally:
+        await dispose_engines()
@@ -0,0 +1,127 @@
+"""
+Admin kullanıcı araması karşılaştırması: bellek içi alt dize taraması vs indeksli önek araması.
+
+Yerel bir SQLite dosyasına sentetik kullanıcılar (varsayılan 1M) yükler ve
+aynı sorgu üreticilerini (admin_router.search_breadth_query / admin_users_query /
+admin_users_page_query ve pagination.capped_count_query) kullanarak farklı arama
+terimleri için ilk sayfanın toplam süresini (plan seçimi + sayfa + sınırlı toplam
+sayı) ölçer. Karşılaştırma için eski MOCK_USERS yaklaşımı (tüm kullanıcılar
+üzerinde alt dize taraması) da ölçülür.
+
+Not: MySQL'de utf8mb4_0900_ai_ci harmanlaması ile LIKE 'metin%' hem büyük/küçük
+harf duyarsızdır hem de indeks aralık taraması kullanır. SQLite ise büyük/küçük
+harf duyarsız LIKE için indeks kullanmaz; bu yüzden ölçümde
+'PRAGMA case_sensitive_like = ON' açılır ve arama terimleri kayıtlarla aynı
+harf büyüklüğünde verilir.
+
+Kullanım:
+    python -m benchmarks.bench_admin_user_search --users 1000000 --limit 50
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from sqlalchemy import create_engine, event, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.pagination import capped_count_query
+from app.routers.admin_router import USER_COUNT_CAP, admin_users_page_query, admin_users_query, search_breadth_query
+from benchmarks._harness import CUSTOMER_ROLE_ID, PROVIDER_ROLE_ID, seed_reference_sync, temp_sqlite_url
+
+FIRST_NAMES = ["Ahmet", "Mehmet", "Ayşe", "Fatma", "Mustafa", "Zeynep", "Emine", "Ali", "Hüseyin", "Elif",
+               "Hasan", "Merve", "İbrahim", "Hatice", "Murat", "Esra", "Ömer", "Büşra", "Yusuf", "Selin"]
+LAST_NAMES = ["Yılmaz", "Kaya", "Demir", "Şahin", "Çelik", "Yıldız", "Yıldırım", "Öztürk", "Aydın", "Özdemir",
+              "Arslan", "Doğan", "Kılıç", "Aslan", "Çetin", "Kara", "Koç", "Kurt", "Özkan", "Şimşek"]
+
+SEARCHES = [
+    None,                     # Filtresiz ilk sayfa
+    "Meh",                    # Kısa ad öneki (~%5 eşleşme)
+    "Yıldırım",               # Soyad
+    "zeynep.kaya",            # E-posta öneki
+    "ali.koc12345",           # Seçici e-posta öneki
+    "123456",                 # Sayısal (id + önek)
+]
+
+
+def seed(engine, user_count: int) -> None:
+    rng = random.Random(7)
+    with engine.begin() as conn:
+        seed_reference_sync(conn)
+        batch = []
+        for i in range(1, user_count + 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            ascii_name = f"{first}.{last}".lower().translate(str.maketrans("ışçğüöİ", "iscguoi"))
+            batch.append({
+                "id": i, "email": f"{ascii_name}{i}@example.com", "password_hash": "x",
+                "first_name": first, "last_name": last,
+                "role_id": PROVIDER_ROLE_ID if i % 5 == 0 else CUSTOMER_ROLE_ID, "is_active": i % 20 != 0,
+            })
+            if len(batch) == 10000:
+                conn.execute(insert(User), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(User), batch)
+
+
+def median_ms(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def legacy_scan(users: list, search: str) -> list:
+    # Eski get_all_users: her istekte tüm kullanıcılar üzerinde alt dize taraması.
+    needle = search.lower()
+    return [
+        u for u in users
+        if needle in u["first_name"].lower() or needle in u["last_name"].lower()
+        or needle in u["email"].lower() or str(u["id"]).startswith(needle)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(temp_sqlite_url("bench-users-", driver="sqlite"))
+    event.listen(engine, "connect", lambda conn, _: conn.execute("PRAGMA case_sensitive_like = ON"))
+    started = time.perf_counter()
+    seed(engine, args.users)
+    print(f"{args.users} kullanıcı yüklendi ({time.perf_counter() - started:.1f} s)\n")
+
+    with Session(engine) as session:
+        all_users = [dict(row._mapping) for row in session.execute(
+            select(User.id, User.email, User.first_name, User.last_name)
+        )]
+
+        print(f"{'arama':>14} | {'eşleşme':>8} | {'sayfa+sayım (ms)':>17} | {'rol+aktif (ms)':>14} | {'eski tarama (ms)':>16}")
+        print("-" * 82)
+        for search in SEARCHES:
+            # Rotadaki gibi: önce arama genişliği ölçülür, plan buna göre seçilir.
+            def run_search(role_id=None, is_active=None):
+                broad = False
+                if search:
+                    broad = max(session.execute(search_breadth_query(search, USER_COUNT_CAP)).one()) > USER_COUNT_CAP
+                query = admin_users_query(search, role_id, is_active, broad=broad)
+                session.execute(admin_users_page_query(query, args.limit)).all()
+                return session.execute(capped_count_query(query, USER_COUNT_CAP)).scalar_one()
+
+            total = run_search()
+            total_ms = median_ms(run_search, args.repeat)
+            filtered_ms = median_ms(lambda: run_search(role_id=2, is_active=True), args.repeat)
+            legacy_ms = median_ms(lambda: legacy_scan(all_users, search), 1) if search else float("nan")
+            shown = f"{USER_COUNT_CAP}+" if total > USER_COUNT_CAP else str(total)
+            print(f"{search or '(yok)':>14} | {shown:>8} | {total_ms:>17.2f} | {filtered_ms:>14.2f} | {legacy_ms:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
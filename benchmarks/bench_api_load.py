@@ -0,0 +1,461 @@
+"""
+API yük testi: gerçekçi trafik karışımı, uç nokta başına gecikme yüzdelikleri ve
+kayıtlı taban çizgisiyle (baseline) karşılaştırma.
+
+Uygulama süreç içinde (httpx.ASGITransport, ağsız) ve yaşam döngüsüyle birlikte
+başlatılır; geçici bir SQLite dosyasına sentetik müşteriler, sağlayıcılar ve
+ilanlar yüklenir. --concurrency kadar sanal kullanıcı aynı anda şu senaryoları
+ağırlıklı rastgele seçerek oynatır:
+
+    browse  ilan listesi (X-Next-Cursor ile 1-3 sayfa)
+    view    ilan detayı (+ bazen sağlayıcı değerlendirmeleri)
+    search  ilan araması
+    offer   sağlayıcı teklif verir
+    accept  müşteri, ilanına gelen bekleyen bir teklifi kabul eder
+    review  müşteri, tamamlanmış ilanı için değerlendirme yazar
+    login   e-posta/parola ile giriş (Argon2 doğrulaması dahil)
+
+Uç nokta başına istek sayısı, hata sayısı, verim (istek/s) ve p50/p95/p99
+yazdırılır. --save-baseline sonuçları JSON olarak kaydeder; --baseline ile
+verilen dosyaya göre p50/p95 --tolerance oranından (ve --min-delta-ms'den)
+fazla kötüleşir, toplam verim aynı oranda düşer ya da beklenmeyen bir yanıt
+alınırsa betik hata koduyla çıkar.
+
+Taban çizgisi makineye özeldir: CI'da kullanılacaksa aynı makinede, aynı
+parametrelerle --save-baseline ile yeniden üretilmelidir.
+
+Kullanım:
+    python -m benchmarks.bench_api_load --requests 5000 --concurrency 20
+    python -m benchmarks.bench_api_load --save-baseline benchmarks/baselines/api_load.json
+    python -m benchmarks.bench_api_load --baseline benchmarks/baselines/api_load.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import random
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from benchmarks._harness import (
+    CUSTOMER_ROLE_ID, PROVIDER_ROLE_ID, app_client, seed_reference, use_temp_database, user_row,
+)
+
+use_temp_database("bench-load-")
+
+import httpx  # noqa: E402
+from sqlalchemy import event, insert  # noqa: E402
+
+from app.database import engine  # noqa: E402
+from app.models.job_models import Job, JobStatus, Offer, OfferStatus  # noqa: E402
+from app.passwords import hash_password  # noqa: E402
+from app.routers.auth import create_access_token  # noqa: E402
+
+BENCH_PASSWORD = "benchmark-parola"
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL: okumalar yazmaları beklemez (MySQL/InnoDB'ye daha yakın bir eşzamanlılık).
+    # busy_timeout: eşzamanlı yazmalar hemen 'database is locked' yerine sırayla bekler.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA busy_timeout=10000")
+    cursor.close()
+
+# Senaryo -> ağırlık. Gerçek trafikte okumalar baskındır.
+SCENARIO_WEIGHTS = {
+    "browse": 35,
+    "view": 25,
+    "search": 8,
+    "offer": 14,
+    "accept": 6,
+    "review": 6,
+    "login": 6,
+}
+
+# (id, ad, slug, ilana özgü kelimeler). Arama terimleri bu kelimelerden seçilir; böylece
+# her arama ilanların yalnızca bir kısmıyla (yaklaşık bir hizmetinkiyle) eşleşir.
+_SERVICES = [
+    (1, "Ev Temizliği", "ev-temizligi", ["temizlik", "cam", "banyo", "mutfak", "süpürge", "dezenfeksiyon"]),
+    (2, "Boya Badana", "boya-badana", ["boya", "badana", "duvar", "tavan", "alçı", "macun"]),
+    (3, "Su Tesisatı", "su-tesisati", ["tesisat", "musluk", "kaçak", "gider", "kombi", "petek"]),
+    (4, "Bahçe Bakımı", "bahce-bakimi", ["bahçe", "çim", "budama", "sulama", "fidan", "peyzaj"]),
+    (5, "Evden Eve Nakliyat", "evden-eve-nakliyat", ["nakliyat", "taşıma", "ambalaj", "asansör", "kamyon", "koli"]),
+]
+_SEARCH_TERMS = [word for *_, words in _SERVICES for word in words[:3]]
+_FILLER = [
+    "acil", "hafta", "sonu", "uygun", "fiyat", "deneyimli", "usta", "daire", "oda", "metrekare",
+    "sabah", "akşam", "referanslı", "malzeme", "dahil", "hızlı", "temiz", "iş", "bekliyorum", "teşekkürler",
+]
+_DISTRICTS = [(1, "Kadıköy", "İstanbul"), (2, "Beşiktaş", "İstanbul"), (3, "Çankaya", "Ankara"), (4, "Konak", "İzmir")]
+
+
+# ----------------------------------------------------------------------
+# Veri yükleme
+# ----------------------------------------------------------------------
+@dataclass
+class Dataset:
+    customer_ids: List[int]
+    provider_user_ids: List[int]
+    emails: Dict[int, str]
+    open_job_ids: List[int]
+    job_owner: Dict[int, int]
+    provider_ids: List[int]
+    # Değerlendirme bekleyen (tamamlanmış, kabul edilmiş teklifli) ilanlar: (job_id, customer_id)
+    reviewable: List[Tuple[int, int]] = field(default_factory=list)
+
+
+async def seed(args, rng: random.Random) -> Dataset:
+    # Tüm kullanıcılar aynı parolayı paylaşır; Argon2 hash'i yalnızca bir kez hesaplanır.
+    password_hash = hash_password(BENCH_PASSWORD)
+    customer_ids = list(range(1, args.customers + 1))
+    provider_user_ids = list(range(args.customers + 1, args.customers + args.providers + 1))
+    emails = {user_id: f"user{user_id}@bench.example.com" for user_id in customer_ids + provider_user_ids}
+    provider_ids = list(range(1, args.providers + 1))
+
+    jobs, offers = [], []
+    job_owner = {}
+    reviewable = []
+    open_job_ids = []
+    for job_id in range(1, args.jobs + args.reviewable_jobs + 1):
+        customer_id = rng.choice(customer_ids)
+        job_owner[job_id] = customer_id
+        completed = job_id > args.jobs
+        service_id, service_name, _, words = rng.choice(_SERVICES)
+        jobs.append({
+            "id": job_id, "customer_id": customer_id,
+            "service_id": service_id, "district_id": rng.randint(1, len(_DISTRICTS)),
+            "title": f"{service_name} için {rng.choice(words)} işi #{job_id}",
+            "description": " ".join(rng.sample(words, 3) + rng.sample(_FILLER, 12)),
+            "status": JobStatus.completed if completed else JobStatus.open,
+        })
+        if completed:
+            offers.append({
+                "job_id": job_id, "provider_id": rng.choice(provider_ids),
+                "offer_price": 500, "status": OfferStatus.accepted,
+            })
+            reviewable.append((job_id, customer_id))
+        else:
+            open_job_ids.append(job_id)
+
+    async with engine.begin() as conn:
+        await seed_reference(
+            conn,
+            users=[
+                user_row(
+                    user_id, emails[user_id],
+                    role_id=CUSTOMER_ROLE_ID if user_id <= args.customers else PROVIDER_ROLE_ID,
+                    password_hash=password_hash, last_name=f"Kullanıcı {user_id}",
+                )
+                for user_id in customer_ids + provider_user_ids
+            ],
+            provider_user_ids=provider_user_ids,
+            services=[(service_id, name, slug) for service_id, name, slug, _ in _SERVICES],
+            districts=_DISTRICTS,
+        )
+        for start in range(0, len(jobs), 5000):
+            await conn.execute(insert(Job), jobs[start:start + 5000])
+        if offers:
+            await conn.execute(insert(Offer), offers)
+
+    rng.shuffle(reviewable)
+    return Dataset(customer_ids, provider_user_ids, emails, open_job_ids, job_owner, provider_ids, reviewable)
+
+
+# ----------------------------------------------------------------------
+# Ölçüm
+# ----------------------------------------------------------------------
+class Recorder:
+    """Uç nokta adına göre gecikme örneklerini ve beklenmeyen yanıtları toplar."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.error_examples: Dict[str, str] = {}
+        self.enabled = True
+
+    async def call(self, client: httpx.AsyncClient, name: str, method: str, url: str,
+                   expected: Tuple[int, ...] = (200,), **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        elapsed = time.perf_counter() - started
+        if self.enabled:
+            self.samples[name].append(elapsed)
+            if response.status_code not in expected:
+                self.errors[name] += 1
+                self.error_examples.setdefault(name, f"{response.status_code} {response.text[:200]}")
+        return response
+
+
+def percentile(sorted_samples: List[float], p: float) -> float:
+    """En yakın sıra (nearest-rank) yöntemiyle yüzdelik."""
+    index = max(0, math.ceil(p / 100 * len(sorted_samples)) - 1)
+    return sorted_samples[index]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    all_samples = []
+    for name, samples in sorted(recorder.samples.items()):
+        samples = sorted(samples)
+        all_samples.extend(samples)
+        endpoints[name] = {
+            "count": len(samples),
+            "errors": recorder.errors.get(name, 0),
+            "rps": len(samples) / elapsed,
+            "p50_ms": percentile(samples, 50) * 1000,
+            "p95_ms": percentile(samples, 95) * 1000,
+            "p99_ms": percentile(samples, 99) * 1000,
+        }
+    all_samples.sort()
+    overall = {
+        "count": len(all_samples),
+        "errors": sum(recorder.errors.values()),
+        "elapsed_s": elapsed,
+        "rps": len(all_samples) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(all_samples, 50) * 1000 if all_samples else 0.0,
+        "p95_ms": percentile(all_samples, 95) * 1000 if all_samples else 0.0,
+        "p99_ms": percentile(all_samples, 99) * 1000 if all_samples else 0.0,
+    }
+    return {"overall": overall, "endpoints": endpoints}
+
+
+# ----------------------------------------------------------------------
+# Senaryolar
+# ----------------------------------------------------------------------
+class Workload:
+    """Sanal kullanıcıların paylaştığı durum (token'lar, bekleyen teklifler, değerlendirilecek ilanlar)."""
+
+    def __init__(self, data: Dataset, recorder: Recorder):
+        self.data = data
+        self.recorder = recorder
+        customers = set(data.customer_ids)
+        self.tokens = {
+            user_id: {"Authorization": "Bearer " + create_access_token({
+                "sub": email, "role": "customer" if user_id in customers else "provider",
+            })}
+            for user_id, email in data.emails.items()
+        }
+        # Kabul edilebilecek teklifler: (offer_id, job_id)
+        self.pending_offers: List[Tuple[int, int]] = []
+
+    async def browse(self, client, rng):
+        url = f"/api/v1/jobs/?limit={rng.choice([20, 20, 50])}"
+        for _ in range(rng.randint(1, 3)):
+            response = await self.recorder.call(client, "GET /jobs", "GET", url)
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+            url = f"/api/v1/jobs/?limit=20&cursor={cursor}"
+
+    async def view(self, client, rng):
+        # Popüler ilanlar daha sık görüntülenir (ilk %10'luk dilim trafiğin yarısını alır).
+        open_ids = self.data.open_job_ids
+        pool = open_ids[: max(1, len(open_ids) // 10)] if rng.random() < 0.5 else open_ids
+        await self.recorder.call(client, "GET /jobs/{id}", "GET", f"/api/v1/jobs/{rng.choice(pool)}")
+        if rng.random() < 0.3:
+            provider_id = rng.choice(self.data.provider_ids)
+            await self.recorder.call(client, "GET /providers/{id}/reviews", "GET", f"/api/v1/providers/{provider_id}/reviews")
+
+    async def search(self, client, rng):
+        await self.recorder.call(client, "GET /jobs/search", "GET", "/api/v1/jobs/search",
+                                 params={"q": rng.choice(_SEARCH_TERMS), "limit": 20})
+
+    async def offer(self, client, rng):
+        job_id = rng.choice(self.data.open_job_ids)
+        provider_user_id = rng.choice(self.data.provider_user_ids)
+        # 400: aynı sağlayıcı bu ilana zaten teklif vermiş ya da ilan az önce atanmış.
+        response = await self.recorder.call(
+            client, "POST /jobs/{id}/offers", "POST", f"/api/v1/jobs/{job_id}/offers",
+            expected=(201, 400), headers=self.tokens[provider_user_id],
+            json={"offer_price": rng.randint(200, 5000), "message": "Yük testi teklifi"},
+        )
+        if response.status_code == 201:
+            self.pending_offers.append((response.json()["id"], job_id))
+
+    async def accept(self, client, rng):
+        if not self.pending_offers:
+            return await self.offer(client, rng)
+        offer_id, job_id = self.pending_offers.pop(rng.randrange(len(self.pending_offers)))
+        # Müşteri önce teklifleri görür, sonra birini kabul eder.
+        headers = self.tokens[self.data.job_owner[job_id]]
+        await self.recorder.call(client, "GET /jobs/{id}/offers", "GET", f"/api/v1/jobs/{job_id}/offers", headers=headers)
+        # 400/409: ilana gelen başka bir teklif önceden kabul edilmiş.
+        response = await self.recorder.call(
+            client, "PATCH /offers/{id}/accept", "PATCH", f"/api/v1/offers/{offer_id}/accept",
+            expected=(200, 400, 409), headers=headers,
+        )
+        if response.status_code == 200 and job_id in self.data.open_job_ids:
+            self.data.open_job_ids.remove(job_id)
+
+    async def review(self, client, rng):
+        if not self.data.reviewable:
+            return await self.browse(client, rng)
+        job_id, customer_id = self.data.reviewable.pop()
+        await self.recorder.call(
+            client, "POST /jobs/{id}/reviews", "POST", f"/api/v1/jobs/{job_id}/reviews",
+            expected=(201,), headers=self.tokens[customer_id],
+            json={"rating": rng.randint(1, 5), "comment": "Yük testi değerlendirmesi"},
+        )
+
+    async def login(self, client, rng):
+        user_id = rng.choice(list(self.data.emails))
+        await self.recorder.call(
+            client, "POST /auth/login", "POST", "/api/v1/auth/login",
+            json={"email": self.data.emails[user_id], "password": BENCH_PASSWORD},
+        )
+
+
+async def run_load(client: httpx.AsyncClient, workload: Workload, requests: int, concurrency: int, seed: int) -> float:
+    """'requests' senaryo çalışana kadar 'concurrency' sanal kullanıcıyı koşturur; geçen süreyi döndürür."""
+    names = list(SCENARIO_WEIGHTS)
+    weights = [SCENARIO_WEIGHTS[name] for name in names]
+    remaining = requests
+
+    async def virtual_user(index: int):
+        nonlocal remaining
+        rng = random.Random(seed * 1000 + index)
+        while remaining > 0:
+            remaining -= 1
+            scenario = rng.choices(names, weights)[0]
+            await getattr(workload, scenario)(client, rng)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_user(i) for i in range(concurrency)))
+    return time.perf_counter() - started
+
+
+# ----------------------------------------------------------------------
+# Raporlama ve taban çizgisi karşılaştırması
+# ----------------------------------------------------------------------
+def print_report(result: dict) -> None:
+    header = f"{'uç nokta':<30} | {'istek':>6} | {'hata':>4} | {'istek/s':>8} | {'p50 ms':>7} | {'p95 ms':>7} | {'p99 ms':>7}"
+    print(header)
+    print("-" * len(header))
+    rows = list(result["endpoints"].items()) + [("TOPLAM", result["overall"])]
+    for name, stats in rows:
+        print(
+            f"{name:<30} | {stats['count']:>6} | {stats['errors']:>4} | {stats['rps']:>8.1f} | "
+            f"{stats['p50_ms']:>7.2f} | {stats['p95_ms']:>7.2f} | {stats['p99_ms']:>7.2f}"
+        )
+
+
+def compare(result: dict, baseline: dict, tolerance: float, min_delta_ms: float, min_samples: int) -> List[str]:
+    """Taban çizgisine göre gerilemeleri (regression) listeler."""
+    problems = []
+    for name, base in baseline["endpoints"].items():
+        current = result["endpoints"].get(name)
+        if current is None or current["count"] < min_samples or base["count"] < min_samples:
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            limit = base[metric] * (1 + tolerance)
+            if current[metric] > limit and current[metric] - base[metric] > min_delta_ms:
+                problems.append(
+                    f"{name}: {metric} {current[metric]:.2f} > {base[metric]:.2f} (+%{tolerance * 100:.0f} sınırı {limit:.2f})"
+                )
+    base_rps = baseline["overall"]["rps"]
+    if result["overall"]["rps"] < base_rps * (1 - tolerance):
+        problems.append(f"Toplam verim {result['overall']['rps']:.1f} istek/s < {base_rps:.1f} (-%{tolerance * 100:.0f})")
+    return problems
+
+
+def _rounded(value):
+    # Kaydedilen dosya okunaklı kalsın diye ondalıklar kısaltılır.
+    if isinstance(value, dict):
+        return {key: _rounded(item) for key, item in value.items()}
+    return round(value, 3) if isinstance(value, float) else value
+
+
+def _parameters(args) -> dict:
+    return {
+        "requests": args.requests, "concurrency": args.concurrency, "seed": args.seed,
+        "customers": args.customers, "providers": args.providers, "jobs": args.jobs,
+        "reviewable_jobs": args.reviewable_jobs,
+    }
+
+
+async def main_async(args) -> int:
+    # Bağlantı bekleme uyarıları da susturulur; bekleme süresi zaten gecikmelere yansır.
+    logging.disable(logging.WARNING)
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    data = await seed(args, rng)
+    print(f"Veri yüklendi: {len(data.customer_ids)} müşteri, {len(data.provider_ids)} sağlayıcı, "
+          f"{args.jobs + args.reviewable_jobs} ilan ({time.perf_counter() - started:.1f} s)")
+
+    recorder = Recorder()
+    workload = Workload(data, recorder)
+    # Uygulama hataları istisna yerine 500 yanıtı olarak sayılır; yük testi yarıda kesilmez.
+    async with app_client(raise_app_exceptions=False) as client:
+        # Isınma: içe aktarmalar, bağlantı havuzu ve önbellekler ölçüme karışmasın.
+        recorder.enabled = False
+        await run_load(client, workload, args.warmup, args.concurrency, args.seed + 1)
+        recorder.enabled = True
+        elapsed = await run_load(client, workload, args.requests, args.concurrency, args.seed)
+
+    result = summarize(recorder, elapsed)
+    result["parameters"] = _parameters(args)
+    print()
+    print_report(result)
+    for name, example in recorder.error_examples.items():
+        print(f"Beklenmeyen yanıt ({name}): {example}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump({
+                **_rounded(result),
+                "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "machine": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+            }, baseline_file, ensure_ascii=False, indent=2)
+            baseline_file.write("\n")
+        print(f"\nTaban çizgisi kaydedildi: {args.save_baseline}")
+
+    exit_code = 1 if result["overall"]["errors"] else 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        if baseline.get("parameters") != result["parameters"]:
+            print("\nUYARI: Taban çizgisi farklı parametrelerle kaydedilmiş; karşılaştırma yanıltıcı olabilir.")
+        problems = compare(result, baseline, args.tolerance, args.min_delta_ms, args.min_samples)
+        print()
+        if problems:
+            print("GERİLEME: Taban çizgisine göre yavaşlama tespit edildi:")
+            for problem in problems:
+                print(f"  - {problem}")
+            exit_code = 1
+        else:
+            print(f"Taban çizgisine göre gerileme yok (tolerans %{args.tolerance * 100:.0f}).")
+    return exit_code
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000, help="Ölçülen senaryo sayısı")
+    parser.add_argument("--warmup", type=int, default=300, help="Ölçüme dahil edilmeyen ısınma senaryoları")
+    parser.add_argument("--concurrency", type=int, default=20, help="Aynı anda çalışan sanal kullanıcı sayısı")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--customers", type=int, default=500)
+    parser.add_argument("--providers", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--reviewable-jobs", type=int, default=2000)
+    parser.add_argument("--baseline", default=None, help="Karşılaştırılacak taban çizgisi (JSON)")
+    parser.add_argument("--save-baseline", default=None, help="Sonuçların kaydedileceği JSON dosyası")
+    parser.add_argument("--tolerance", type=float, default=0.30, help="İzin verilen göreli kötüleşme (0.30 = %%30)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0, help="Bundan küçük mutlak farklar gerileme sayılmaz")
+    parser.add_argument("--min-samples", type=int, default=50, help="Daha az örneği olan uç noktalar karşılaştırılmaz")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Kimlik doğrulama karşılaştırması: her istekte veritabanı vs kimlik önbelleği vs yalnızca talepler.
+
+Geçici bir SQLite dosyasına kullanıcılar ve her müşteri için bir ilan yükler, ardından
+uygulamaya (ASGI, ağsız) eşzamanlı, kimliği doğrulanmış istekler gönderir:
+
+- probe: yalnızca get_current_principal bağımlılığını çalıştıran ölçüm rotası
+  (kimlik doğrulamanın kendi maliyeti),
+- offers: GET /api/v1/jobs/{id}/offers (kimlik + tek liste sorgusu olan gerçek rota).
+
+Modlar:
+- db: her istekten önce kimlik önbelleği boşaltılır (önbellek öncesi davranış),
+- cache: kimlik önbelleği açık (varsayılan yol, AUTH_STATELESS=false),
+- claims: AUTH_STATELESS=true; kimlik ve rol token taleplerinden okunur.
+
+Her mod ve rota için saniyedeki istek, medyan / p95 süre ve istek başına SQL ifadesi
+sayısı yazdırılır.
+
+Kullanım:
+    python -m benchmarks.bench_auth --users 500 --requests 5000 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+
+from benchmarks._harness import app_client, seed_reference, use_temp_database, user_row
+
+use_temp_database("bench-auth-")
+
+import httpx  # noqa: E402
+from fastapi import Depends  # noqa: E402
+from sqlalchemy import event, insert  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.database import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.job_models import Job  # noqa: E402
+from app.routers.auth import create_access_token, get_current_principal, principal_cache  # noqa: E402
+
+
+# Yalnızca kimlik doğrulamanın maliyetini ölçmek için eklenen rota.
+@app.get("/_bench/principal", include_in_schema=False)
+async def _bench_principal(current_user=Depends(get_current_principal)):
+    return {"id": current_user.id}
+
+
+async def seed(user_count: int) -> None:
+    async with engine.begin() as conn:
+        await seed_reference(conn, users=[user_row(i, f"bench{i}@example.com") for i in range(1, user_count + 1)])
+        await conn.execute(insert(Job), [{
+            "id": i, "customer_id": i, "service_id": 1, "district_id": 1,
+            "title": f"Benchmark ilanı {i}", "description": "Sentetik ilan açıklaması " * 4,
+        } for i in range(1, user_count + 1)])
+
+
+def token_for(user_id: int) -> str:
+    return create_access_token({
+        "sub": f"bench{user_id}@example.com", "role": "customer", "uid": user_id, "ver": 0,
+    })
+
+
+async def run(client: httpx.AsyncClient, args, tokens, route: str, mode: str, statements: list) -> dict:
+    rng = random.Random(42)
+    plan = [rng.randint(1, args.users) for _ in range(args.requests)]
+    samples = []
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < len(plan):
+            user_id = plan[next_index]
+            next_index += 1
+            path = "/_bench/principal" if route == "probe" else f"/api/v1/jobs/{user_id}/offers"
+            if mode == "db":
+                principal_cache.clear()
+            started = time.perf_counter()
+            response = await client.get(path, headers={"Authorization": f"Bearer {tokens[user_id]}"})
+            samples.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.text
+
+    statements[0] = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    samples.sort()
+    return {
+        "rps": len(samples) / elapsed,
+        "median_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[int(len(samples) * 0.95) - 1] * 1000,
+        "queries": statements[0] / len(samples),
+    }
+
+
+async def main_async(args) -> None:
+    logging.disable(logging.WARNING)
+    await seed(args.users)
+    tokens = {user_id: token_for(user_id) for user_id in range(1, args.users + 1)}
+
+    # Ölçüm sırasında çalışan SQL ifadelerini say (iptal listesi yenilemeleri dahil).
+    statements = [0]
+
+    def count_statement(*_):
+        statements[0] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_statement)
+
+    print(f"{'rota':>6} | {'mod':>6} | {'istek/sn':>9} | {'medyan (ms)':>11} | {'p95 (ms)':>9} | {'sorgu/istek':>11}")
+    print("-" * 68)
+    try:
+        async with app_client(app) as client:
+            for route in ("probe", "offers"):
+                for mode in ("db", "cache", "claims"):
+                    settings.auth_stateless = mode == "claims"
+                    principal_cache.clear()
+                    result = await run(client, args, tokens, route, mode, statements)
+                    print(
+                        f"{route:>6} | {mode:>6} | {result['rps']:>9.0f} | {result['median_ms']:>11.2f} | "
+                        f"{result['p95_ms']:>9.2f} | {result['queries']:>11.2f}"
+                    )
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_statement)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
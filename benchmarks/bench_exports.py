@@ -0,0 +1,163 @@
+"""
+Akış halinde dışa aktarma (GET /api/v1/admin/exports/jobs) bellek testi.
+
+Geçici bir SQLite dosyasına (ayrı bir süreçte) sentetik ilanlar (varsayılan 1M)
+yükler, ardından dışa aktarma uç noktasını ağ katmanı olmadan doğrudan ASGI
+üzerinden çağırır. Yanıt gövdesi okunup atılır; akış boyunca sürecin yerleşik
+belleği (RSS) örneklenir. Dışa aktarma öncesine göre RSS artışı --max-growth-mb
+sınırını aşarsa betik hata koduyla çıkar.
+
+Not: httpx.ASGITransport yanıt gövdesini bütünüyle belleğe topladığı için burada
+kullanılmaz; ölçüm, istemci tarafı tamponlamayı değil sunucunun belleğini gösterir.
+
+Kullanım:
+    python -m benchmarks.bench_exports --jobs 1000000 --format csv --gzip
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+import zlib
+from datetime import datetime, timedelta
+
+from benchmarks._harness import (
+    ADMIN_ROLE_ID, dispose_engines, seed_reference_sync, temp_sqlite_path, temp_sqlite_url, use_temp_database,
+    user_row,
+)
+
+# Yükleme alt süreci bu modülü yeniden içe aktarır; aynı dosyayı ortam değişkeninden bulur.
+_db_path = os.environ.setdefault("BENCH_EXPORTS_DB", temp_sqlite_path("bench-exports-"))
+use_temp_database(path=_db_path)
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def seed(job_count: int) -> None:
+    # Ayrı süreçte çalışır; yükleme sırasında kullanılan bellek ölçüme karışmaz.
+    from sqlalchemy import create_engine, insert
+
+    from app.models.job_models import Job, JobStatus
+
+    engine = create_engine(temp_sqlite_url(path=_db_path, driver="sqlite"))
+    with engine.begin() as conn:
+        seed_reference_sync(conn, users=[
+            user_row(1, "admin@example.com", role_id=ADMIN_ROLE_ID, first_name="Admin"),
+            user_row(2, "bench@example.com"),
+        ])
+
+        start = datetime(2024, 1, 1)
+        statuses = [JobStatus.open, JobStatus.open, JobStatus.assigned, JobStatus.completed]
+        batch = []
+        for i in range(job_count):
+            batch.append({
+                "customer_id": 2, "service_id": 1, "district_id": 1,
+                "title": f"Benchmark ilanı {i}", "description": "Sentetik, \"tırnaklı\" ilan açıklaması\n" * 2,
+                "status": statuses[i % 4], "is_active": True, "created_at": start + timedelta(seconds=i),
+            })
+            if len(batch) == 10000:
+                conn.execute(insert(Job), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Job), batch)
+    engine.dispose()
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * _PAGE_SIZE / 2**20
+
+
+async def run_export(app, path: str, query: str, token: str, use_gzip: bool) -> dict:
+    headers = [(b"authorization", f"Bearer {token}".encode())]
+    if use_gzip:
+        headers.append((b"accept-encoding", b"gzip"))
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": query.encode(), "headers": headers,
+        "server": ("bench", 80), "client": ("127.0.0.1", 50000),
+    }
+    state = {"status": None, "bytes": 0, "raw_bytes": 0, "lines": 0, "chunks": 0, "peak_rss": rss_mb()}
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if use_gzip else None
+    request_sent = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            state["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            body = message.get("body", b"")
+            state["bytes"] += len(body)
+            raw = decompressor.decompress(body) if decompressor else body
+            state["raw_bytes"] += len(raw)
+            state["lines"] += raw.count(b"\n")
+            state["chunks"] += 1
+            if state["chunks"] % 20 == 0:
+                state["peak_rss"] = max(state["peak_rss"], rss_mb())
+            if not message.get("more_body", False):
+                disconnected.set()
+
+    await app(scope, receive, send)
+    state["peak_rss"] = max(state["peak_rss"], rss_mb())
+    return state
+
+
+async def main_async(args) -> int:
+    from app.main import app
+    from app.routers.auth import create_access_token
+
+    token = create_access_token({"sub": "admin@example.com", "role": "admin"})
+    query = f"format={args.format}"
+    try:
+        # Isınma: içe aktarmalar, bağlantı havuzu ve ilk sorgunun belleği ölçüme karışmasın.
+        await run_export(app, "/api/v1/admin/exports/jobs", query + "&created_to=2024-01-01T00:01:00", token, args.gzip)
+        baseline = rss_mb()
+        started = time.perf_counter()
+        result = await run_export(app, "/api/v1/admin/exports/jobs", query, token, args.gzip)
+        elapsed = time.perf_counter() - started
+    finally:
+        await dispose_engines()
+
+    growth = result["peak_rss"] - baseline
+    print(f"durum: {result['status']}  süre: {elapsed:.1f} s  satır sonu: {result['lines']}")
+    print(f"gönderilen: {result['bytes'] / 2**20:.1f} MB  (sıkıştırmasız {result['raw_bytes'] / 2**20:.1f} MB)")
+    print(f"RSS başlangıç: {baseline:.1f} MB  tepe: {result['peak_rss']:.1f} MB  artış: {growth:.1f} MB  (sınır {args.max_growth_mb} MB)")
+    if result["status"] != 200:
+        return 1
+    if growth > args.max_growth_mb:
+        print("HATA: Dışa aktarma sırasında bellek kullanımı sınırı aştı.")
+        return 1
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--max-growth-mb", type=float, default=50.0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    seeder = multiprocessing.get_context("spawn").Process(target=seed, args=(args.jobs,))
+    seeder.start()
+    seeder.join()
+    if seeder.exitcode != 0:
+        sys.exit(seeder.exitcode)
+    print(f"{args.jobs} ilan yüklendi ({time.perf_counter() - started:.1f} s)")
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
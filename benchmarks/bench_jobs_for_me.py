@@ -0,0 +1,155 @@
+"""
+"Bana uygun ilanlar" karşılaştırması: bellek içi eşleştirme indeksi vs SQL.
+
+Geçici bir SQLite dosyasına farklı büyüklüklerde ilan kümeleri (12 hizmet x 20 ilçe)
+ve abonelikleri olan sağlayıcılar yükler, ardından GET /api/v1/jobs/for-me rotasına
+(ASGI, ağsız) eşzamanlı istekler gönderir:
+
+- index: ilan kimlikleri app/job_matching.py indeksinden seçilir (varsayılan yol),
+- sql: indeks devre dışıyken kullanılan yedek sorgu
+  ((service_id, district_id) IN (...) + created_at sıralaması).
+
+Her ilan sayısı ve mod için saniyedeki istek, medyan / p95 süre ve ilk sayfanın iki
+modda aynı olup olmadığı yazdırılır.
+
+Kullanım:
+    python -m benchmarks.bench_jobs_for_me --jobs 1000 10000 100000 --requests 2000
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from benchmarks._harness import (
+    CUSTOMER_ROLE_ID, PROVIDER_ROLE_ID, app_client, seed_reference, use_temp_database, user_row,
+)
+
+use_temp_database("bench-for-me-")
+
+import httpx  # noqa: E402
+from sqlalchemy import delete, insert, text  # noqa: E402
+
+from app.database import AsyncSessionLocal, engine  # noqa: E402
+from app.job_matching import open_job_index  # noqa: E402
+from app.models.job_models import Job, JobStatus  # noqa: E402
+from app.models.provider_models import ProviderSubscription  # noqa: E402
+from app.routers.auth import create_access_token, principal_cache  # noqa: E402
+
+SERVICES, DISTRICTS = 12, 20
+
+
+async def seed_providers(providers: int, rng: random.Random) -> None:
+    async with engine.begin() as conn:
+        await seed_reference(
+            conn,
+            users=[
+                user_row(i, f"bench{i}@example.com", CUSTOMER_ROLE_ID if i == 1 else PROVIDER_ROLE_ID)
+                for i in range(1, providers + 2)
+            ],
+            provider_user_ids=range(2, providers + 2),
+            services=SERVICES, districts=DISTRICTS,
+        )
+        # Her sağlayıcı 1-3 hizmete, 2-6 ilçede abonedir.
+        subscriptions = []
+        for provider_id in range(1, providers + 1):
+            for service_id in rng.sample(range(1, SERVICES + 1), rng.randint(1, 3)):
+                for district_id in rng.sample(range(1, DISTRICTS + 1), rng.randint(2, 6)):
+                    subscriptions.append({"provider_id": provider_id, "service_id": service_id, "district_id": district_id})
+        await conn.execute(insert(ProviderSubscription), subscriptions)
+
+
+async def seed_jobs(count: int, rng: random.Random) -> None:
+    # Çoğunluk açık; bir kısmı atanmış veya tamamlanmış ilanlar.
+    statuses = [JobStatus.open] * 3 + [JobStatus.assigned, JobStatus.completed]
+    started = datetime(2024, 1, 1)
+    async with engine.begin() as conn:
+        await conn.execute(delete(Job))
+        rows = [{
+            "id": i, "customer_id": 1,
+            "service_id": rng.randint(1, SERVICES), "district_id": rng.randint(1, DISTRICTS),
+            "title": f"Benchmark ilanı {i}", "description": "Sentetik ilan açıklaması",
+            "status": rng.choice(statuses), "created_at": started + timedelta(seconds=i),
+        } for i in range(1, count + 1)]
+        for start in range(0, len(rows), 5000):
+            await conn.execute(insert(Job), rows[start:start + 5000])
+        await conn.execute(text("ANALYZE"))
+    async with AsyncSessionLocal() as session:
+        await open_job_index.rebuild(session)
+
+
+async def run(client: httpx.AsyncClient, args, tokens) -> dict:
+    rng = random.Random(42)
+    plan = [rng.choice(tokens) for _ in range(args.requests)]
+    samples = []
+    next_index = 0
+
+    async def worker():
+        nonlocal next_index
+        while next_index < len(plan):
+            token = plan[next_index]
+            next_index += 1
+            started = time.perf_counter()
+            response = await client.get("/api/v1/jobs/for-me?limit=20", headers={"Authorization": f"Bearer {token}"})
+            samples.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.text
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    samples.sort()
+    return {
+        "rps": len(samples) / elapsed,
+        "median_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[int(len(samples) * 0.95) - 1] * 1000,
+    }
+
+
+async def first_page(client: httpx.AsyncClient, token: str) -> list:
+    response = await client.get("/api/v1/jobs/for-me?limit=20", headers={"Authorization": f"Bearer {token}"})
+    return [job["id"] for job in response.json()]
+
+
+async def main_async(args) -> None:
+    logging.disable(logging.WARNING)
+    rng = random.Random(7)
+    await seed_providers(args.providers, rng)
+    tokens = [
+        create_access_token({"sub": f"bench{i}@example.com", "role": "provider", "uid": i, "ver": 0})
+        for i in range(2, args.providers + 2)
+    ]
+
+    print(f"{'ilan':>8} | {'mod':>5} | {'istek/sn':>9} | {'medyan (ms)':>11} | {'p95 (ms)':>9} | {'aynı sonuç':>10}")
+    print("-" * 68)
+    async with app_client() as client:
+        for count in args.jobs:
+            await seed_jobs(count, rng)
+            principal_cache.clear()
+            pages = {}
+            for mode in ("index", "sql"):
+                open_job_index.ready = mode == "index"
+                pages[mode] = [await first_page(client, token) for token in tokens[:20]]
+                result = await run(client, args, tokens)
+                same = "evet" if mode == "index" or pages["sql"] == pages["index"] else "HAYIR"
+                print(
+                    f"{count:>8} | {mode:>5} | {result['rps']:>9.0f} | {result['median_ms']:>11.2f} | "
+                    f"{result['p95_ms']:>9.2f} | {same:>10}"
+                )
+            open_job_index.ready = True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--providers", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+GET /api/v1/jobs sayfalama karşılaştırması: OFFSET vs keyset (cursor).
+
+Yerel bir SQLite dosyasına sentetik ilanlar yükler ve aynı sorgu üreticisini
+(jobs_router.open_jobs_page_query) kullanarak farklı sayfa derinliklerinde
+sorgu sürelerini ölçer. Keyset modunda süre sayfa derinliğinden bağımsız
+(düz) kalmalıdır.
+
+Kullanım:
+    python -m benchmarks.bench_jobs_pagination --jobs 100000 --limit 20
+"""
+
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.job_models import Job
+from app.routers.jobs_router import open_jobs_page_query
+from benchmarks._harness import seed_reference_sync, temp_sqlite_url, user_row
+
+
+def seed(engine, job_count: int) -> None:
+    with engine.begin() as conn:
+        seed_reference_sync(conn, users=[user_row(1, "bench@example.com")])
+
+        start = datetime(2024, 1, 1)
+        batch = []
+        for i in range(job_count):
+            batch.append({
+                "customer_id": 1, "service_id": 1, "district_id": 1,
+                "title": f"Benchmark ilanı {i}", "description": "Sentetik ilan açıklaması " * 2,
+                "status": "open", "is_active": True,
+                # Aynı created_at değerine sahip satırlar da olsun (id ile ayrışmalı).
+                "created_at": start + timedelta(seconds=i // 3),
+            })
+            if len(batch) == 5000:
+                conn.execute(insert(Job), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(Job), batch)
+
+
+def time_query(session: Session, query, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        session.execute(query).unique().scalars().all()
+        samples.append(time.perf_counter() - started)
+        session.expunge_all()
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 10, 100, 1000])
+    args = parser.parse_args()
+
+    engine = create_engine(temp_sqlite_url("bench-jobs-", driver="sqlite"))
+    seed(engine, max(args.jobs, args.limit * max(args.pages)))
+
+    print(f"{'sayfa':>6} {'offset (ms)':>12} {'keyset (ms)':>12}")
+    with Session(engine) as session:
+        for page in args.pages:
+            skip = (page - 1) * args.limit
+            offset_ms = time_query(session, open_jobs_page_query(args.limit, skip=skip), args.repeat)
+
+            after = None
+            if skip:
+                # Bir önceki sayfanın son satırı = istemcinin elindeki imleç.
+                anchor = session.execute(
+                    select(Job.created_at, Job.id)
+                    .filter(Job.is_active == True, Job.status == 'open')
+                    .order_by(Job.created_at.desc(), Job.id.desc())
+                    .offset(skip - 1).limit(1)
+                ).one()
+                after = [anchor.created_at, anchor.id]
+            keyset_ms = time_query(session, open_jobs_page_query(args.limit, after=after), args.repeat)
+            print(f"{page:>6} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
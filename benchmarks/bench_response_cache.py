@@ -0,0 +1,127 @@
+"""
+Yanıt önbelleği karşılaştırması: önbelleksiz vs memory vs redis (sahte RESP sunucusu).
+
+Geçici bir SQLite dosyasına sentetik ilanlar yükler ve uygulamaya (ASGI, ağsız)
+sıcak okuma trafiği gönderir: ilan detayı ve GET /api/v1/jobs ilk sayfaları.
+Her --write-every okumada bir yeni ilan oluşturulur; böylece create_job
+sonrası liste girdilerinin geçersiz kılınması da ölçüme dahil olur.
+
+Her arka uç için medyan / p95 istek süresi ve önbellek isabet oranı yazdırılır.
+redis arka ucu, benchmarks.fake_resp_server ile aynı süreçte başlatılan sahte
+sunucuya bağlanır (gerçek bir Redis için --redis-url verilebilir).
+
+Kullanım:
+    python -m benchmarks.bench_response_cache --jobs 2000 --requests 2000
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import statistics
+import time
+
+from benchmarks._harness import app_client, seed_reference, use_temp_database, user_row
+
+use_temp_database("bench-cache-")
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.database import engine  # noqa: E402
+from app.models.job_models import Job  # noqa: E402
+from app.response_cache import MemoryCacheBackend, RedisCacheBackend, response_cache  # noqa: E402
+from app.routers.auth import create_access_token  # noqa: E402
+from benchmarks.fake_resp_server import FakeRespServer  # noqa: E402
+
+
+async def seed(job_count: int) -> None:
+    async with engine.begin() as conn:
+        await seed_reference(conn, users=[user_row(1, "bench@example.com")])
+        await conn.execute(insert(Job), [{
+            "customer_id": 1, "service_id": 1, "district_id": 1,
+            "title": f"Benchmark ilanı {i}", "description": "Sentetik ilan açıklaması " * 4,
+        } for i in range(job_count)])
+
+
+def hot_paths(job_count: int, rng: random.Random) -> str:
+    # Trafiğin çoğu ilk sayfalara ve az sayıda popüler ilana gider.
+    if rng.random() < 0.5:
+        return f"/api/v1/jobs/{rng.randint(1, min(50, job_count))}"
+    return f"/api/v1/jobs/?limit={rng.choice([20, 20, 20, 50])}"
+
+
+async def run(client: httpx.AsyncClient, args, headers) -> dict:
+    rng = random.Random(42)
+    samples = []
+    for i in range(args.requests):
+        if args.write_every and i and i % args.write_every == 0:
+            response = await client.post("/api/v1/jobs/", headers=headers, json={
+                "service_id": 1, "district_id": 1, "title": f"Yeni ilan {i}",
+                "description": "Benchmark sırasında oluşturulan ilan açıklaması",
+            })
+            assert response.status_code == 201, response.text
+        path = hot_paths(args.jobs, rng)
+        started = time.perf_counter()
+        response = await client.get(path)
+        samples.append(time.perf_counter() - started)
+        assert response.status_code == 200, response.text
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[int(len(samples) * 0.95) - 1] * 1000,
+    }
+
+
+async def main_async(args) -> None:
+    logging.disable(logging.INFO)
+    await seed(args.jobs)
+    fake = None
+    redis_url = args.redis_url
+    if redis_url is None:
+        fake = await FakeRespServer().start()
+        redis_url = fake.url
+
+    backends = {
+        "none": None,
+        "memory": lambda: MemoryCacheBackend(max_entries=args.max_entries, ttl_seconds=60),
+        "redis": lambda: RedisCacheBackend(redis_url),
+    }
+    headers = {"Authorization": "Bearer " + create_access_token({"sub": "bench@example.com", "role": "customer"})}
+
+    print(f"{'arka uç':>8} | {'medyan (ms)':>11} | {'p95 (ms)':>9} | {'isabet':>7} | {'geçersiz kılınan':>16}")
+    print("-" * 64)
+    try:
+        async with app_client() as client:
+            for name, factory in backends.items():
+                # Aynı (uygulama genelindeki) önbellek nesnesinin arka ucu değiştirilir.
+                await response_cache.close()
+                response_cache.__init__(
+                    factory() if factory else MemoryCacheBackend(),
+                    ttl_seconds=60, stale_seconds=30, enabled=factory is not None,
+                )
+                result = await run(client, args, headers)
+                stats = await response_cache.stats()
+                print(
+                    f"{name:>8} | {result['median_ms']:>11.2f} | {result['p95_ms']:>9.2f} | "
+                    f"{stats['hit_ratio']:>6.1%} | {stats['invalidated_entries']:>16}"
+                )
+    finally:
+        await response_cache.close()
+        if fake is not None:
+            await fake.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--write-every", type=int, default=200)
+    parser.add_argument("--max-entries", type=int, default=2048)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+İlan listesi serileştirme karşılaştırması: FastAPI response_model yolu vs doğrulamasız orjson yolu.
+
+Bellekte sentetik Job nesneleri üretir ve GET /api/v1/jobs yanıt gövdesinin
+üretim süresini iki yolla ölçer:
+
+- before: Eski rota gibi sözlük listesi döndürülür; FastAPI bunu response_model
+  (List[JobListResponse]) ile doğrular, JSON uyumlu Python nesnelerine çevirir ve
+  JSONResponse ile json.dumps'a verir.
+- after:  jobs_router.job_list_item ile şemaya uygun sözlükler (hizmet/ilçe için
+  önceden JSON uyumlu hale getirilmiş referans kayıtları) üretilir ve doğrulama
+  yapılmadan orjson ile tek adımda JSON baytlarına dökülür.
+
+Veritabanı sorgusu ölçüme dahil değildir; yalnızca serileştirme maliyeti ölçülür.
+
+Kullanım:
+    python -m benchmarks.bench_serialization --sizes 100 1000 --repeat 50
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models.job_models import Job, JobStatus
+from app.models import review_models  # noqa: F401  (User.reviews_given ilişkisi için)
+from app.reference_data import reference_data, ReferenceSnapshot
+from app.routers.jobs_router import job_list_item
+from app.schemas import category_schema, district_schema, job_schemas
+from app.serialization import trusted_json_response
+
+
+def install_reference_data() -> None:
+    # Veritabanı olmadan referans veri deposunu doldur.
+    service = category_schema.Service(id=1, category_id=1, name="Ev Temizliği", slug="ev-temizligi")
+    district = district_schema.District(id=1, name="Kadıköy", city_name="İstanbul")
+    reference_data._snapshot = ReferenceSnapshot(
+        version=1,
+        loaded_at=datetime.now(timezone.utc),
+        services={1: service},
+        districts={1: district},
+        services_json={1: service.model_dump(mode="json")},
+        districts_json={1: district.model_dump(mode="json")},
+    )
+
+
+def make_jobs(count: int) -> List[Job]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        Job(
+            id=i + 1, customer_id=1, service_id=1, district_id=1,
+            title=f"Benchmark ilanı {i}", description="Sentetik ilan açıklaması " * 4,
+            status=JobStatus.open, is_active=True, created_at=start + timedelta(seconds=i),
+        )
+        for i in range(count)
+    ]
+
+
+def legacy_item(job: Job) -> dict:
+    # Eski job_list_item: şema doğrulamasını FastAPI'ye bırakan sözlük.
+    return {
+        "id": job.id, "title": job.title, "description": job.description,
+        "service_id": job.service_id, "district_id": job.district_id,
+        "status": job.status, "created_at": job.created_at,
+        "service": reference_data.service(job.service_id),
+        "district": reference_data.district(job.district_id),
+    }
+
+
+async def before(field, jobs: List[Job]) -> bytes:
+    content = await serialize_response(field=field, response_content=[legacy_item(job) for job in jobs])
+    return JSONResponse(content).body
+
+
+def after(jobs: List[Job]) -> bytes:
+    return trusted_json_response([job_list_item(job) for job in jobs]).body
+
+
+def median_ms(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    install_reference_data()
+    field = create_model_field(name="Response_get_all_jobs", type_=List[job_schemas.JobListResponse], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    print(f"{'ilan':>6} | {'before (ms)':>12} | {'after (ms)':>11} | {'hızlanma':>8}")
+    print("-" * 48)
+    for size in args.sizes:
+        jobs = make_jobs(size)
+        # Her iki yol da aynı JSON içeriğini üretmeli.
+        assert json.loads(loop.run_until_complete(before(field, jobs))) == json.loads(after(jobs))
+
+        before_ms = median_ms(lambda: loop.run_until_complete(before(field, jobs)), args.repeat)
+        after_ms = median_ms(lambda: after(jobs), args.repeat)
+        print(f"{size:>6} | {before_ms:>12.2f} | {after_ms:>11.2f} | {before_ms / after_ms:>7.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
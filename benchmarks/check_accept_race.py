@@ -0,0 +1,127 @@
+"""
+Teklif kabulü eşzamanlılık kontrolü: aynı ilanın iki farklı teklifi aynı anda kabul
+edildiğinde yalnızca biri başarılı olmalıdır.
+
+Her turda yeni bir açık ilan ve üç sağlayıcıdan bekleyen teklifler oluşturulur;
+ardından ilk iki teklif için PATCH /api/v1/offers/{id}/accept istekleri
+asyncio.gather ile aynı anda gönderilir. Beklenen sonuç:
+
+- yanıtlardan tam olarak biri 200, diğeri 409 (veya ikinci istek ilk işlem commit
+  edildikten sonra kilidi aldıysa 400 — ilan artık 'open' değildir),
+- ilan 'assigned' durumundadır,
+- tam olarak bir teklif 'accepted', diğer tüm teklifler 'rejected' durumundadır.
+
+Uygulama süreç içinde (httpx.ASGITransport) yaşam döngüsüyle başlatılır. Betik,
+herhangi bir turda beklenti bozulursa hata koduyla çıkar.
+
+Kullanım:
+    python -m benchmarks.check_accept_race --rounds 50
+    DATABASE_URL=mysql+aiomysql://.../bos_test_db python -m benchmarks.check_accept_race --database-url-from-env
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from collections import Counter
+
+from benchmarks._harness import (
+    CUSTOMER_ROLE_ID, DATABASE_FROM_ENV_FLAG, PROVIDER_ROLE_ID, app_client, seed_reference, use_temp_database, user_row,
+)
+
+use_temp_database("accept-race-", allow_env=True)
+
+import httpx  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+
+from app.database import AsyncSessionLocal, engine  # noqa: E402
+from app.models.job_models import Job, JobStatus, Offer, OfferStatus  # noqa: E402
+from app.routers.auth import create_access_token  # noqa: E402
+
+CUSTOMER_ID = 1
+PROVIDER_USER_IDS = (2, 3, 4)
+
+
+async def seed() -> None:
+    async with engine.begin() as conn:
+        await seed_reference(conn, users=[
+            user_row(user_id, f"race{user_id}@example.com", CUSTOMER_ROLE_ID if user_id == CUSTOMER_ID else PROVIDER_ROLE_ID)
+            for user_id in (CUSTOMER_ID, *PROVIDER_USER_IDS)
+        ], provider_user_ids=PROVIDER_USER_IDS)
+
+
+async def new_job_with_offers() -> tuple:
+    """Açık bir ilan ve her sağlayıcıdan bir bekleyen teklif oluşturur; (job_id, offer_id'ler) döndürür."""
+    async with AsyncSessionLocal() as session:
+        job = Job(
+            customer_id=CUSTOMER_ID, service_id=1, district_id=1,
+            title="Eşzamanlılık kontrol ilanı", description="Aynı anda iki kabul denemesi",
+        )
+        session.add(job)
+        await session.flush()
+        offers = [
+            Offer(job_id=job.id, provider_id=provider_id, offer_price=500 + provider_id)
+            for provider_id in range(1, len(PROVIDER_USER_IDS) + 1)
+        ]
+        session.add_all(offers)
+        await session.commit()
+        return job.id, [offer.id for offer in offers]
+
+
+async def check_round(client: httpx.AsyncClient, headers: dict, outcomes: Counter) -> list:
+    job_id, offer_ids = await new_job_with_offers()
+    responses = await asyncio.gather(*(
+        client.patch(f"/api/v1/offers/{offer_id}/accept", headers=headers) for offer_id in offer_ids[:2]
+    ))
+    codes = sorted(response.status_code for response in responses)
+    outcomes[tuple(codes)] += 1
+
+    async with AsyncSessionLocal() as session:
+        job_status = (await session.execute(select(Job.status).where(Job.id == job_id))).scalar_one()
+        offer_statuses = Counter((await session.execute(
+            select(Offer.status).where(Offer.job_id == job_id)
+        )).scalars().all())
+
+    problems = []
+    if codes not in ([200, 409], [200, 400]):
+        problems.append(f"yanıt kodları {codes}")
+    if job_status != JobStatus.assigned:
+        problems.append(f"ilan durumu {job_status.value}")
+    if offer_statuses[OfferStatus.accepted] != 1 or offer_statuses[OfferStatus.rejected] != len(offer_ids) - 1:
+        problems.append(f"teklif durumları {dict((s.value, n) for s, n in offer_statuses.items())}")
+    return [f"ilan {job_id}: {problem}" for problem in problems]
+
+
+async def main_async(args) -> int:
+    logging.disable(logging.WARNING)
+    await seed()
+    headers = {"Authorization": "Bearer " + create_access_token({
+        "sub": f"race{CUSTOMER_ID}@example.com", "role": "customer", "uid": CUSTOMER_ID, "ver": 0,
+    })}
+
+    problems, outcomes = [], Counter()
+    async with app_client(base_url="http://race", raise_app_exceptions=False) as client:
+        for _ in range(args.rounds):
+            problems.extend(await check_round(client, headers, outcomes))
+
+    print("Yanıt kodları: " + ", ".join(f"{codes}: {count} tur" for codes, count in sorted(outcomes.items())))
+    for problem in problems:
+        print(f"HATA: {problem}")
+    if problems:
+        print(f"\nBAŞARISIZ: {len(problems)} sorun ({args.rounds} tur).")
+        return 1
+    print(f"Tamam: {args.rounds} turda her seferinde tek kabul başarılı, diğer teklifler reddedildi.")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Eşzamanlı teklif kabulü kontrolü")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument(DATABASE_FROM_ENV_FLAG, action="store_true",
+                        help="Geçici SQLite yerine DATABASE_URL'deki (boş, test amaçlı) veritabanını kullan")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
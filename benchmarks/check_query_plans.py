@@ -0,0 +1,414 @@
+"""
+Sorgu planı regresyon kontrolü: sık kullanılan uç noktaların ürettiği her SQL
+ifadesi, büyük bir sentetik veri kümesinde EXPLAIN ile incelenir ve tam tablo
+taraması yapan ifade varsa betik hata koduyla çıkar.
+
+Uygulama süreç içinde (httpx.ASGITransport) yaşam döngüsüyle başlatılır. Her uç
+nokta çağrılırken çalışan ifadeler query_stats gözlemcisiyle yakalanır; ardından
+her ifade, aynı parametrelerle ve çalıştığı motorda açıklanır:
+
+    SQLite  EXPLAIN QUERY PLAN: 'SCAN <tablo>' (indekssiz) ve 'AUTOMATIC ... INDEX'
+            (sorgu için geçici indeks kurulması) tam tarama sayılır.
+    MySQL   EXPLAIN: type = ALL tam tarama sayılır.
+
+Başlangıçta belleğe yüklenen küçük referans tabloları (roller, kategoriler,
+hizmetler, ilçeler) kontrol dışıdır. Dosya sıralaması (USE TEMP B-TREE /
+Using filesort) uyarı olarak raporlanır ama başarısızlık sayılmaz.
+
+Yeni bir uç nokta ya da sorgu eklendiğinde CASES listesine eklenmeli; eksik
+indeks app/migrations altında yeni bir migration ile giderilmelidir.
+
+Kullanım:
+    python -m benchmarks.check_query_plans
+    python -m benchmarks.check_query_plans --jobs 200000 --verbose
+    DATABASE_URL=mysql+aiomysql://.../bos_test_db python -m benchmarks.check_query_plans --database-url-from-env
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from benchmarks._harness import (
+    CUSTOMER_ROLE_ID, DATABASE_FROM_ENV_FLAG, PROVIDER_ROLE_ID, app_client, seed_reference, use_temp_database,
+    user_row,
+)
+
+use_temp_database("plan-check-", allow_env=True)
+
+import httpx  # noqa: E402
+from sqlalchemy import insert, text  # noqa: E402
+
+from app.database import engine, read_engine  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.job_models import Job, JobStatus, Offer, OfferStatus  # noqa: E402
+from app.models.provider_models import ProviderSubscription  # noqa: E402
+from app.models.review_models import Review  # noqa: E402
+from app.passwords import hash_password  # noqa: E402
+from app.query_stats import add_statement_observer, fingerprint  # noqa: E402
+from app.routers.auth import create_access_token  # noqa: E402
+from app.slow_queries import slow_query_log  # noqa: E402
+
+PASSWORD = "plan-kontrol-parola"
+
+# Uygulama başlarken belleğe yüklenen küçük tablolar; taranmaları beklenir.
+REFERENCE_TABLES = {"roles", "categories", "services", "districts"}
+
+_ALIAS_RE = re.compile(r"\b(?:FROM|JOIN)\s+[`\"]?(\w+)[`\"]?\s+AS\s+[`\"]?(\w+)", re.IGNORECASE)
+_SQLITE_SCAN_RE = re.compile(r"^SCAN (\w+)(.*)$")
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+# ----------------------------------------------------------------------
+# Veri yükleme
+# ----------------------------------------------------------------------
+@dataclass
+class Dataset:
+    customer_ids: List[int]
+    provider_user_ids: List[int]
+    emails: Dict[int, str]
+    job_owner: Dict[int, int]
+    open_job_ids: List[int]
+    # Kabul edilebilecek bekleyen teklif: (offer_id, job_id)
+    pending_offer: Tuple[int, int] = (0, 0)
+    # Değerlendirilebilir (tamamlanmış, değerlendirmesiz) ilan: (job_id, customer_id)
+    reviewable: Tuple[int, int] = (0, 0)
+    reviewed_provider_id: int = 1
+
+
+async def seed(args, rng: random.Random) -> Dataset:
+    password_hash = hash_password(PASSWORD)
+    customer_ids = list(range(1, args.customers + 1))
+    provider_user_ids = list(range(args.customers + 1, args.customers + args.providers + 1))
+    provider_ids = list(range(1, args.providers + 1))
+    emails = {user_id: f"user{user_id}@plans.example.com" for user_id in customer_ids + provider_user_ids}
+
+    jobs, offers, reviews = [], [], []
+    job_owner, open_job_ids, reviewable = {}, [], []
+    # Durum dağılımı: çoğunluk açık; bir kısmı atanmış, tamamlanmış ya da pasif.
+    statuses = [JobStatus.open] * 6 + [JobStatus.assigned, JobStatus.completed, JobStatus.completed, JobStatus.cancelled]
+    offer_id = 0
+    for job_id in range(1, args.jobs + 1):
+        customer_id = rng.choice(customer_ids)
+        job_status = rng.choice(statuses)
+        job_owner[job_id] = customer_id
+        jobs.append({
+            "id": job_id, "customer_id": customer_id,
+            "service_id": rng.randint(1, 12), "district_id": rng.randint(1, 20),
+            "title": f"İlan {job_id} {rng.choice(['temizlik', 'boya', 'tesisat', 'bahçe', 'nakliyat'])}",
+            "description": "Sorgu planı kontrolü için sentetik ilan.",
+            "status": job_status, "is_active": rng.random() > 0.05,
+        })
+        if job_status == JobStatus.open:
+            open_job_ids.append(job_id)
+        # İlanların bir kısmına birkaç sağlayıcıdan teklif gelir.
+        if rng.random() < args.offer_ratio:
+            chosen = rng.sample(provider_ids, min(len(provider_ids), rng.randint(1, 6)))
+            for index, provider_id in enumerate(chosen):
+                offer_id += 1
+                accepted = job_status in (JobStatus.assigned, JobStatus.completed) and index == 0
+                offers.append({
+                    "id": offer_id, "job_id": job_id, "provider_id": provider_id,
+                    "offer_price": rng.randint(200, 5000),
+                    "status": OfferStatus.accepted if accepted else (
+                        OfferStatus.pending if job_status == JobStatus.open else OfferStatus.rejected
+                    ),
+                })
+                if accepted and job_status == JobStatus.completed:
+                    if rng.random() < 0.8:
+                        reviews.append({
+                            "job_id": job_id, "provider_id": provider_id, "customer_id": customer_id,
+                            "rating": rng.randint(1, 5), "comment": "Sentetik değerlendirme",
+                        })
+                    else:
+                        reviewable.append((job_id, customer_id))
+
+    # Her sağlayıcı birkaç hizmet ve ilçedeki ilanlara abonedir ("bana uygun ilanlar" akışı).
+    subscriptions = []
+    for provider_id in provider_ids:
+        for service_id in rng.sample(range(1, 13), rng.randint(1, 3)):
+            for district_id in rng.sample(range(1, 21), rng.randint(1, 5)):
+                subscriptions.append({"provider_id": provider_id, "service_id": service_id, "district_id": district_id})
+
+    async with engine.begin() as conn:
+        await seed_reference(
+            conn,
+            users=[
+                user_row(
+                    user_id, emails[user_id],
+                    role_id=CUSTOMER_ROLE_ID if user_id <= args.customers else PROVIDER_ROLE_ID,
+                    password_hash=password_hash, first_name="Plan", last_name=f"Kullanıcı {user_id}",
+                )
+                for user_id in customer_ids + provider_user_ids
+            ],
+            provider_user_ids=provider_user_ids,
+            services=12,
+            districts=[
+                (district_id, f"İlçe {district_id}", "İstanbul" if district_id <= 10 else "Ankara")
+                for district_id in range(1, 21)
+            ],
+        )
+        await conn.execute(insert(ProviderSubscription), subscriptions)
+        for table, rows in ((Job, jobs), (Offer, offers), (Review, reviews)):
+            for start in range(0, len(rows), 5000):
+                await conn.execute(insert(table), rows[start:start + 5000])
+        # Planlayıcı istatistikleri: üretimdeki gibi seçicilik bilgisine göre plan seçilsin.
+        if engine.dialect.name == "sqlite":
+            await conn.execute(text("ANALYZE"))
+        elif engine.dialect.name == "mysql":
+            await conn.execute(text("ANALYZE TABLE jobs, offers, reviews, users, providers, provider_subscriptions"))
+
+    pending = next((offer["id"], offer["job_id"]) for offer in offers if offer["status"] == OfferStatus.pending)
+    return Dataset(
+        customer_ids, provider_user_ids, emails, job_owner, open_job_ids,
+        pending_offer=pending,
+        reviewable=reviewable[0] if reviewable else (0, 0),
+        reviewed_provider_id=reviews[0]["provider_id"] if reviews else 1,
+    )
+
+
+# ----------------------------------------------------------------------
+# Kontrol edilen uç noktalar
+# ----------------------------------------------------------------------
+@dataclass
+class Case:
+    name: str
+    method: str
+    # Dataset -> (url, kullanıcı id'si veya None, JSON gövde veya None)
+    build: Callable[[Dataset], Tuple[str, Optional[int], Optional[dict]]]
+    expected: Tuple[int, ...] = (200,)
+
+
+def _job_with_offers(data: Dataset) -> int:
+    return data.pending_offer[1]
+
+
+CASES: List[Case] = [
+    Case("GET /jobs", "GET", lambda d: ("/api/v1/jobs/?limit=20", None, None)),
+    Case("GET /jobs (2. sayfa)", "GET", lambda d: ("/api/v1/jobs/?limit=20&skip=40", None, None)),
+    Case("GET /jobs/search", "GET", lambda d: ("/api/v1/jobs/search?q=temizlik", None, None)),
+    Case("GET /jobs/search (hizmet)", "GET", lambda d: ("/api/v1/jobs/search?service_id=3", None, None)),
+    Case("GET /jobs/search (ilçe)", "GET", lambda d: ("/api/v1/jobs/search?district_id=7", None, None)),
+    Case("GET /jobs/search (şehir)", "GET", lambda d: ("/api/v1/jobs/search?city_name=Ankara&q=boya", None, None)),
+    Case("GET /jobs/{id}", "GET", lambda d: (f"/api/v1/jobs/{d.open_job_ids[len(d.open_job_ids) // 2]}", None, None)),
+    Case("POST /jobs", "POST", lambda d: ("/api/v1/jobs/", d.customer_ids[0], {
+        "title": "Plan kontrol ilanı", "description": "Sorgu planı kontrolü için yeni ilan", "service_id": 1, "district_id": 1,
+    }), expected=(201,)),
+    Case("POST /jobs/{id}/offers", "POST", lambda d: (
+        f"/api/v1/jobs/{d.open_job_ids[-1]}/offers", d.provider_user_ids[-1],
+        {"offer_price": 750, "message": "Plan kontrol teklifi"},
+    ), expected=(201, 400)),
+    Case("GET /jobs/{id}/offers", "GET", lambda d: (
+        f"/api/v1/jobs/{_job_with_offers(d)}/offers", d.job_owner[_job_with_offers(d)], None,
+    )),
+    Case("GET /jobs/{id}/offers (rating)", "GET", lambda d: (
+        f"/api/v1/jobs/{_job_with_offers(d)}/offers?sort=rating&status=pending", d.job_owner[_job_with_offers(d)], None,
+    )),
+    Case("PATCH /offers/{id}/accept", "PATCH", lambda d: (
+        f"/api/v1/offers/{d.pending_offer[0]}/accept", d.job_owner[d.pending_offer[1]], None,
+    )),
+    Case("POST /jobs/{id}/reviews", "POST", lambda d: (
+        f"/api/v1/jobs/{d.reviewable[0]}/reviews", d.reviewable[1], {"rating": 5, "comment": "Plan kontrolü"},
+    ), expected=(201,)),
+    Case("GET /providers/{id}/reviews", "GET", lambda d: (
+        f"/api/v1/providers/{d.reviewed_provider_id}/reviews", None, None,
+    )),
+    Case("GET /providers/me/subscriptions", "GET", lambda d: (
+        "/api/v1/providers/me/subscriptions", d.provider_user_ids[0], None,
+    )),
+    Case("PUT /providers/me/subscriptions", "PUT", lambda d: (
+        "/api/v1/providers/me/subscriptions", d.provider_user_ids[1], {"service_ids": [2, 4], "district_ids": [3, 8, 11]},
+    )),
+    Case("GET /jobs/for-me", "GET", lambda d: ("/api/v1/jobs/for-me?limit=20", d.provider_user_ids[0], None)),
+    Case("PATCH /jobs/{id}/cancel", "PATCH", lambda d: (
+        f"/api/v1/jobs/{d.open_job_ids[0]}/cancel", d.job_owner[d.open_job_ids[0]], None,
+    ), expected=(200, 400)),
+    Case("POST /auth/login", "POST", lambda d: (
+        "/api/v1/auth/login", None, {"email": d.emails[d.customer_ids[1]], "password": PASSWORD},
+    )),
+    Case("GET /auth/me", "GET", lambda d: ("/api/v1/auth/me", d.customer_ids[2], None)),
+]
+
+
+# ----------------------------------------------------------------------
+# İfade yakalama ve EXPLAIN
+# ----------------------------------------------------------------------
+@dataclass
+class Captured:
+    case: str
+    sync_engine: Any
+    statement: str
+    parameters: Any
+    plan: List[dict] = field(default_factory=list)
+    full_scans: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+
+class StatementCollector:
+    """Etiket verildiği sürece çalışan açıklanabilir ifadeleri (tekilleştirerek) toplar."""
+
+    def __init__(self):
+        self.label: Optional[str] = None
+        self.statements: List[Captured] = []
+        self.counts: Dict[str, int] = defaultdict(int)
+        self._seen = set()
+
+    def __call__(self, conn, cursor, statement, parameters, executemany, elapsed):
+        if self.label is None:
+            return
+        self.counts[self.label] += 1
+        if not statement.lstrip().upper().startswith(_EXPLAINABLE):
+            return
+        key = (self.label, fingerprint(statement))
+        if key in self._seen:
+            return
+        self._seen.add(key)
+        if executemany:
+            parameters = parameters[0] if parameters else ()
+        self.statements.append(Captured(self.label, conn.engine, statement, parameters))
+
+
+def _aliases(statement: str) -> Dict[str, str]:
+    return {alias: table for table, alias in _ALIAS_RE.findall(statement)}
+
+
+def analyze_plan(dialect: str, captured: Captured) -> None:
+    aliases = _aliases(captured.statement)
+    for row in captured.plan:
+        if dialect == "sqlite":
+            detail = row.get("detail", "")
+            match = _SQLITE_SCAN_RE.match(detail)
+            if match:
+                name, rest = match.groups()
+                table = aliases.get(name, name)
+                if "INDEX" not in rest and "PRIMARY KEY" not in rest and table not in REFERENCE_TABLES and _is_table(table):
+                    captured.full_scans.append(f"{table}: {detail}")
+            if "AUTOMATIC" in detail and "INDEX" in detail:
+                captured.full_scans.append(f"geçici indeks: {detail}")
+            if "TEMP B-TREE" in detail:
+                captured.warnings.append(detail)
+        else:
+            table = aliases.get(row.get("table") or "", row.get("table") or "")
+            if row.get("type") == "ALL" and table not in REFERENCE_TABLES and _is_table(table):
+                captured.full_scans.append(f"{table}: type=ALL rows={row.get('rows')}")
+            if "filesort" in (row.get("Extra") or ""):
+                captured.warnings.append(f"{table}: {row.get('Extra')}")
+
+
+def _is_table(name: str) -> bool:
+    # Alt sorgu / CTE adları (anon_1, <derived2> vb.) gerçek tablo değildir.
+    return name in Base.metadata.tables
+
+
+async def explain_all(collector: StatementCollector) -> None:
+    engines = {engine.sync_engine: engine, read_engine.sync_engine: read_engine}
+    for captured in collector.statements:
+        async_engine = engines.get(captured.sync_engine, engine)
+        dialect = async_engine.dialect.name
+        prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+        async with async_engine.connect() as conn:
+            result = await conn.exec_driver_sql(prefix + captured.statement, captured.parameters or ())
+            captured.plan = [dict(row) for row in result.mappings().all()]
+        analyze_plan(dialect, captured)
+
+
+# ----------------------------------------------------------------------
+# Çalıştırma
+# ----------------------------------------------------------------------
+async def run_cases(client: httpx.AsyncClient, data: Dataset, collector: StatementCollector) -> List[str]:
+    problems = []
+    for case in CASES:
+        url, user_id, body = case.build(data)
+        headers = {}
+        if user_id is not None:
+            role = "customer" if user_id in data.customer_ids else "provider"
+            headers["Authorization"] = "Bearer " + create_access_token({"sub": data.emails[user_id], "role": role})
+        collector.label = case.name
+        try:
+            response = await client.request(case.method, url, headers=headers, json=body)
+        finally:
+            collector.label = None
+        if response.status_code not in case.expected:
+            problems.append(f"{case.name}: beklenmeyen yanıt {response.status_code} {response.text[:200]}")
+    return problems
+
+
+def print_report(collector: StatementCollector, verbose: bool) -> int:
+    by_case: Dict[str, List[Captured]] = defaultdict(list)
+    for captured in collector.statements:
+        by_case[captured.case].append(captured)
+
+    failures = 0
+    header = f"{'uç nokta':<34} | {'sorgu':>5} | {'tam tarama':>10} | {'sıralama uyarısı':>16}"
+    print(header)
+    print("-" * len(header))
+    for case in CASES:
+        statements = by_case.get(case.name, [])
+        scans = sum(len(c.full_scans) for c in statements)
+        warnings = sum(len(c.warnings) for c in statements)
+        failures += scans
+        print(f"{case.name:<34} | {collector.counts.get(case.name, 0):>5} | {scans:>10} | {warnings:>16}")
+
+    for captured in collector.statements:
+        if not captured.full_scans and not (verbose and (captured.warnings or captured.plan)):
+            continue
+        print(f"\n[{captured.case}] {fingerprint(captured.statement)}")
+        for problem in captured.full_scans:
+            print(f"  TAM TARAMA  {problem}")
+        for warning in captured.warnings:
+            print(f"  uyarı       {warning}")
+        if verbose or captured.full_scans:
+            for row in captured.plan:
+                print(f"    {row}")
+    return failures
+
+
+async def main_async(args) -> int:
+    logging.disable(logging.WARNING)
+    # Yavaş sorgu günlüğü kendi EXPLAIN'lerini çalıştırmasın.
+    slow_query_log.enabled = False
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    data = await seed(args, rng)
+    print(f"Veri yüklendi: {args.jobs} ilan, {len(data.customer_ids)} müşteri, "
+          f"{len(data.provider_user_ids)} sağlayıcı ({time.perf_counter() - started:.1f} s)\n")
+
+    collector = StatementCollector()
+    add_statement_observer(collector)
+    async with app_client(base_url="http://plans", raise_app_exceptions=False) as client:
+        problems = await run_cases(client, data, collector)
+        # Etiket run_cases sonunda kaldırıldığından EXPLAIN ifadeleri toplanmaz.
+        await explain_all(collector)
+
+    failures = print_report(collector, args.verbose)
+    for problem in problems:
+        print(f"HATA: {problem}")
+    if failures or problems:
+        print(f"\nBAŞARISIZ: {failures} tam tablo taraması, {len(problems)} beklenmeyen yanıt.")
+        return 1
+    print(f"\nTamam: {len(collector.statements)} farklı ifade, tam tablo taraması yok.")
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Uç nokta sorgu planlarında tam tablo taraması kontrolü")
+    parser.add_argument("--jobs", type=int, default=50000)
+    parser.add_argument("--customers", type=int, default=2000)
+    parser.add_argument("--providers", type=int, default=300)
+    parser.add_argument("--offer-ratio", type=float, default=0.4, help="Teklif alan ilanların oranı")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--verbose", action="store_true", help="Tüm ifadelerin planlarını yazdır")
+    parser.add_argument(DATABASE_FROM_ENV_FLAG, action="store_true",
+                        help="Geçici SQLite yerine DATABASE_URL'deki (boş, test amaçlı) veritabanını kullan")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Yerel testler için küçük, bellek içi bir Redis protokolü (RESP2) sunucusu.
+
+Yalnızca yanıt önbelleğinin (app/response_cache.py, RedisCacheBackend) kullandığı
+komutları destekler: PING, AUTH, SELECT, GET, SET (PX), MGET, INCR, DEL, SADD,
+SMEMBERS, PEXPIRE, INFO, FLUSHALL ve EVAL. Lua yorumlayıcısı yoktur; EVAL yalnızca
+önbelleğin iki betiğini (koşullu yazma, geçersiz kılma) Python karşılıklarıyla
+çalıştırır. Gerçek bir Redis kurulumu olmadan redis arka
+ucunu denemek ve karşılaştırmak için kullanılır.
+
+Kullanım:
+    python -m benchmarks.fake_resp_server --port 6390
+    RESPONSE_CACHE_BACKEND=redis RESPONSE_CACHE_URL=redis://127.0.0.1:6390/0 uvicorn app.main:app
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.response_cache import _INVALIDATE, _SET_IF_CURRENT
+
+
+class FakeRespServer:
+    """Komutları tek bir sözlükte tutan, süre aşımlarını okuma anında uygulayan sunucu."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self._data: Dict[bytes, Any] = {}
+        self._expires: Dict[bytes, float] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.commands = 0
+        self.expired_keys = 0
+
+    async def start(self) -> "FakeRespServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    # ------------------------------------------------------------------
+    # Protokol
+    # ------------------------------------------------------------------
+    async def _read_command(self, reader: asyncio.StreamReader) -> Optional[List[bytes]]:
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # Satır içi (inline) komut, örn. redis-cli ile "PING".
+            return line.strip().split()
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, Exception):
+            return b"-ERR %s\r\n" % str(value).encode()
+        if isinstance(value, bool):
+            return b"+OK\r\n"
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, bytes):
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if isinstance(value, (list, tuple, set)):
+            return b"*%d\r\n" % len(value) + b"".join(FakeRespServer._encode(item) for item in value)
+        raise TypeError(f"Kodlanamayan değer: {value!r}")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if args is None:
+                    break
+                self.commands += 1
+                try:
+                    reply = self._dispatch(args[0].upper().decode(), args[1:])
+                except Exception as exc:
+                    reply = exc
+                writer.write(self._encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    # ------------------------------------------------------------------
+    # Komutlar
+    # ------------------------------------------------------------------
+    def _alive(self, key: bytes) -> bool:
+        expires_at = self._expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+            self.expired_keys += 1
+        return key in self._data
+
+    def _dispatch(self, name: str, args: List[bytes]) -> Any:
+        if name in ("PING",):
+            return b"PONG"
+        if name in ("AUTH", "SELECT", "FLUSHALL"):
+            if name == "FLUSHALL":
+                self._data.clear()
+                self._expires.clear()
+            return True
+        if name == "GET":
+            return self._data[args[0]] if self._alive(args[0]) else None
+        if name == "MGET":
+            return [self._data[key] if self._alive(key) else None for key in args]
+        if name == "SET":
+            key, value, options = args[0], args[1], [a.upper() for a in args[2:]]
+            self._data[key] = value
+            self._expires.pop(key, None)
+            if b"PX" in options:
+                self._expires[key] = time.monotonic() + int(options[options.index(b"PX") + 1]) / 1000
+            return True
+        if name == "INCR":
+            value = int(self._data[args[0]]) + 1 if self._alive(args[0]) else 1
+            self._data[args[0]] = str(value).encode()
+            return value
+        if name == "DEL":
+            removed = 0
+            for key in args:
+                if self._alive(key):
+                    del self._data[key]
+                    self._expires.pop(key, None)
+                    removed += 1
+            return removed
+        if name == "SADD":
+            members = self._data[args[0]] if self._alive(args[0]) else set()
+            before = len(members)
+            members.update(args[1:])
+            self._data[args[0]] = members
+            return len(members) - before
+        if name == "SMEMBERS":
+            return sorted(self._data[args[0]]) if self._alive(args[0]) else []
+        if name == "PEXPIRE":
+            if not self._alive(args[0]):
+                return 0
+            self._expires[args[0]] = time.monotonic() + int(args[1]) / 1000
+            return 1
+        if name == "EVAL":
+            return self._eval(args[0].decode(), int(args[1]), args[2:])
+        if name == "INFO":
+            return (
+                f"# Stats\r\ntotal_commands_processed:{self.commands}\r\n"
+                f"expired_keys:{self.expired_keys}\r\nevicted_keys:0\r\n"
+            ).encode()
+        raise ValueError(f"unknown command '{name}'")
+
+    def _eval(self, script: str, key_count: int, args: List[bytes]) -> Any:
+        # Betikler tek komut içinde çalıştığından (sunucu tek iş parçacıklı) atomiktir.
+        keys, argv = args[:key_count], args[key_count:]
+        tag_pairs = [(keys[i], keys[i + 1]) for i in range(1, key_count, 2)]
+        if script == _SET_IF_CURRENT:
+            since = int(argv[2])
+            if any(int(self._dispatch("GET", [version]) or 0) > since for _, version in tag_pairs):
+                return 0
+            self._dispatch("SET", [keys[0], argv[0], b"PX", argv[1]])
+            for tag_key, _ in tag_pairs:
+                self._dispatch("SADD", [tag_key, argv[3]])
+                self._dispatch("PEXPIRE", [tag_key, argv[1]])
+            return 1
+        if script == _INVALIDATE:
+            generation = str(self._dispatch("INCR", [keys[0]])).encode()
+            removed = 0
+            for tag_key, version in tag_pairs:
+                self._dispatch("SET", [version, generation, b"PX", argv[1]])
+                members = self._dispatch("SMEMBERS", [tag_key])
+                if members:
+                    removed += self._dispatch("DEL", [argv[0] + member for member in members])
+                self._dispatch("DEL", [tag_key])
+            return removed
+        raise ValueError("unknown script (EVAL)")
+
+
+async def serve(host: str, port: int) -> None:
+    server = await FakeRespServer(host, port).start()
+    print(f"Sahte RESP sunucusu dinleniyor: {server.url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6390)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
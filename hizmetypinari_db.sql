@@ -97,6 +97,35 @@ CREATE TABLE `providers` (
 
 -- --------------------------------------------------------
 
+--
+-- Tablo için tablo yapısı `provider_stats`
+--
+
+CREATE TABLE `provider_stats` (
+  `provider_id` int NOT NULL,
+  `review_count` int NOT NULL DEFAULT '0',
+  `rating_sum` int NOT NULL DEFAULT '0',
+  `rating_1` int NOT NULL DEFAULT '0',
+  `rating_2` int NOT NULL DEFAULT '0',
+  `rating_3` int NOT NULL DEFAULT '0',
+  `rating_4` int NOT NULL DEFAULT '0',
+  `rating_5` int NOT NULL DEFAULT '0'
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- --------------------------------------------------------
+
+--
+-- Tablo için tablo yapısı `provider_subscriptions`
+--
+
+CREATE TABLE `provider_subscriptions` (
+  `provider_id` int NOT NULL,
+  `service_id` int NOT NULL,
+  `district_id` int NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- --------------------------------------------------------
+
 --
 -- Tablo için tablo yapısı `reviews`
 --
@@ -134,6 +163,29 @@ INSERT INTO `roles` (`id`, `role_name`, `description`) VALUES
 
 -- --------------------------------------------------------
 
+--
+-- Tablo için tablo yapısı `schema_migrations`
+--
+
+CREATE TABLE `schema_migrations` (
+  `version` int NOT NULL,
+  `name` varchar(255) NOT NULL,
+  `applied_at` datetime DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+--
+-- Tablo döküm verisi `schema_migrations`
+-- (Bu döküm app/migrations altındaki tüm migration'ları içerir.)
+--
+
+INSERT INTO `schema_migrations` (`version`, `name`) VALUES
+(1, 'm0001_indexes_and_provider_stats'),
+(2, 'm0002_hot_path_indexes'),
+(3, 'm0003_token_revocation'),
+(4, 'm0004_provider_subscriptions');
+
+-- --------------------------------------------------------
+
 --
 -- Tablo için tablo yapısı `services`
 --
@@ -149,6 +201,20 @@ CREATE TABLE `services` (
 
 -- --------------------------------------------------------
 
+--
+-- Tablo için tablo yapısı `token_revocations`
+--
+
+CREATE TABLE `token_revocations` (
+  `id` int NOT NULL,
+  `user_id` int NOT NULL,
+  `min_token_version` int NOT NULL,
+  `suspended` tinyint(1) NOT NULL DEFAULT '0',
+  `created_at` datetime DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+
+-- --------------------------------------------------------
+
 --
 -- Tablo için tablo yapısı `users`
 --
@@ -161,6 +227,7 @@ CREATE TABLE `users` (
   `last_name` varchar(100) NOT NULL,
   `phone_number` varchar(20) DEFAULT NULL,
   `is_active` tinyint(1) DEFAULT '1',
+  `token_version` int NOT NULL DEFAULT '0',
   `role_id` int NOT NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 
@@ -197,14 +264,20 @@ ALTER TABLE `jobs`
   ADD PRIMARY KEY (`id`),
   ADD KEY `customer_id` (`customer_id`),
   ADD KEY `service_id` (`service_id`),
-  ADD KEY `district_id` (`district_id`);
+  ADD KEY `district_id` (`district_id`),
+  ADD KEY `idx_jobs_active_status_created` (`is_active`,`status`,`created_at`,`id`),
+  ADD KEY `idx_jobs_updated_at` (`updated_at`),
+  ADD KEY `idx_jobs_service_open` (`service_id`,`is_active`,`status`,`created_at`,`id`),
+  ADD KEY `idx_jobs_district_open` (`district_id`,`is_active`,`status`,`created_at`,`id`),
+  ADD FULLTEXT KEY `ft_jobs_title_description` (`title`,`description`);
 
 --
 -- Tablo için indeksler `offers`
 --
 ALTER TABLE `offers`
   ADD PRIMARY KEY (`id`),
-  ADD KEY `job_id` (`job_id`),
+  ADD UNIQUE KEY `uq_offers_job_provider` (`job_id`,`provider_id`),
+  ADD KEY `idx_offers_job_status` (`job_id`,`status`),
   ADD KEY `provider_id` (`provider_id`);
 
 --
@@ -214,6 +287,20 @@ ALTER TABLE `providers`
   ADD PRIMARY KEY (`id`),
   ADD UNIQUE KEY `user_id` (`user_id`);
 
+--
+-- Tablo için indeksler `provider_stats`
+--
+ALTER TABLE `provider_stats`
+  ADD PRIMARY KEY (`provider_id`);
+
+--
+-- Tablo için indeksler `provider_subscriptions`
+--
+ALTER TABLE `provider_subscriptions`
+  ADD PRIMARY KEY (`provider_id`,`service_id`,`district_id`),
+  ADD KEY `service_id` (`service_id`),
+  ADD KEY `district_id` (`district_id`);
+
 --
 -- Tablo için indeksler `reviews`
 --
@@ -221,7 +308,8 @@ ALTER TABLE `reviews`
   ADD PRIMARY KEY (`id`),
   ADD UNIQUE KEY `job_id` (`job_id`),
   ADD KEY `provider_id` (`provider_id`),
-  ADD KEY `customer_id` (`customer_id`);
+  ADD KEY `customer_id` (`customer_id`),
+  ADD KEY `idx_reviews_provider_created` (`provider_id`,`created_at`,`id`);
 
 --
 -- Tablo için indeksler `roles`
@@ -230,6 +318,12 @@ ALTER TABLE `roles`
   ADD PRIMARY KEY (`id`),
   ADD UNIQUE KEY `role_name` (`role_name`);
 
+--
+-- Tablo için indeksler `schema_migrations`
+--
+ALTER TABLE `schema_migrations`
+  ADD PRIMARY KEY (`version`);
+
 --
 -- Tablo için indeksler `services`
 --
@@ -237,6 +331,12 @@ ALTER TABLE `services`
   ADD PRIMARY KEY (`id`),
   ADD KEY `category_id` (`category_id`);
 
+--
+-- Tablo için indeksler `token_revocations`
+--
+ALTER TABLE `token_revocations`
+  ADD PRIMARY KEY (`id`);
+
 --
 -- Tablo için indeksler `users`
 --
@@ -244,7 +344,9 @@ ALTER TABLE `users`
   ADD PRIMARY KEY (`id`),
   ADD UNIQUE KEY `email` (`email`),
   ADD UNIQUE KEY `phone_number` (`phone_number`),
-  ADD KEY `role_id` (`role_id`);
+  ADD KEY `role_id` (`role_id`),
+  ADD KEY `idx_users_first_name` (`first_name`(32)),
+  ADD KEY `idx_users_last_name` (`last_name`(32));
 
 --
 -- Dökümü yapılmış tablolar için AUTO_INCREMENT değeri
@@ -298,6 +400,12 @@ ALTER TABLE `roles`
 ALTER TABLE `services`
   MODIFY `id` int NOT NULL AUTO_INCREMENT;
 
+--
+-- Tablo için AUTO_INCREMENT değeri `token_revocations`
+--
+ALTER TABLE `token_revocations`
+  MODIFY `id` int NOT NULL AUTO_INCREMENT;
+
 --
 -- Tablo için AUTO_INCREMENT değeri `users`
 --
@@ -329,6 +437,20 @@ ALTER TABLE `offers`
 ALTER TABLE `providers`
   ADD CONSTRAINT `providers_ibfk_1` FOREIGN KEY (`user_id`) REFERENCES `users` (`id`);
 
+--
+-- Tablo kısıtlamaları `provider_stats`
+--
+ALTER TABLE `provider_stats`
+  ADD CONSTRAINT `provider_stats_ibfk_1` FOREIGN KEY (`provider_id`) REFERENCES `providers` (`id`);
+
+--
+-- Tablo kısıtlamaları `provider_subscriptions`
+--
+ALTER TABLE `provider_subscriptions`
+  ADD CONSTRAINT `provider_subscriptions_ibfk_1` FOREIGN KEY (`provider_id`) REFERENCES `providers` (`id`),
+  ADD CONSTRAINT `provider_subscriptions_ibfk_2` FOREIGN KEY (`service_id`) REFERENCES `services` (`id`),
+  ADD CONSTRAINT `provider_subscriptions_ibfk_3` FOREIGN KEY (`district_id`) REFERENCES `districts` (`id`);
+
 --
 -- Tablo kısıtlamaları `reviews`
 --
@@ -348,6 +470,16 @@ ALTER TABLE `services`
 --
 ALTER TABLE `users`
   ADD CONSTRAINT `users_ibfk_1` FOREIGN KEY (`role_id`) REFERENCES `roles` (`id`);
+
+--
+-- Mevcut değerlendirmelerden sağlayıcı puan özetlerini oluştur
+--
+INSERT INTO `provider_stats` (`provider_id`, `review_count`, `rating_sum`, `rating_1`, `rating_2`, `rating_3`, `rating_4`, `rating_5`)
+SELECT `provider_id`, COUNT(*), SUM(`rating`),
+  SUM(`rating` = 1), SUM(`rating` = 2), SUM(`rating` = 3), SUM(`rating` = 4), SUM(`rating` = 5)
+FROM `reviews`
+GROUP BY `provider_id`;
+
 COMMIT;
 
 /*!40101 SET CHARACTER_SET_CLIENT=@OLD_CHARACTER_SET_CLIENT */;